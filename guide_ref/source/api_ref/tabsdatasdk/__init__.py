@@ -2,34 +2,86 @@
 # Copyright 2024 Tabs Data Inc.
 #
 
+import importlib
 import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tabsdatasdk.api.async_tabsdata_server import AsyncTabsdataServer
+    from tabsdatasdk.api.tabsdata_server import (
+        Dataset,
+        Datastore,
+        ExecutionPlan,
+        TabsdataServer,
+        User,
+    )
+    from tabsdatasdk.credentials import (
+        AzureAccountKeyCredentials,
+        S3AccessKeyCredentials,
+        UserPasswordCredentials,
+    )
+    from tabsdatasdk.datasetfunction import (
+        AzureInput,
+        LocalFileInput,
+        MySQLInput,
+        MySQLOutput,
+        S3Input,
+        TableInput,
+        TableOutput,
+    )
+    from tabsdatasdk.decorators import dataset
+    from tabsdatasdk.format import CSVFormat, LogFormat, NDJSONFormat, ParquetFormat
+    from tabsdatasdk.plugin import InputPlugin, OutputPlugin
+    from tabsdatasdk.secret import DirectSecret, EnvironmentSecret, HashiCorpSecret
+    from tabsdatasdk.uri import URI
+
+# The public objects are imported when first accessed, so that importing the
+# package, or any of its modules, like the CLI, does not import the whole SDK
+LAZY_IMPORTS = {
+    "AsyncTabsdataServer": "tabsdatasdk.api.async_tabsdata_server",
+    "Dataset": "tabsdatasdk.api.tabsdata_server",
+    "Datastore": "tabsdatasdk.api.tabsdata_server",
+    "ExecutionPlan": "tabsdatasdk.api.tabsdata_server",
+    "TabsdataServer": "tabsdatasdk.api.tabsdata_server",
+    "User": "tabsdatasdk.api.tabsdata_server",
+    "AzureAccountKeyCredentials": "tabsdatasdk.credentials",
+    "S3AccessKeyCredentials": "tabsdatasdk.credentials",
+    "UserPasswordCredentials": "tabsdatasdk.credentials",
+    "AzureInput": "tabsdatasdk.datasetfunction",
+    "LocalFileInput": "tabsdatasdk.datasetfunction",
+    "MySQLInput": "tabsdatasdk.datasetfunction",
+    "MySQLOutput": "tabsdatasdk.datasetfunction",
+    "S3Input": "tabsdatasdk.datasetfunction",
+    "TableInput": "tabsdatasdk.datasetfunction",
+    "TableOutput": "tabsdatasdk.datasetfunction",
+    "dataset": "tabsdatasdk.decorators",
+    "CSVFormat": "tabsdatasdk.format",
+    "LogFormat": "tabsdatasdk.format",
+    "NDJSONFormat": "tabsdatasdk.format",
+    "ParquetFormat": "tabsdatasdk.format",
+    "InputPlugin": "tabsdatasdk.plugin",
+    "OutputPlugin": "tabsdatasdk.plugin",
+    "DirectSecret": "tabsdatasdk.secret",
+    "EnvironmentSecret": "tabsdatasdk.secret",
+    "HashiCorpSecret": "tabsdatasdk.secret",
+    "URI": "tabsdatasdk.uri",
+}
+
+
+def __getattr__(name: str):
+    try:
+        module_name = LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    # Cached, so that this function is only called the first time
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *LAZY_IMPORTS})
 
-from tabsdatasdk.api.tabsdata_server import (
-    Dataset,
-    Datastore,
-    ExecutionPlan,
-    TabsdataServer,
-    User,
-)
-from tabsdatasdk.credentials import (
-    AzureAccountKeyCredentials,
-    S3AccessKeyCredentials,
-    UserPasswordCredentials,
-)
-from tabsdatasdk.datasetfunction import (
-    AzureInput,
-    LocalFileInput,
-    MySQLInput,
-    MySQLOutput,
-    S3Input,
-    TableInput,
-    TableOutput,
-)
-from tabsdatasdk.decorators import dataset
-from tabsdatasdk.format import CSVFormat, LogFormat, NDJSONFormat, ParquetFormat
-from tabsdatasdk.plugin import InputPlugin, OutputPlugin
-from tabsdatasdk.secret import DirectSecret, EnvironmentSecret, HashiCorpSecret
-from tabsdatasdk.uri import URI
 
 logging.basicConfig(
     level=logging.getLevelName(logging.WARNING),
@@ -72,4 +124,6 @@ __all__ = [
     "ExecutionPlan",
     "TabsdataServer",
     "User",
+    # from async_tabsdata_server.py
+    "AsyncTabsdataServer",
 ]
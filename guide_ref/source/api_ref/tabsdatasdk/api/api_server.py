@@ -3,13 +3,39 @@
 #
 
 import json
+import logging
+import random
+import threading
+import time
+from typing import BinaryIO, Iterable, Iterator
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
 
+from tabsdatasdk.api.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+AUTHENTICATION_PATH_PREFIX = "/auth/"
 DEFAULT_APISERVER_PORT = "2457"
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_MAX_BACKOFF = 30
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_POOL_SIZE = 10
+DEFAULT_UPLOAD_CHUNK_SIZE = 1024 * 1024
 HTTP_PROTOCOL = "http://"
+# Methods whose requests have the same effect when sent more than once
+IDEMPOTENT_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PUT")
 PORT_SEPARATOR = ":"
+# Errors of a proxy or an overloaded server, after which an idempotent request can
+# be safely sent again
+RETRY_STATUS_CODES = (502, 503, 504)
+# Errors sent when the request was not processed at all, after which any request can
+# be sent again. A 502 or a 504 can be sent after the server applied the request.
+UNPROCESSED_STATUS_CODES = (503,)
+UNAUTHORIZED_STATUS_CODE = 401
 
 
 class APIServerError(Exception):
@@ -36,36 +62,289 @@ def process_url(url: str) -> str:
     return url
 
 
+def create_session(
+    pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True
+) -> requests.Session:
+    """
+    A helper function to create a requests Session with a connection pool of the
+        given size. If keep_alive is False, connections are closed after every
+        request instead of being returned to the pool.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount(HTTP_PROTOCOL, adapter)
+    session.mount("https://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def backoff_delay(
+    attempt: int,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    max_backoff: float = DEFAULT_MAX_BACKOFF,
+    retry_after: str | None = None,
+) -> float:
+    """
+    A helper function to obtain the seconds to wait before retrying a request. The
+        delay grows exponentially with the attempt, and a random jitter is applied
+        so that many clients failing at once do not retry at the same time. A
+        numeric Retry-After header sent by the server is honored.
+    """
+    delay = random.uniform(0, min(max_backoff, backoff_factor * 2**attempt))
+    try:
+        return max(delay, min(max_backoff, float(retry_after)))
+    except (TypeError, ValueError):
+        return delay
+
+
+def is_replayable(data) -> bool:
+    """
+    A helper function to check whether a request body can be sent again: bytes,
+        JSON data and seekable files can, while other iterables of bytes are
+        consumed when sent.
+    """
+    if data is None or isinstance(data, (bytes, str, dict, list)):
+        return True
+    if hasattr(data, "read"):
+        try:
+            return data.seekable()
+        except AttributeError:
+            return False
+    return False
+
+
+def is_retryable_status(method: str, status_code: int) -> bool:
+    """
+    A helper function to check whether a request that failed with a status can be
+        sent again. Requests that are not idempotent, like the ones that create a
+        resource or trigger a dataset, are only sent again if the server did not
+        process them.
+    """
+    if method in IDEMPOTENT_METHODS:
+        return status_code in RETRY_STATUS_CODES
+    return status_code in UNPROCESSED_STATUS_CODES
+
+
+def is_connect_error(error: requests.exceptions.ConnectionError) -> bool:
+    """
+    A helper function to check whether a connection error happened while opening
+        the connection, so the request never reached the server.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    # A refused or unresolved connection is a MaxRetryError caused by a
+    # NewConnectionError, which is a ConnectTimeoutError
+    reason = error.args[0] if error.args else None
+    return isinstance(getattr(reason, "reason", reason), ConnectTimeoutError)
+
+
+def read_in_chunks(
+    file: BinaryIO, chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    A helper function to lazily read a binary file in chunks. When given to
+        post_binary, the body is sent with chunked transfer encoding, so only one
+        chunk is held in memory at a time.
+    """
+    for chunk in iter(lambda: file.read(chunk_size), b""):
+        yield chunk
+
+
 class APIServer:
+    """
+    Client of the API of the server.
+
+    When a request is rejected because the bearer token has expired, the token is
+        refreshed once and the request is sent again; if credentials_file is set,
+        the new tokens are stored in it. Idempotent requests (GET and DELETE) that
+        fail with a connection error or a 502, 503 or 504 status are retried up to
+        max_retries times, waiting an exponentially growing time with jitter between
+        attempts. Other requests, like the ones that create a resource or trigger a
+        dataset, are only retried when they never reached the server: after an
+        error while connecting or a 503 status. Bodies that can not be sent twice,
+        like generators, are never retried.
+
+    Args:
+        url (str): The url of the server.
+        pool_size (int): The maximum number of pooled connections to the server.
+        keep_alive (bool): Whether connections are kept open between requests.
+        max_retries (int): The maximum number of retries of a failed request.
+        backoff_factor (float): The base of the exponential backoff, in seconds.
+        max_backoff (float): The maximum wait between retries, in seconds.
+        credentials_file (str, optional): The file where the tokens are stored
+            after being refreshed.
+        cache (ResponseCache, optional): The cache of the responses of the
+            endpoints that get a single datastore, dataset or user, and of the
+            status of the server. Nothing is cached if it is None.
+    """
 
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keep_alive: bool = True,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        credentials_file: str | None = None,
+        cache: ResponseCache | None = None,
+    ):
         url = process_url(url)
         self.url = url
         self.bearer_token = None
         self.refresh_token = None
+        self.user_name = None
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.credentials_file = credentials_file
+        self.cache = cache
+        self.session = create_session(pool_size=pool_size, keep_alive=keep_alive)
+        # Serializes the refreshes of requests rejected at the same time, so that
+        # the refresh token is only used once
+        self._refresh_lock = threading.Lock()
 
     @property
     def authentication_header(self):
         return {"Authorization": f"Bearer {self.bearer_token}"}
 
-    def get(self, path, params=None):
-
-        return requests.get(
-            self.url + path, headers=self.authentication_header, params=params
+    def get(self, path, params=None, cached: bool = False):
+        if not cached or self.cache is None:
+            return self._send("GET", path, params=params)
+        key = self.cache.key(path, params)
+        entry = self.cache.lookup(key)
+        if entry is not None and entry.fresh:
+            return entry.response
+        response = self._send(
+            "GET", path, headers=self.cache.conditional_headers(entry), params=params
         )
+        return self.cache.update(key, path, response, entry)
 
     def post(self, path, data):
-        return requests.post(
-            self.url + path, json=data, headers=self.authentication_header
-        )
+        try:
+            return self._send("POST", path, json=data)
+        finally:
+            self._invalidate_cache(path)
 
-    def post_binary(self, path, data):
+    def post_binary(self, path, data: bytes | BinaryIO | Iterable[bytes]):
+        # Both file objects and iterables of bytes are streamed by requests instead
+        # of being loaded in memory.
         headers = {"Content-Type": "application/octet-stream"}
-        headers.update(self.authentication_header)
-        return requests.post(self.url + path, data=data, headers=headers)
+        try:
+            return self._send("POST", path, headers=headers, data=data)
+        finally:
+            self._invalidate_cache(path)
 
     def delete(self, path):
-        return requests.delete(self.url + path, headers=self.authentication_header)
+        try:
+            return self._send("DELETE", path)
+        finally:
+            self._invalidate_cache(path)
+
+    def _invalidate_cache(self, path: str):
+        # The cached responses of the modified resource, and of the ones under and
+        # above it, are no longer valid
+        if self.cache is not None and not path.startswith(AUTHENTICATION_PATH_PREFIX):
+            self.cache.invalidate(path)
+
+    def _send(self, method: str, path: str, headers=None, **kwargs):
+        body = kwargs.get("data")
+        replayable = is_replayable(body)
+        start = body.tell() if replayable and hasattr(body, "read") else None
+        refreshable = not path.startswith(AUTHENTICATION_PATH_PREFIX)
+        attempt = 0
+        while True:
+            if start is not None:
+                body.seek(start)
+            request_headers = dict(self.authentication_header)
+            request_headers.update(headers or {})
+            bearer_token = self.bearer_token
+            try:
+                response = self.session.request(
+                    method, self.url + path, headers=request_headers, **kwargs
+                )
+            except requests.exceptions.ConnectionError as error:
+                if (
+                    not replayable
+                    or attempt >= self.max_retries
+                    or not (method in IDEMPOTENT_METHODS or is_connect_error(error))
+                ):
+                    raise
+                logger.debug(f"{method} {path} failed with '{error}', retrying.")
+                time.sleep(
+                    backoff_delay(attempt, self.backoff_factor, self.max_backoff)
+                )
+                attempt += 1
+                continue
+            if not replayable:
+                return response
+            if response.status_code == UNAUTHORIZED_STATUS_CODE and refreshable:
+                # The request is sent again once, after refreshing the token
+                refreshable = False
+                if self._refresh_after_unauthorized(bearer_token):
+                    continue
+            elif (
+                is_retryable_status(method, response.status_code)
+                and attempt < self.max_retries
+            ):
+                logger.debug(
+                    f"{method} {path} failed with status {response.status_code}, "
+                    "retrying."
+                )
+                time.sleep(
+                    backoff_delay(
+                        attempt,
+                        self.backoff_factor,
+                        self.max_backoff,
+                        response.headers.get("Retry-After"),
+                    )
+                )
+                attempt += 1
+                continue
+            return response
+
+    def _refresh_after_unauthorized(self, rejected_token: str | None) -> bool:
+        """
+        Refresh the bearer token after a request sent with rejected_token was
+            rejected, and return whether the request can be sent again.
+        """
+        if not self.refresh_token:
+            return False
+        with self._refresh_lock:
+            if self.bearer_token != rejected_token:
+                # Another request already refreshed it
+                return True
+            try:
+                self.authentication_refresh()
+            except (APIServerError, ValueError) as error:
+                logger.debug(f"Failed to refresh the bearer token: {error}")
+                return False
+            self._store_refreshed_tokens()
+            return True
+
+    def _store_refreshed_tokens(self):
+        logger.debug("Refreshed the bearer token.")
+        if self.credentials_file:
+            try:
+                self._store_in_file(self.credentials_file)
+            except OSError as error:
+                logger.warning(
+                    f"Failed to store the refreshed tokens in "
+                    f"'{self.credentials_file}': {error}"
+                )
+
+    def close(self):
+        """
+        Close the underlying session and release the pooled connections.
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _store_in_file(self, file_path: str):
         with open(file_path, "w") as file:
@@ -74,6 +353,7 @@ class APIServer:
                     "url": self.url,
                     "bearer_token": self.bearer_token,
                     "refresh_token": self.refresh_token,
+                    "user_name": self.user_name,
                 },
                 file,
             )
@@ -104,6 +384,7 @@ class APIServer:
         if response.status_code == 200:
             self.bearer_token = response.json()["access_token"]
             self.refresh_token = response.json()["refresh_token"]
+            self.user_name = name
             return response
         else:
             raise APIServerError(response.json())
@@ -165,7 +446,7 @@ class APIServer:
         self, datastore_name: str, dataset_name: str, raise_for_status: bool = True
     ):
         endpoint = f"/datastores/{datastore_name}/datasets/{dataset_name}"
-        response = self.get(endpoint)
+        response = self.get(endpoint, cached=True)
         return self.raise_for_status_or_return(raise_for_status, response)
 
     def dataset_in_datastore_list(
@@ -205,7 +486,7 @@ class APIServer:
         self, datastore_name: str, dataset_name: str, raise_for_status: bool = True
     ):
         endpoint = f"/datastores/{datastore_name}/datasets/{dataset_name}/function"
-        response = self.get(endpoint)
+        response = self.get(endpoint, cached=True)
         return self.raise_for_status_or_return(raise_for_status, response)
 
     def dataset_update(
@@ -251,7 +532,7 @@ class APIServer:
         datastore_name: str,
         dataset_name: str,
         function_id: str,
-        bundle: bytes,
+        bundle: bytes | BinaryIO | Iterable[bytes],
         raise_for_status: bool = True,
     ):
         endpoint = (
@@ -276,7 +557,7 @@ class APIServer:
 
     def datastore_get_by_name(self, datastore_name: str, raise_for_status: bool = True):
         endpoint = f"/datastores/{datastore_name}"
-        response = self.get(endpoint)
+        response = self.get(endpoint, cached=True)
         return self.raise_for_status_or_return(raise_for_status, response)
 
     def datastore_list(
@@ -327,7 +608,7 @@ class APIServer:
 
     def status_get(self, raise_for_status: bool = True):
         endpoint = "/status"
-        response = self.get(endpoint)
+        response = self.get(endpoint, cached=True)
         return self.raise_for_status_or_return(raise_for_status, response)
 
     def table_get_by_id(self, table_id: str, raise_for_status: bool = True):
@@ -367,7 +648,7 @@ class APIServer:
 
     def users_get_by_name(self, name: str, raise_for_status: bool = True):
         endpoint = f"/users/{name}"
-        response = self.get(endpoint)
+        response = self.get(endpoint, cached=True)
         return self.raise_for_status_or_return(raise_for_status, response)
 
     def users_list(
@@ -424,7 +705,23 @@ class APIServer:
         return {name: value for name, value in zip(names, values) if value is not None}
 
 
-def obtain_connection(url: str, name: str, password: str) -> APIServer:
-    connection = APIServer(url)
+def obtain_connection(
+    url: str,
+    name: str,
+    password: str,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    keep_alive: bool = True,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    credentials_file: str | None = None,
+    cache: ResponseCache | None = None,
+) -> APIServer:
+    connection = APIServer(
+        url,
+        pool_size=pool_size,
+        keep_alive=keep_alive,
+        max_retries=max_retries,
+        credentials_file=credentials_file,
+        cache=cache,
+    )
     connection.authentication_access(name, password)
     return connection
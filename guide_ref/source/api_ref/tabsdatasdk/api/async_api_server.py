@@ -0,0 +1,327 @@
+#
+# Copyright 2024 Tabs Data Inc.
+#
+
+import asyncio
+import inspect
+import logging
+import os
+from typing import AsyncIterator, BinaryIO, Iterable
+
+from tabsdatasdk.api.api_server import (
+    AUTHENTICATION_PATH_PREFIX,
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_MAX_BACKOFF,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_UPLOAD_CHUNK_SIZE,
+    IDEMPOTENT_METHODS,
+    UNAUTHORIZED_STATUS_CODE,
+    APIServer,
+    APIServerError,
+    backoff_delay,
+    is_replayable,
+    is_retryable_status,
+    process_url,
+)
+from tabsdatasdk.api.response_cache import ResponseCache
+from tabsdatasdk.exceptions import ErrorCode, TabsdataServerError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 100
+
+
+async def aread_in_chunks(
+    file: BinaryIO, chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    A helper function to lazily read a binary file in chunks without blocking the
+        event loop, since every read is done in a worker thread.
+    """
+    while chunk := await asyncio.to_thread(file.read, chunk_size):
+        yield chunk
+
+
+async def _aiterate(iterable: Iterable[bytes]) -> AsyncIterator[bytes]:
+    iterator = iter(iterable)
+    while (chunk := await asyncio.to_thread(next, iterator, None)) is not None:
+        yield chunk
+
+
+class AsyncAPIServer(APIServer):
+    """
+    Asynchronous version of APIServer, built on httpx, which must be installed. It
+        has the same endpoints as APIServer, but each of them returns an awaitable
+        that must be awaited to obtain the response.
+
+    All the requests share a pool of connections, and the number of requests in
+        flight is limited by max_concurrency; the rest wait for a free slot, so many
+        requests can be started at once on the same event loop. Expired tokens are
+        refreshed and failed requests retried as in APIServer.
+
+    Args:
+        url (str): The url of the server.
+        pool_size (int): The maximum number of pooled connections to the server.
+        keep_alive (bool): Whether connections are kept open between requests.
+        max_concurrency (int): The maximum number of requests in flight.
+        max_retries (int): The maximum number of retries of a failed request.
+        backoff_factor (float): The base of the exponential backoff, in seconds.
+        max_backoff (float): The maximum wait between retries, in seconds.
+        credentials_file (str, optional): The file where the tokens are stored
+            after being refreshed.
+        cache (ResponseCache, optional): The cache of the responses, as in
+            APIServer. Nothing is cached if it is None.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keep_alive: bool = True,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        credentials_file: str | None = None,
+        cache: ResponseCache | None = None,
+    ):
+        try:
+            import httpx
+        except ImportError:
+            raise TabsdataServerError(ErrorCode.TSE2, "httpx")
+        self._transport_error = httpx.TransportError
+        # Errors raised before the request is sent
+        self._connect_errors = (httpx.ConnectError, httpx.ConnectTimeout)
+        self.url = process_url(url)
+        self.bearer_token = None
+        self.refresh_token = None
+        self.user_name = None
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.credentials_file = credentials_file
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size if keep_alive else 0,
+            ),
+            headers=None if keep_alive else {"Connection": "close"},
+            timeout=None,
+        )
+        # Created when first used, so that they belong to the running event loop
+        self._concurrency_limit = None
+        self._refresh_lock = None
+
+    async def _request(
+        self, method: str, path: str, headers=None, content=None, **kwargs
+    ):
+        if self._concurrency_limit is None:
+            self._concurrency_limit = asyncio.Semaphore(self.max_concurrency)
+        # Files are read in worker threads, from the beginning on every attempt
+        file = content if hasattr(content, "read") else None
+        replayable = is_replayable(content)
+        start = file.tell() if file and replayable else None
+        refreshable = not path.startswith(AUTHENTICATION_PATH_PREFIX)
+        attempt = 0
+        while True:
+            if start is not None:
+                file.seek(start)
+            if file:
+                content = aread_in_chunks(file)
+            request_headers = dict(self.authentication_header)
+            request_headers.update(headers or {})
+            bearer_token = self.bearer_token
+            try:
+                async with self._concurrency_limit:
+                    response = await self.client.request(
+                        method,
+                        self.url + path,
+                        headers=request_headers,
+                        content=content,
+                        **kwargs,
+                    )
+            except self._transport_error as error:
+                if (
+                    not replayable
+                    or attempt >= self.max_retries
+                    or not (
+                        method in IDEMPOTENT_METHODS
+                        or isinstance(error, self._connect_errors)
+                    )
+                ):
+                    raise
+                logger.debug(f"{method} {path} failed with '{error}', retrying.")
+                await asyncio.sleep(
+                    backoff_delay(attempt, self.backoff_factor, self.max_backoff)
+                )
+                attempt += 1
+                continue
+            if not replayable:
+                return response
+            if response.status_code == UNAUTHORIZED_STATUS_CODE and refreshable:
+                refreshable = False
+                if await self._refresh_after_unauthorized(bearer_token):
+                    continue
+            elif (
+                is_retryable_status(method, response.status_code)
+                and attempt < self.max_retries
+            ):
+                logger.debug(
+                    f"{method} {path} failed with status {response.status_code}, "
+                    "retrying."
+                )
+                await asyncio.sleep(
+                    backoff_delay(
+                        attempt,
+                        self.backoff_factor,
+                        self.max_backoff,
+                        response.headers.get("Retry-After"),
+                    )
+                )
+                attempt += 1
+                continue
+            return response
+
+    async def _refresh_after_unauthorized(self, rejected_token: str | None) -> bool:
+        if not self.refresh_token:
+            return False
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            if self.bearer_token != rejected_token:
+                return True
+            try:
+                await self.authentication_refresh()
+            except (APIServerError, ValueError) as error:
+                logger.debug(f"Failed to refresh the bearer token: {error}")
+                return False
+            await asyncio.to_thread(self._store_refreshed_tokens)
+            return True
+
+    def get(self, path, params=None, cached: bool = False):
+        if not cached or self.cache is None:
+            return self._request("GET", path, params=params)
+        return self._cached_get(path, params)
+
+    async def _cached_get(self, path, params):
+        key = self.cache.key(path, params)
+        entry = self.cache.lookup(key)
+        if entry is not None and entry.fresh:
+            return entry.response
+        response = await self._request(
+            "GET", path, headers=self.cache.conditional_headers(entry), params=params
+        )
+        return self.cache.update(key, path, response, entry)
+
+    async def _modify(self, method: str, path: str, **kwargs):
+        try:
+            return await self._request(method, path, **kwargs)
+        finally:
+            self._invalidate_cache(path)
+
+    def post(self, path, data):
+        return self._modify("POST", path, json=data)
+
+    def post_binary(self, path, data: bytes | BinaryIO | Iterable[bytes]):
+        # Files and iterables are streamed, reading from them in worker threads
+        headers = {"Content-Type": "application/octet-stream"}
+        if hasattr(data, "read"):
+            try:
+                headers["Content-Length"] = str(
+                    os.fstat(data.fileno()).st_size - data.tell()
+                )
+            except (AttributeError, OSError):
+                pass
+        elif not isinstance(data, bytes) and not hasattr(data, "__aiter__"):
+            data = _aiterate(data)
+        return self._modify("POST", path, headers=headers, content=data)
+
+    def delete(self, path):
+        return self._modify("DELETE", path)
+
+    async def close(self):
+        """
+        Close the underlying client and release the pooled connections.
+        """
+        await self.client.aclose()
+
+    def __enter__(self):
+        raise TypeError(f"Use 'async with' with {self.__class__.__name__}")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def raise_for_status_or_return(self, raise_for_status: bool, response):
+        response = await response
+        if raise_for_status:
+            return self.raise_for_status(response)
+        else:
+            return response
+
+    async def authentication_access(self, name: str, password: str):
+        endpoint = "/auth/access"
+        data = {"name": name, "password": password}
+        response = await self.post(endpoint, data)
+        if response.status_code == 200:
+            self.bearer_token = response.json()["access_token"]
+            self.refresh_token = response.json()["refresh_token"]
+            self.user_name = name
+            return response
+        else:
+            raise APIServerError(response.json())
+
+    async def authentication_refresh(self):
+        endpoint = "/auth/refresh"
+        data = {"refresh_token": self.refresh_token}
+        response = await self.post(endpoint, data)
+        if response.status_code == 200:
+            self.bearer_token = response.json()["access_token"]
+            self.refresh_token = response.json()["refresh_token"]
+            return response
+        else:
+            raise APIServerError(response.json())
+
+    async def dataset_delete(
+        self, datastore_name: str, dataset_name: str, raise_for_status: bool = True
+    ):
+        # The endpoint is not available yet, so the synchronous implementation does
+        # not always return an awaitable
+        response = super().dataset_delete(
+            datastore_name, dataset_name, raise_for_status
+        )
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+
+    @staticmethod
+    def raise_for_status(response):
+        if response.is_error:
+            raise APIServerError(response.json())
+        else:
+            return response
+
+
+async def obtain_async_connection(
+    url: str,
+    name: str,
+    password: str,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    keep_alive: bool = True,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> AsyncAPIServer:
+    connection = AsyncAPIServer(
+        url,
+        pool_size=pool_size,
+        keep_alive=keep_alive,
+        max_concurrency=max_concurrency,
+        max_retries=max_retries,
+    )
+    await connection.authentication_access(name, password)
+    return connection
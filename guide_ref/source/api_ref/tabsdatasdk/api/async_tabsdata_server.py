@@ -0,0 +1,637 @@
+#
+# Copyright 2024 Tabs Data Inc.
+#
+
+import asyncio
+import functools
+import tempfile
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, List
+
+from tabsdatasdk.api.api_server import DEFAULT_MAX_RETRIES, DEFAULT_POOL_SIZE
+from tabsdatasdk.api.async_api_server import DEFAULT_MAX_CONCURRENCY, AsyncAPIServer
+from tabsdatasdk.api.query import (
+    DatasetQuery,
+    DatastoreQuery,
+    ExecutionPlanQuery,
+    Query,
+    UserQuery,
+)
+from tabsdatasdk.api.response_cache import ResponseCache
+from tabsdatasdk.api.tabsdata_server import (
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_MAX_WATCH_INTERVAL,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_WATCH_INTERVAL,
+    Dataset,
+    DatasetTrigger,
+    Datastore,
+    ExecutionPlan,
+    ExecutionPlanWatcher,
+    Function,
+    ServerStatus,
+    User,
+    create_archive_and_hash,
+    dataset_from_definition,
+    split_dataset_uri,
+)
+from tabsdatasdk.uri import URI
+from tabsdatasdk.utils.compression import DEFAULT_COMPRESSION
+
+if TYPE_CHECKING:
+    from tabsdatasdk.graph import DependencyGraph
+
+
+class AsyncTabsdataServer:
+    """
+    Asynchronous version of TabsdataServer, built on httpx, which must be installed.
+        It has the same methods and properties as TabsdataServer, but all of them
+        return an awaitable, and it must be logged in before being used, either by
+        awaiting login or by using it as an asynchronous context manager:
+
+        async with AsyncTabsdataServer(url, username, password) as server:
+            datasets = await server.datastore_list_dataset("datastore")
+
+    Args:
+        url (str): The url of the server.
+        username (str): The username of the user.
+        password (str): The password of the user.
+        pool_size (int): The maximum number of pooled connections to the server.
+        keep_alive (bool): Whether connections are kept open between requests.
+        max_concurrency (int): The maximum number of requests in flight. The rest
+            wait until one of them finishes.
+        max_retries (int): The maximum number of retries of a failed request.
+        cache_ttl (float | None): The seconds the datastores, datasets, users and
+            status obtained are cached, or None to not cache them.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        username: str,
+        password: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keep_alive: bool = True,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        cache_ttl: float | None = None,
+    ):
+        """
+        Initialize the AsyncTabsdataServer object.
+
+        Args:
+            url (str): The url of the server.
+            username (str): The username of the user.
+            password (str): The password of the user.
+            pool_size (int, optional): The maximum number of pooled connections to
+                the server. All requests done through this object share the pool.
+            keep_alive (bool, optional): Whether connections are kept open between
+                requests. If False, a new connection is opened for every request.
+            max_concurrency (int, optional): The maximum number of requests in
+                flight. The rest wait until one of them finishes.
+            max_retries (int, optional): The maximum number of retries of a request
+                that fails with a connection error or a 502, 503 or 504 status.
+                Requests rejected because the token expired are sent again after
+                refreshing it.
+            cache_ttl (float | None, optional): If set, datastore_get, dataset_get,
+                user_get and status return the same result for this number of
+                seconds. See TabsdataServer.
+        """
+        self.connection = AsyncAPIServer(
+            url,
+            pool_size=pool_size,
+            keep_alive=keep_alive,
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+            cache=ResponseCache(ttl=cache_ttl) if cache_ttl is not None else None,
+        )
+        self._credentials = (username, password)
+
+    async def login(self) -> None:
+        """
+        Log in the server with the credentials provided when creating the object.
+
+        Raises:
+            APIServerError: If the credentials are not valid.
+        """
+        await self.connection.authentication_access(*self._credentials)
+
+    async def close(self) -> None:
+        """
+        Close the connections to the server.
+        """
+        await self.connection.close()
+
+    def invalidate_cache(self) -> None:
+        """
+        Discard the cached results. See TabsdataServer.invalidate_cache.
+        """
+        if self.connection.cache is not None:
+            self.connection.cache.invalidate()
+
+    async def __aenter__(self):
+        await self.login()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @property
+    async def datastores(self) -> List[Datastore]:
+        """
+        Get the list of datastores in the server. This list is obtained every time the
+            property is awaited.
+
+        Returns:
+            List[Datastore]: The list of datastores in the server.
+        """
+        return [datastore async for datastore in self.iter_datastores()]
+
+    @property
+    async def execution_plans(self) -> List[ExecutionPlan]:
+        """
+        Get the list of execution plans in the server. This list is obtained every time
+            the property is awaited.
+
+        Returns:
+            List[ExecutionPlan]: The list of execution plans in the server.
+        """
+        return [execution_plan async for execution_plan in self.iter_execution_plans()]
+
+    @property
+    async def users(self) -> List[User]:
+        """
+        Get the list of users in the server. This list is obtained every time the
+            property is awaited.
+
+        Returns:
+            List[User]: The list of users in the server.
+        """
+        return [user async for user in self.iter_users()]
+
+    async def iter_datastores(
+        self,
+        query: DatastoreQuery | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Datastore]:
+        """
+        Iterate lazily over the datastores in the server. See
+            TabsdataServer.iter_datastores.
+        """
+        async for datastore in aiterate_pages(
+            self.connection.datastore_list, page_size, prefetch, query
+        ):
+            yield Datastore(**datastore)
+
+    async def iter_execution_plans(
+        self,
+        query: ExecutionPlanQuery | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[ExecutionPlan]:
+        """
+        Iterate lazily over the execution plans in the server. See
+            TabsdataServer.iter_execution_plans.
+        """
+        async for execution_plan in aiterate_pages(
+            self.connection.execution_plan_list, page_size, prefetch, query
+        ):
+            yield ExecutionPlan(**execution_plan)
+
+    async def watch_execution_plans(
+        self,
+        datastore: str | None = None,
+        dataset: str | None = None,
+        since: int | None = None,
+        interval: float = DEFAULT_WATCH_INTERVAL,
+        max_interval: float = DEFAULT_MAX_WATCH_INTERVAL,
+        until_finished: bool = False,
+        timeout: float | None = None,
+        triggered_by: str | None = None,
+    ) -> AsyncIterator[ExecutionPlan]:
+        """
+        Watch the execution plans in the server, yielding them when they appear and
+            every time their status changes. See
+            TabsdataServer.watch_execution_plans.
+        """
+        watcher = ExecutionPlanWatcher(
+            datastore,
+            dataset,
+            since,
+            interval=interval,
+            max_interval=max_interval,
+            triggered_by=triggered_by,
+        )
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        while True:
+            execution_plans = [
+                execution_plan
+                async for execution_plan in self.iter_execution_plans(watcher.query())
+            ]
+            for execution_plan in watcher.update(execution_plans):
+                yield execution_plan
+            if until_finished and watcher.finished:
+                return
+            wait = watcher.next_interval
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+                wait = min(wait, remaining)
+            await asyncio.sleep(wait)
+
+    async def iter_users(
+        self,
+        query: UserQuery | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[User]:
+        """
+        Iterate lazily over the users in the server. See TabsdataServer.iter_users.
+        """
+        async for user in aiterate_pages(
+            self.connection.users_list, page_size, prefetch, query
+        ):
+            yield User(**user)
+
+    async def iter_datastore_datasets(
+        self,
+        datastore_name: str,
+        query: DatasetQuery | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Dataset]:
+        """
+        Iterate lazily over the datasets in a datastore. See
+            TabsdataServer.iter_datastore_datasets.
+        """
+        list_page = functools.partial(
+            self.connection.dataset_in_datastore_list, datastore_name
+        )
+        async for dataset in aiterate_pages(list_page, page_size, prefetch, query):
+            yield Dataset(**dataset)
+
+    @property
+    async def status(self) -> ServerStatus:
+        """
+        Get the status of the server. This status is obtained every time the property is
+            awaited.
+
+        Returns:
+            ServerStatus: The status of the server.
+        """
+        return ServerStatus(
+            **(await self.connection.status_get()).json().get("database_status")
+        )
+
+    async def datastore_create(self, name: str, description: str = None) -> None:
+        """
+        Create a datastore in the server. See TabsdataServer.datastore_create.
+        """
+        description = description or name
+        await self.connection.datastore_create(name, description)
+
+    async def datastore_delete(self, name: str) -> None:
+        """
+        Delete a datastore in the server. See TabsdataServer.datastore_delete.
+        """
+        await self.connection.datastore_delete(name)
+
+    async def datastore_get(self, name: str) -> Datastore:
+        """
+        Get a datastore in the server. See TabsdataServer.datastore_get.
+        """
+        return Datastore(**(await self.connection.datastore_get_by_name(name)).json())
+
+    async def datastore_update(
+        self, name: str, new_name=None, new_description: str = None
+    ) -> None:
+        """
+        Update a datastore in the server. See TabsdataServer.datastore_update.
+        """
+        await self.connection.datastore_update(
+            name, new_datastore_name=new_name, description=new_description
+        )
+
+    async def user_create(
+        self,
+        name: str,
+        password: str,
+        full_name: str = None,
+        email: str = None,
+        enabled: bool = True,
+    ) -> None:
+        """
+        Create a user in the server. See TabsdataServer.user_create.
+        """
+        full_name = full_name or name
+        await self.connection.users_create(name, full_name, email, password, enabled)
+
+    async def user_delete(self, name: str) -> None:
+        """
+        Delete a user in the server. See TabsdataServer.user_delete.
+        """
+        await self.connection.users_delete(name)
+
+    async def user_get(self, name: str) -> User:
+        """
+        Get a user in the server. See TabsdataServer.user_get.
+        """
+        return User(**(await self.connection.users_get_by_name(name)).json())
+
+    async def user_update(
+        self,
+        name: str,
+        full_name: str = None,
+        email: str = None,
+        enabled: bool = None,
+    ) -> None:
+        """
+        Update a user in the server. See TabsdataServer.user_update.
+        """
+        await self.connection.users_update(
+            name,
+            full_name=full_name,
+            email=email,
+            enabled=enabled,
+        )
+
+    async def dataset_create(
+        self,
+        datastore_name: str,
+        function_path: str,
+        description: str = None,
+        path_to_bundle: str = None,
+        requirements: str = None,
+        local_packages: List[str] | str | None = None,
+        compression: str = DEFAULT_COMPRESSION,
+        compression_level: int | None = None,
+        requirements_scope: str = "environment",
+        save_target: str = None,
+        use_gitignore: bool = False,
+    ) -> None:
+        """
+        Create a dataset in the server. See TabsdataServer.dataset_create. The bundle
+            is built in a worker thread, so the event loop is not blocked.
+        """
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            (
+                bundle_hash,
+                tables,
+                string_dependencies,
+                trigger_by,
+                function_snippet,
+                context_location,
+                dataset_name,
+            ) = await asyncio.to_thread(
+                create_archive_and_hash,
+                function_path,
+                temporary_directory,
+                path_to_bundle,
+                requirements,
+                local_packages,
+                compression,
+                compression_level,
+                requirements_scope,
+                save_target,
+                use_gitignore,
+            )
+            response = await self.connection.dataset_create(
+                datastore_name=datastore_name,
+                dataset_name=dataset_name,
+                description=description or dataset_name,
+                bundle_hash=bundle_hash,
+                tables=tables,
+                dependencies=string_dependencies,
+                trigger_by=trigger_by,
+                function_snippet=function_snippet,
+            )
+            await self._upload_bundle(
+                datastore_name,
+                dataset_name,
+                response.json().get("current_function_id"),
+                context_location,
+            )
+
+    async def dataset_update(
+        self,
+        datastore_name: str,
+        dataset_name: str,
+        function_path: str,
+        description: str,
+        directory_to_bundle: str = None,
+        requirements: str = None,
+        local_packages: List[str] | str | None = None,
+        compression: str = DEFAULT_COMPRESSION,
+        compression_level: int | None = None,
+        requirements_scope: str = "environment",
+        save_target: str = None,
+        use_gitignore: bool = False,
+    ) -> None:
+        """
+        Update a dataset in the server. See TabsdataServer.dataset_update. The bundle
+            is built in a worker thread, so the event loop is not blocked.
+        """
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            (
+                bundle_hash,
+                tables,
+                string_dependencies,
+                trigger_by,
+                function_snippet,
+                context_location,
+                new_dataset_name,
+            ) = await asyncio.to_thread(
+                create_archive_and_hash,
+                function_path,
+                temporary_directory,
+                directory_to_bundle,
+                requirements,
+                local_packages,
+                compression,
+                compression_level,
+                requirements_scope,
+                save_target,
+                use_gitignore,
+            )
+            response = await self.connection.dataset_update(
+                datastore_name=datastore_name,
+                dataset_name=dataset_name,
+                new_dataset_name=new_dataset_name,
+                description=description,
+                bundle_hash=bundle_hash,
+                tables=tables,
+                dependencies=string_dependencies,
+                trigger_by=trigger_by,
+                function_snippet=function_snippet,
+            )
+            await self._upload_bundle(
+                datastore_name,
+                new_dataset_name or dataset_name,
+                response.json().get("current_function_id"),
+                context_location,
+            )
+
+    async def _upload_bundle(
+        self,
+        datastore_name: str,
+        dataset_name: str,
+        function_id: str,
+        context_location: str,
+    ) -> None:
+        with open(context_location, "rb") as file:
+            await self.connection.dataset_upload_function_bundle(
+                datastore_name=datastore_name,
+                dataset_name=dataset_name,
+                function_id=function_id,
+                bundle=file,
+            )
+
+    async def dataset_delete(self, datastore_name, dataset_name) -> None:
+        """
+        Delete a dataset in the server. See TabsdataServer.dataset_delete.
+        """
+        await self.connection.dataset_delete(datastore_name, dataset_name)
+
+    async def dataset_list_functions(
+        self, datastore_name, dataset_name
+    ) -> List[Function]:
+        """
+        List the functions in a dataset. See TabsdataServer.dataset_list_functions.
+        """
+        raw_list_of_functions = (
+            (await self.connection.dataset_list_functions(datastore_name, dataset_name))
+            .json()
+            .get("data")
+        )
+        return [Function(**function) for function in raw_list_of_functions]
+
+    async def dataset_trigger(self, datastore_name, dataset_name):
+        """
+        Trigger a dataset in the server. See TabsdataServer.dataset_trigger.
+
+        Returns:
+            httpx.Response: The response of the trigger request.
+        """
+        return await self.connection.dataset_execute(datastore_name, dataset_name)
+
+    async def dataset_trigger_many(
+        self, uris: List[str | URI], max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    ) -> List[DatasetTrigger]:
+        """
+        Trigger many datasets in the server at once, with at most max_in_flight
+            requests at the same time. See TabsdataServer.dataset_trigger_many.
+        """
+        in_flight = asyncio.Semaphore(max_in_flight)
+
+        async def trigger(uri: str | URI) -> DatasetTrigger:
+            result = DatasetTrigger(str(uri))
+            try:
+                datastore_name, dataset_name = split_dataset_uri(uri)
+                async with in_flight:
+                    start = time.perf_counter()
+                    try:
+                        result.response = await self.connection.dataset_execute(
+                            datastore_name, dataset_name
+                        )
+                    finally:
+                        result.latency = time.perf_counter() - start
+            except Exception as e:
+                result.error = e
+            return result
+
+        return await asyncio.gather(*(trigger(uri) for uri in uris))
+
+    async def dataset_get(self, datastore_name, dataset_name) -> Dataset:
+        """
+        Get a dataset in the server. See TabsdataServer.dataset_get.
+        """
+        dataset_definition = (
+            await self.connection.dataset_show_current_function(
+                datastore_name, dataset_name
+            )
+        ).json()
+        return dataset_from_definition(datastore_name, dataset_definition)
+
+    async def datastore_list_dataset(self, datastore_name) -> List[Dataset]:
+        """
+        List the datasets in a datastore. See TabsdataServer.datastore_list_dataset.
+        """
+        return [
+            dataset async for dataset in self.iter_datastore_datasets(datastore_name)
+        ]
+
+    async def datastore_dependency_graph(
+        self, datastore_name, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    ) -> "DependencyGraph":
+        """
+        Build the trigger and data dependency graphs of the datasets in a datastore,
+            with at most max_in_flight requests at the same time. See
+            TabsdataServer.datastore_dependency_graph.
+        """
+        from tabsdatasdk.graph import DependencyGraph
+
+        in_flight = asyncio.Semaphore(max_in_flight)
+
+        async def get(dataset: Dataset) -> Dataset:
+            async with in_flight:
+                return await self.dataset_get(datastore_name, dataset.name)
+
+        return DependencyGraph.from_datasets(
+            await asyncio.gather(
+                *[
+                    get(dataset)
+                    async for dataset in self.iter_datastore_datasets(datastore_name)
+                ]
+            )
+        )
+
+
+async def aiterate_pages(
+    list_page: Callable[..., Awaitable],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+    query: Query | None = None,
+) -> AsyncIterator[dict]:
+    """
+    Asynchronous version of iterate_pages: iterate lazily over the elements of a
+        list endpoint of the server, requesting them in pages of page_size elements.
+        If prefetch is True, the next page is requested in a task while the current
+        one is being consumed. The filters, ordering and limit of the query are
+        applied by the server.
+    """
+    params = query.params() if query else {}
+    remaining = query.max_elements if query else None
+    if remaining is not None:
+        if remaining <= 0:
+            return
+        page_size = min(page_size, remaining)
+
+    async def fetch_page(offset: int) -> List[dict]:
+        response = await list_page(offset=offset, len=page_size, **params)
+        return response.json().get("data") or []
+
+    next_page = None
+    try:
+        offset = 0
+        page = await fetch_page(offset)
+        while page:
+            last_page = False
+            if remaining is not None:
+                page = page[:remaining]
+                remaining -= len(page)
+                last_page = remaining <= 0
+            offset += len(page)
+            if prefetch and not last_page:
+                next_page = asyncio.ensure_future(fetch_page(offset))
+            for element in page:
+                yield element
+            if last_page:
+                return
+            page = await (next_page or fetch_page(offset))
+            next_page = None
+    finally:
+        if next_page:
+            next_page.cancel()
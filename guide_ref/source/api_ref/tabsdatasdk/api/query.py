@@ -0,0 +1,209 @@
+#
+# Copyright 2024 Tabs Data Inc.
+#
+
+from enum import Enum
+from typing import List
+
+from tabsdatasdk.exceptions import ErrorCode, TabsdataServerError
+
+ASCENDING_SUFFIX = "+"
+DESCENDING_SUFFIX = "-"
+FILTER_SEPARATOR = ":"
+
+
+class Operator(Enum):
+    """
+    Enum for the comparison operators of the filters of a query.
+    """
+
+    EQUAL = "eq"
+    NOT_EQUAL = "ne"
+    GREATER = "gt"
+    GREATER_OR_EQUAL = "ge"
+    LESS = "lt"
+    LESS_OR_EQUAL = "le"
+    LIKE = "lk"
+
+
+class Query:
+    """
+    Builder of the filters, ordering and limit of a request to a list endpoint of
+        the server, so that they are applied by the server instead of downloading
+        every element and filtering them locally. The methods can be chained:
+
+        ExecutionPlanQuery().status("R").datastore("sales").newest_first().limit(10)
+
+    Filters are combined with a logical and. Each filter is sent to the server as
+        'field:operator:value', and the ordering as 'field+' or 'field-'.
+
+    Attributes:
+        FIELDS (List[str]): The fields that can be used to filter and order.
+    """
+
+    FIELDS: List[str] = []
+
+    def __init__(self):
+        self.filters: List[str] = []
+        self.order: str | None = None
+        self.max_elements: int | None = None
+
+    def where(
+        self, field: str, value, operator: Operator | str = Operator.EQUAL
+    ) -> "Query":
+        """
+        Add a filter to the query.
+
+        Args:
+            field (str): The field to filter by.
+            value: The value to compare the field with.
+            operator (Operator | str): The comparison operator, as an Operator or its
+                value, like 'eq' or 'gt'.
+
+        Returns:
+            Query: The query itself, to chain more methods.
+        """
+        self._check_field(field)
+        try:
+            operator = Operator(operator)
+        except ValueError:
+            raise TabsdataServerError(
+                ErrorCode.TSE4, operator, [element.value for element in Operator]
+            )
+        if isinstance(value, bool):
+            value = str(value).lower()
+        self.filters.append(FILTER_SEPARATOR.join([field, operator.value, str(value)]))
+        return self
+
+    def order_by(self, field: str, descending: bool = False) -> "Query":
+        """
+        Set the field used to order the results.
+
+        Args:
+            field (str): The field to order by.
+            descending (bool): Whether to order in descending order.
+
+        Returns:
+            Query: The query itself, to chain more methods.
+        """
+        self._check_field(field)
+        self.order = field + (DESCENDING_SUFFIX if descending else ASCENDING_SUFFIX)
+        return self
+
+    def limit(self, max_elements: int) -> "Query":
+        """
+        Set the maximum number of results.
+
+        Args:
+            max_elements (int): The maximum number of results.
+
+        Returns:
+            Query: The query itself, to chain more methods.
+        """
+        self.max_elements = max_elements
+        return self
+
+    def params(self) -> dict:
+        """
+        Obtain the parameters of the query for the list endpoints of APIServer.
+        """
+        params = {}
+        if self.filters:
+            params["filter"] = self.filters
+        if self.order:
+            params["order_by"] = self.order
+        return params
+
+    def _check_field(self, field: str):
+        if self.FIELDS and field not in self.FIELDS:
+            raise TabsdataServerError(
+                ErrorCode.TSE3, field, self.__class__.__name__, self.FIELDS
+            )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(filters={self.filters!r},"
+            f"order={self.order!r},max_elements={self.max_elements!r})"
+        )
+
+
+class DatasetQuery(Query):
+    """
+    Query for the datasets of a datastore.
+    """
+
+    FIELDS = ["name", "description", "created_on", "created_by"]
+
+    def name(self, name: str) -> "DatasetQuery":
+        return self.where("name", name)
+
+    def created_by(self, user: str) -> "DatasetQuery":
+        return self.where("created_by", user)
+
+
+class DatastoreQuery(Query):
+    """
+    Query for the datastores of the server.
+    """
+
+    FIELDS = ["name", "description", "created_on", "created_by"]
+
+    def name(self, name: str) -> "DatastoreQuery":
+        return self.where("name", name)
+
+    def created_by(self, user: str) -> "DatastoreQuery":
+        return self.where("created_by", user)
+
+
+class ExecutionPlanQuery(Query):
+    """
+    Query for the execution plans of the server.
+    """
+
+    FIELDS = [
+        "datastore",
+        "dataset",
+        "triggered_by",
+        "triggered_on",
+        "started_on",
+        "ended_on",
+        "status",
+    ]
+
+    def status(self, status: str) -> "ExecutionPlanQuery":
+        """
+        Filter by status, either as its code, like 'R', or its name, like 'Running'.
+        """
+        # Imported here to avoid a circular import
+        from tabsdatasdk.api.tabsdata_server import ExecutionPlan
+
+        codes = {
+            name.lower(): code for code, name in ExecutionPlan.STATUS_MAPPING.items()
+        }
+        return self.where("status", codes.get(status.lower(), status))
+
+    def datastore(self, datastore: str) -> "ExecutionPlanQuery":
+        return self.where("datastore", datastore)
+
+    def dataset(self, dataset: str) -> "ExecutionPlanQuery":
+        return self.where("dataset", dataset)
+
+    def triggered_by(self, user: str) -> "ExecutionPlanQuery":
+        return self.where("triggered_by", user)
+
+    def newest_first(self) -> "ExecutionPlanQuery":
+        return self.order_by("triggered_on", descending=True)
+
+
+class UserQuery(Query):
+    """
+    Query for the users of the server.
+    """
+
+    FIELDS = ["name", "full_name", "email", "enabled"]
+
+    def name(self, name: str) -> "UserQuery":
+        return self.where("name", name)
+
+    def enabled(self, enabled: bool = True) -> "UserQuery":
+        return self.where("enabled", enabled)
@@ -0,0 +1,135 @@
+#
+# Copyright 2024 Tabs Data Inc.
+#
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, NamedTuple
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL = 30.0
+ETAG_HEADER = "ETag"
+IF_NONE_MATCH_HEADER = "If-None-Match"
+NOT_MODIFIED_STATUS_CODE = 304
+
+
+class CachedResponse(NamedTuple):
+    path: str
+    response: object
+    etag: str | None
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ResponseCache:
+    """
+    In-process cache of the responses of read endpoints of the server, which
+        evicts the least recently used response when it is full.
+
+    A response is served from the cache until it is older than ttl seconds. After
+        that, if the server sent an ETag with it, the request is sent with an
+        If-None-Match header, so that the server can answer that it has not changed
+        without sending it again. Requests that modify the server invalidate the
+        responses of the resources under their path.
+
+    The cache can be shared by threads.
+
+    Args:
+        max_entries (int): The maximum number of responses in the cache.
+        ttl (float): The seconds a response is served without asking the server.
+    """
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(path: str, params: dict | None = None) -> Hashable:
+        return path, tuple(sorted((params or {}).items(), key=repr))
+
+    def lookup(self, key: Hashable) -> CachedResponse | None:
+        """
+        Obtain the cached response of a request, fresh or not, and count a hit if it
+            is fresh or a miss otherwise.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            if entry is not None and entry.fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry
+
+    def conditional_headers(self, entry: CachedResponse | None) -> dict:
+        """
+        Obtain the headers to ask the server whether a cached response has changed.
+        """
+        if entry is None or entry.etag is None:
+            return {}
+        return {IF_NONE_MATCH_HEADER: entry.etag}
+
+    def update(self, key: Hashable, path: str, response, entry: CachedResponse | None):
+        """
+        Update the cache with the response of the server to a request, and obtain
+            the response to return: the cached one if the server answered that it
+            has not changed.
+        """
+        if response.status_code == NOT_MODIFIED_STATUS_CODE and entry is not None:
+            self.revalidations += 1
+            response = entry.response
+        elif response.status_code != 200:
+            return response
+        with self._lock:
+            self._entries[key] = CachedResponse(
+                path,
+                response,
+                response.headers.get(ETAG_HEADER),
+                time.monotonic() + self.ttl,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return response
+
+    def invalidate(self, path: str | None = None):
+        """
+        Remove the cached responses of a resource, the resources under it and the
+            resources it is under, or all of them if path is None. The ancestors are
+            removed because modifying a resource, like executing a dataset or
+            uploading the bundle of its function, can change them too.
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            path = path.rstrip("/")
+            for key in [
+                key
+                for key, entry in self._entries.items()
+                if entry.path == path
+                or entry.path.startswith(path + "/")
+                or path.startswith(entry.path + "/")
+            ]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(max_entries={self.max_entries!r},"
+            f"ttl={self.ttl!r})"
+        )
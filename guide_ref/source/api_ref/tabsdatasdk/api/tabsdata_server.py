@@ -3,20 +3,55 @@
 #
 
 import datetime
-import hashlib
+import email.utils
+import functools
+import glob
 import importlib.util
 import inspect
+import multiprocessing
 import os
+import statistics
 import sys
 import tempfile
-from typing import List
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Iterator, List, Tuple
 
 import requests
 
-from tabsdatasdk.api.api_server import obtain_connection
+from tabsdatasdk.api.api_server import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POOL_SIZE,
+    obtain_connection,
+    read_in_chunks,
+)
+from tabsdatasdk.api.query import (
+    DatasetQuery,
+    DatastoreQuery,
+    ExecutionPlanQuery,
+    Query,
+    UserQuery,
+)
+from tabsdatasdk.api.response_cache import ResponseCache
 from tabsdatasdk.datasetfunction import DatasetFunction, TableInput, TableOutput
-from tabsdatasdk.uri import URI
-from tabsdatasdk.utils.bundle_utils import create_bundle_archive
+from tabsdatasdk.uri import URI, build_uri_object
+from tabsdatasdk.utils.bundle_cache import (  # noqa: F401
+    MAX_CACHED_BUNDLES,
+    calculate_file_sha256,
+)
+from tabsdatasdk.utils.compression import DEFAULT_COMPRESSION
+
+# The bundling code and the dependency graphs are only imported by the methods that
+# use them, so that clients that only query the server, like most CLI commands, do
+# not import them
+if TYPE_CHECKING:
+    from tabsdatasdk.graph import DependencyGraph
+
+DEFAULT_MAX_IN_FLIGHT = 8
+DEFAULT_MAX_UPLOADS = 4
+DEFAULT_MAX_WATCH_INTERVAL = 10.0
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_WATCH_INTERVAL = 1.0
 
 
 class ExecutionPlan:
@@ -36,6 +71,10 @@ class ExecutionPlan:
     Attributes:
         STATUS_MAPPING (dict): A dictionary mapping the status of the execution plan to
             a human-readable string.
+        FINAL_STATUSES (Tuple[str]): The statuses of the execution plans that have
+            finished.
+        id (str | None): The id of the execution plan, if the server sent it.
+        finished (bool): Whether the execution plan has finished.
         triggered_on_str (str): The timestamp when the execution plan was triggered as a
             string.
         ended_on_str (str): The timestamp when the execution plan ended as a string.
@@ -54,6 +93,7 @@ class ExecutionPlan:
         "R": "Running",
         "S": "Scheduled",
     }
+    FINAL_STATUSES = ("C", "D", "E", "F")
 
     def status_to_mapping(self, status: str) -> str:
         """
@@ -98,8 +138,13 @@ class ExecutionPlan:
         self.started_on = started_on
         self.started_on_str = convert_timestamp_to_string(self.started_on)
         self.status = self.status_to_mapping(status)
+        self.id = kwargs.get("id")
         self.kwargs = kwargs
 
+    @property
+    def finished(self) -> bool:
+        return self.raw_status in self.FINAL_STATUSES
+
     def __repr__(self) -> str:
         repr = (
             f"{self.__class__.__name__}(datastore={self.datastore!r},"
@@ -437,6 +482,168 @@ class User:
         return self.name == other.name
 
 
+class DatasetRegistration:
+    """
+    This class represents the result of registering a dataset as part of a batch.
+
+    Args:
+        function_path (str): The path to the function, in the form of
+            /path/to/file.py::function_name.
+        dataset_name (str | None): The name of the dataset, or None if the function
+            could not be loaded.
+        error (Exception | None): The error raised while registering the dataset, or
+            None if it was registered successfully.
+    """
+
+    def __init__(
+        self,
+        function_path: str,
+        dataset_name: str | None = None,
+        error: Exception | None = None,
+    ):
+        """
+        Initialize the DatasetRegistration object.
+
+        Args:
+            function_path (str): The path to the function, in the form of
+                /path/to/file.py::function_name.
+            dataset_name (str | None): The name of the dataset, or None if the
+                function could not be loaded.
+            error (Exception | None): The error raised while registering the
+                dataset, or None if it was registered successfully.
+        """
+        self.function_path = function_path
+        self.dataset_name = dataset_name
+        self.error = error
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(function_path={self.function_path!r},"
+            f"dataset_name={self.dataset_name!r},error={self.error!r})"
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"Function: {self.function_path!r}, dataset: {self.dataset_name!r}, "
+            f"result: {'OK' if self.succeeded else f'failed ({self.error})'}"
+        )
+
+
+class DatasetTrigger:
+    """
+    This class represents the result of triggering a dataset as part of a batch.
+
+    Args:
+        uri (str): The URI of the dataset.
+        response (requests.Response | None): The response of the trigger request, or
+            None if it failed.
+        error (Exception | None): The error raised while triggering the dataset, or
+            None if it was triggered successfully.
+        latency (float | None): The seconds the trigger request took, or None if it
+            was not sent.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        response: requests.Response | None = None,
+        error: Exception | None = None,
+        latency: float | None = None,
+    ):
+        """
+        Initialize the DatasetTrigger object.
+
+        Args:
+            uri (str): The URI of the dataset.
+            response (requests.Response | None): The response of the trigger
+                request, or None if it failed.
+            error (Exception | None): The error raised while triggering the
+                dataset, or None if it was triggered successfully.
+            latency (float | None): The seconds the trigger request took, or None
+                if it was not sent.
+        """
+        self.uri = uri
+        self.response = response
+        self.error = error
+        self.latency = latency
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(uri={self.uri!r},error={self.error!r},"
+            f"latency={self.latency!r})"
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"Dataset: {self.uri!r}, "
+            f"result: {'OK' if self.succeeded else f'failed ({self.error})'}"
+        )
+
+
+def trigger_statistics(triggers: List[DatasetTrigger]) -> dict:
+    """
+    Summarize the results of a batch of triggers: the number of them that succeeded
+        and failed, and the minimum, mean, median, 95th percentile and maximum
+        latency of the requests sent, in seconds.
+    """
+    latencies = sorted(
+        trigger.latency for trigger in triggers if trigger.latency is not None
+    )
+    summary = {
+        "total": len(triggers),
+        "succeeded": sum(trigger.succeeded for trigger in triggers),
+        "failed": sum(not trigger.succeeded for trigger in triggers),
+    }
+    if latencies:
+        summary.update(
+            {
+                "min": latencies[0],
+                "mean": statistics.fmean(latencies),
+                "p50": statistics.median(latencies),
+                "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                "max": latencies[-1],
+            }
+        )
+    return summary
+
+
+def _timed_trigger(
+    trigger: Callable[[str, str], requests.Response], uri: str
+) -> DatasetTrigger:
+    result = DatasetTrigger(str(uri))
+    try:
+        datastore_name, dataset_name = split_dataset_uri(uri)
+        start = time.perf_counter()
+        try:
+            result.response = trigger(datastore_name, dataset_name)
+        finally:
+            result.latency = time.perf_counter() - start
+    except Exception as e:
+        result.error = e
+    return result
+
+
+def split_dataset_uri(uri: str | URI) -> Tuple[str, str]:
+    """
+    Obtain the names of the datastore and the dataset a URI points to.
+    """
+    uri = build_uri_object(uri)
+    if not uri.datastore or not uri.dataset:
+        raise ValueError(
+            f"The URI '{uri}' does not point to a dataset. It should be of the form "
+            "'td:///datastore_name/dataset_name'."
+        )
+    return uri.datastore, uri.dataset
+
+
 class TabsdataServer:
     """
     This class represents the TabsdataServer.
@@ -445,9 +652,23 @@ class TabsdataServer:
         url (str): The url of the server.
         username (str): The username of the user.
         password (str): The password of the user.
+        pool_size (int): The maximum number of pooled connections to the server.
+        keep_alive (bool): Whether connections are kept open between requests.
+        max_retries (int): The maximum number of retries of a failed request.
+        cache_ttl (float | None): The seconds the datastores, datasets, users and
+            status obtained are cached, or None to not cache them.
     """
 
-    def __init__(self, url: str, username: str, password: str):
+    def __init__(
+        self,
+        url: str,
+        username: str,
+        password: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keep_alive: bool = True,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        cache_ttl: float | None = None,
+    ):
         """
         Initialize the TabsdataServer object.
 
@@ -455,8 +676,36 @@ class TabsdataServer:
             url (str): The url of the server.
             username (str): The username of the user.
             password (str): The password of the user.
+            pool_size (int, optional): The maximum number of pooled connections to
+                the server. All requests done through this object share the pool.
+            keep_alive (bool, optional): Whether connections are kept open between
+                requests. If False, a new connection is opened for every request.
+            max_retries (int, optional): The maximum number of retries of a request
+                that fails with a connection error or a 502, 503 or 504 status.
+                Requests rejected because the token expired are sent again after
+                refreshing it.
+            cache_ttl (float | None, optional): If set, datastore_get, dataset_get,
+                user_get and status return the same result for this number of
+                seconds, and then ask the server whether it changed. The cached
+                results are discarded when they are modified through this object.
+        """
+        self.connection = obtain_connection(
+            url,
+            username,
+            password,
+            pool_size=pool_size,
+            keep_alive=keep_alive,
+            max_retries=max_retries,
+            cache=ResponseCache(ttl=cache_ttl) if cache_ttl is not None else None,
+        )
+
+    def invalidate_cache(self) -> None:
+        """
+        Discard the cached results, so that they are obtained again from the server.
+            It does nothing if the object was created without a cache_ttl.
         """
-        self.connection = obtain_connection(url, username, password)
+        if self.connection.cache is not None:
+            self.connection.cache.invalidate()
 
     @property
     def datastores(self) -> List[Datastore]:
@@ -468,8 +717,7 @@ class TabsdataServer:
         Returns:
             List[Datastore]: The list of datastores in the server.
         """
-        raw_datastores = self.connection.datastore_list().json().get("data")
-        return [Datastore(**datastore) for datastore in raw_datastores]
+        return list(self.iter_datastores())
 
     @property
     def execution_plans(self) -> List[ExecutionPlan]:
@@ -481,10 +729,7 @@ class TabsdataServer:
         Returns:
             List[ExecutionPlan]: The list of execution plans in the server.
         """
-        raw_execution_plans = self.connection.execution_plan_list().json().get("data")
-        return [
-            ExecutionPlan(**execution_plan) for execution_plan in raw_execution_plans
-        ]
+        return list(self.iter_execution_plans())
 
     @property
     def users(self) -> List[User]:
@@ -496,15 +741,197 @@ class TabsdataServer:
         Returns:
             List[User]: The list of users in the server.
         """
-        raw_users = self.connection.users_list().json().get("data")
-        return [User(**user) for user in raw_users]
+        return list(self.iter_users())
+
+    def iter_datastores(
+        self,
+        query: DatastoreQuery | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Datastore]:
+        """
+        Iterate lazily over the datastores in the server, which are requested in
+            pages as they are consumed.
+
+        Args:
+            query (DatastoreQuery, optional): The filters, ordering and limit applied
+                by the server.
+            page_size (int, optional): The number of datastores requested at once.
+            prefetch (bool, optional): Whether to request the next page in the
+                background while the current one is being consumed.
+
+        Returns:
+            Iterator[Datastore]: The datastores in the server.
+        """
+        for datastore in iterate_pages(
+            self.connection.datastore_list, page_size, prefetch, query
+        ):
+            yield Datastore(**datastore)
+
+    def iter_execution_plans(
+        self,
+        query: ExecutionPlanQuery | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[ExecutionPlan]:
+        """
+        Iterate lazily over the execution plans in the server, which are requested
+            in pages as they are consumed. For example, the 10 latest running
+            execution plans of a datastore are obtained with:
+
+            server.iter_execution_plans(
+                ExecutionPlanQuery().status("R").datastore("sales").newest_first()
+                .limit(10)
+            )
+
+        Args:
+            query (ExecutionPlanQuery, optional): The filters, ordering and limit
+                applied by the server.
+            page_size (int, optional): The number of execution plans requested at
+                once.
+            prefetch (bool, optional): Whether to request the next page in the
+                background while the current one is being consumed.
+
+        Returns:
+            Iterator[ExecutionPlan]: The execution plans in the server.
+        """
+        for execution_plan in iterate_pages(
+            self.connection.execution_plan_list, page_size, prefetch, query
+        ):
+            yield ExecutionPlan(**execution_plan)
+
+    def watch_execution_plans(
+        self,
+        datastore: str | None = None,
+        dataset: str | None = None,
+        since: int | None = None,
+        interval: float = DEFAULT_WATCH_INTERVAL,
+        max_interval: float = DEFAULT_MAX_WATCH_INTERVAL,
+        until_finished: bool = False,
+        timeout: float | None = None,
+        triggered_by: str | None = None,
+    ) -> Iterator[ExecutionPlan]:
+        """
+        Watch the execution plans in the server, yielding them when they appear and
+            every time their status changes. For example, to wait until the
+            execution plans of a dataset triggered from now on finish:
+
+            response = server.dataset_trigger("datastore", "dataset")
+            for plan in server.watch_execution_plans(
+                "datastore",
+                "dataset",
+                since=response_timestamp(response),
+                until_finished=True,
+            ):
+                print(plan.status)
+
+        The timestamps of the execution plans are set by the server, so since should
+            be taken from its clock, like with response_timestamp, and not from the
+            clock of the client, which can be ahead of it.
+
+        The server is polled, requesting only the execution plans that can still
+            change, and waiting longer between polls while nothing changes. See
+            ExecutionPlanWatcher.
+
+        Args:
+            datastore (str, optional): Only watch the execution plans of this
+                datastore.
+            dataset (str, optional): Only watch the execution plans of this dataset.
+            since (int, optional): Only watch the execution plans triggered at or
+                after this timestamp, in milliseconds. If None, the execution plans
+                existing when the watch starts are yielded first.
+            interval (float, optional): The initial seconds between polls.
+            max_interval (float, optional): The maximum seconds between polls.
+            until_finished (bool, optional): Whether to stop when all the watched
+                execution plans have finished.
+            timeout (float, optional): The seconds after which the watch stops.
+            triggered_by (str, optional): Only watch the execution plans triggered
+                by this user.
+
+        Returns:
+            Iterator[ExecutionPlan]: The execution plans, every time they change.
+        """
+        watcher = ExecutionPlanWatcher(
+            datastore,
+            dataset,
+            since,
+            interval=interval,
+            max_interval=max_interval,
+            triggered_by=triggered_by,
+        )
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            yield from watcher.update([*self.iter_execution_plans(watcher.query())])
+            if until_finished and watcher.finished:
+                return
+            wait = watcher.next_interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    def iter_users(
+        self,
+        query: UserQuery | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[User]:
+        """
+        Iterate lazily over the users in the server, which are requested in pages as
+            they are consumed.
+
+        Args:
+            query (UserQuery, optional): The filters, ordering and limit applied by
+                the server.
+            page_size (int, optional): The number of users requested at once.
+            prefetch (bool, optional): Whether to request the next page in the
+                background while the current one is being consumed.
+
+        Returns:
+            Iterator[User]: The users in the server.
+        """
+        for user in iterate_pages(
+            self.connection.users_list, page_size, prefetch, query
+        ):
+            yield User(**user)
+
+    def iter_datastore_datasets(
+        self,
+        datastore_name: str,
+        query: DatasetQuery | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+    ) -> Iterator[Dataset]:
+        """
+        Iterate lazily over the datasets in a datastore, which are requested in
+            pages as they are consumed.
+
+        Args:
+            datastore_name (str): The name of the datastore.
+            query (DatasetQuery, optional): The filters, ordering and limit applied
+                by the server.
+            page_size (int, optional): The number of datasets requested at once.
+            prefetch (bool, optional): Whether to request the next page in the
+                background while the current one is being consumed.
+
+        Returns:
+            Iterator[Dataset]: The datasets in the datastore.
+        """
+        list_page = functools.partial(
+            self.connection.dataset_in_datastore_list, datastore_name
+        )
+        for dataset in iterate_pages(list_page, page_size, prefetch, query):
+            yield Dataset(**dataset)
 
     @property
     def status(self) -> ServerStatus:
         """
         Get the status of the server. This status is obtained every time the property is
-            accessed, so sequential accesses to this property in the same object might
-            yield different results.
+            accessed, unless the object was created with a cache_ttl, so sequential
+            accesses to this property in the same object might yield different
+            results.
 
         Returns:
             ServerStatus: The status of the server.
@@ -659,6 +1086,11 @@ class TabsdataServer:
         path_to_bundle: str = None,
         requirements: str = None,
         local_packages: List[str] | str | None = None,
+        compression: str = DEFAULT_COMPRESSION,
+        compression_level: int | None = None,
+        requirements_scope: str = "environment",
+        save_target: str = None,
+        use_gitignore: bool = False,
     ) -> None:
         """
         Create a dataset in the server.
@@ -680,6 +1112,21 @@ class TabsdataServer:
                 Python packages that need to be included in the bundle. Each path
                 must exist and be a valid Python package that can be installed by
                 running `pip install /path/to/package`.
+            compression (str, optional): The compression backend of the bundle,
+                'gzip' or 'zstd'. Both compress using all the available cores.
+            compression_level (int, optional): The compression level of the bundle.
+                If not provided, the default level of the backend is used.
+            requirements_scope (str, optional): If the requirements are inferred,
+                whether to require every distribution installed in the current
+                'environment' (the default), or only the ones of the modules
+                'imports'-ed by the code of the function.
+            save_target (str, optional): Whether to bundle only the 'file' where the
+                function is defined, the whole 'folder', or only the files of the
+                folder 'imports'-ed by the function. Can not be used together with
+                the path to bundle. If neither is provided, 'folder' is used.
+            use_gitignore (bool, optional): Whether to skip the files matched by the
+                .gitignore of the bundled folder, in addition to the ones matched
+                by its .tdignore.
 
         Raises:
             APIServerError: If the dataset could not be created.
@@ -700,6 +1147,11 @@ class TabsdataServer:
             path_to_bundle,
             requirements,
             local_packages,
+            compression,
+            compression_level,
+            requirements_scope,
+            save_target,
+            use_gitignore,
         )
 
         description = description or dataset_name
@@ -715,14 +1167,8 @@ class TabsdataServer:
             function_snippet=function_snippet,
         )
         current_function_id = response.json().get("current_function_id")
-        with open(context_location, "rb") as file:
-            bundle = file.read()
-
-        self.connection.dataset_upload_function_bundle(
-            datastore_name=datastore_name,
-            dataset_name=dataset_name,
-            function_id=current_function_id,
-            bundle=bundle,
+        self._upload_bundle(
+            datastore_name, dataset_name, current_function_id, context_location
         )
 
     def dataset_update(
@@ -734,6 +1180,11 @@ class TabsdataServer:
         directory_to_bundle: str = None,
         requirements: str = None,
         local_packages: List[str] | str | None = None,
+        compression: str = DEFAULT_COMPRESSION,
+        compression_level: int | None = None,
+        requirements_scope: str = "environment",
+        save_target: str = None,
+        use_gitignore: bool = False,
     ) -> None:
         """
         Update a dataset in the server.
@@ -756,6 +1207,21 @@ class TabsdataServer:
                 Python packages that need to be included in the bundle. Each path
                 must exist and be a valid Python package that can be installed by
                 running `pip install /path/to/package`.
+            compression (str, optional): The compression backend of the bundle,
+                'gzip' or 'zstd'. Both compress using all the available cores.
+            compression_level (int, optional): The compression level of the bundle.
+                If not provided, the default level of the backend is used.
+            requirements_scope (str, optional): If the requirements are inferred,
+                whether to require every distribution installed in the current
+                'environment' (the default), or only the ones of the modules
+                'imports'-ed by the code of the function.
+            save_target (str, optional): Whether to bundle only the 'file' where the
+                function is defined, the whole 'folder', or only the files of the
+                folder 'imports'-ed by the function. Can not be used together with
+                the path to bundle. If neither is provided, 'folder' is used.
+            use_gitignore (bool, optional): Whether to skip the files matched by the
+                .gitignore of the bundled folder, in addition to the ones matched
+                by its .tdignore.
 
         Raises:
             APIServerError: If the dataset could not be updated.
@@ -775,6 +1241,11 @@ class TabsdataServer:
             directory_to_bundle,
             requirements,
             local_packages,
+            compression,
+            compression_level,
+            requirements_scope,
+            save_target,
+            use_gitignore,
         )
 
         response = self.connection.dataset_update(
@@ -790,16 +1261,200 @@ class TabsdataServer:
         )
 
         current_function_id = response.json().get("current_function_id")
-        with open(context_location, "rb") as file:
-            bundle = file.read()
+        self._upload_bundle(
+            datastore_name,
+            new_dataset_name or dataset_name,
+            current_function_id,
+            context_location,
+        )
 
-        self.connection.dataset_upload_function_bundle(
-            datastore_name=datastore_name,
-            dataset_name=new_dataset_name or dataset_name,
-            function_id=current_function_id,
-            bundle=bundle,
+    def dataset_create_many(
+        self,
+        datastore_name: str,
+        function_paths: List[str],
+        requirements: str = None,
+        local_packages: List[str] | str | None = None,
+        compression: str = DEFAULT_COMPRESSION,
+        compression_level: int | None = None,
+        requirements_scope: str = "environment",
+        save_target: str = None,
+        use_gitignore: bool = False,
+        max_workers: int | None = None,
+        max_uploads: int = DEFAULT_MAX_UPLOADS,
+    ) -> List[DatasetRegistration]:
+        """
+        Create many datasets in the server at once. The bundles are built in
+            parallel in a pool of processes, the datasets are created in the order
+            of function_paths, and the bundles are uploaded concurrently through the
+            connection pool of the server. A failure in one dataset does not stop
+            the others. The processes are spawned, not forked, so a script calling
+            this method must do it under an `if __name__ == "__main__":` guard.
+
+        Args:
+            datastore_name (str): The name of the datastore.
+            function_paths (List[str]): The paths to the functions, in the form of
+                /path/to/file.py::function_name, or glob patterns of Python files
+                (like 'src/**/*.py'), in which case a dataset is created for every
+                function of the files decorated as a dataset.
+            requirements (str, optional): Path to a custom requirements.yaml file
+                shared by all the functions. If not provided, this information is
+                inferred once from the current execution session.
+            local_packages (List[str] | str, optional): A list of paths to local
+                Python packages that need to be included in every bundle.
+            compression (str, optional): The compression backend of the bundles.
+            compression_level (int, optional): The compression level of the bundles.
+            requirements_scope (str, optional): If the requirements are inferred,
+                whether to require every distribution installed in the current
+                'environment' (the default), or only the ones of the modules
+                'imports'-ed by the code of each function.
+            save_target (str, optional): Whether to bundle only the 'file' where each
+                function is defined, the whole 'folder', or only the files of the
+                folder 'imports'-ed by the function. If not provided, 'folder' is
+                used.
+            use_gitignore (bool, optional): Whether to skip the files matched by the
+                .gitignore of the bundled folders.
+            max_workers (int, optional): The number of processes that build the
+                bundles. If not provided, one per available core is used.
+            max_uploads (int, optional): The maximum number of bundles uploaded at
+                the same time. It should not be greater than the pool size of the
+                server.
+
+        Returns:
+            List[DatasetRegistration]: The result of each registration, in the same
+                order as the functions.
+        """
+        from tabsdatasdk.utils.bundle_utils import (
+            REQUIREMENTS_FILE_NAME,
+            RequirementsScope,
+            create_requirements,
         )
 
+        module_cache = {}
+        function_paths = expand_function_paths(function_paths, module_cache)
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            if (
+                not requirements
+                and requirements_scope == RequirementsScope.ENVIRONMENT.value
+            ):
+                # Infer the requirements once; the local packages are recorded in
+                # the file and bundled from it
+                requirements_location = os.path.join(temporary_directory, "shared")
+                create_requirements(
+                    requirements_location, local_packages, deferred_sources=[]
+                )
+                requirements = os.path.join(
+                    requirements_location, REQUIREMENTS_FILE_NAME
+                )
+                local_packages = None
+
+            registrations = [
+                DatasetRegistration(function_path) for function_path in function_paths
+            ]
+            # Each bundle is uploaded from its own copy in save_location, but the
+            # cache must also be able to hold the whole batch, or the bundles built
+            # first would be evicted by the last ones and never reused
+            max_cached_bundles = max(MAX_CACHED_BUNDLES, len(function_paths))
+            build_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                # Forking a process that uses polars, or that has threads running,
+                # can deadlock the workers
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            with build_pool:
+                builds = []
+                for index, function_path in enumerate(function_paths):
+                    save_location = os.path.join(temporary_directory, str(index))
+                    os.makedirs(save_location)
+                    builds.append(
+                        build_pool.submit(
+                            _create_archive_and_hash_in_worker,
+                            function_path,
+                            save_location,
+                            requirements=requirements,
+                            local_packages=local_packages,
+                            compression=compression,
+                            compression_level=compression_level,
+                            requirements_scope=requirements_scope,
+                            save_target=save_target,
+                            use_gitignore=use_gitignore,
+                            max_cached_bundles=max_cached_bundles,
+                        )
+                    )
+                with ThreadPoolExecutor(max_workers=max_uploads) as upload_pool:
+                    uploads = []
+                    for registration, build in zip(registrations, builds):
+                        try:
+                            (
+                                bundle_hash,
+                                tables,
+                                string_dependencies,
+                                trigger_by,
+                                function_snippet,
+                                context_location,
+                                registration.dataset_name,
+                            ) = build.result()
+                            response = self.connection.dataset_create(
+                                datastore_name=datastore_name,
+                                dataset_name=registration.dataset_name,
+                                description=registration.dataset_name,
+                                bundle_hash=bundle_hash,
+                                tables=tables,
+                                dependencies=string_dependencies,
+                                trigger_by=trigger_by,
+                                function_snippet=function_snippet,
+                            )
+                        except Exception as e:
+                            registration.error = e
+                            continue
+                        uploads.append(
+                            (
+                                registration,
+                                upload_pool.submit(
+                                    self._upload_bundle,
+                                    datastore_name,
+                                    registration.dataset_name,
+                                    response.json().get("current_function_id"),
+                                    context_location,
+                                ),
+                            )
+                        )
+                    for registration, upload in uploads:
+                        try:
+                            upload.result()
+                        except Exception as e:
+                            registration.error = e
+        return registrations
+
+    def _upload_bundle(
+        self,
+        datastore_name: str,
+        dataset_name: str,
+        function_id: str,
+        context_location: str,
+        chunk_size: int | None = None,
+    ) -> None:
+        """
+        Upload the bundle of a function to the server, streaming it from disk so that
+            memory usage does not depend on the size of the bundle.
+
+        Args:
+            datastore_name (str): The name of the datastore.
+            dataset_name (str): The name of the dataset.
+            function_id (str): The id of the function the bundle belongs to.
+            context_location (str): The path to the compressed bundle.
+            chunk_size (int, optional): If provided, the bundle is sent with chunked
+                transfer encoding in chunks of this size. Otherwise, it is streamed
+                with a known Content-Length.
+        """
+        with open(context_location, "rb") as file:
+            bundle = read_in_chunks(file, chunk_size) if chunk_size else file
+            self.connection.dataset_upload_function_bundle(
+                datastore_name=datastore_name,
+                dataset_name=dataset_name,
+                function_id=function_id,
+                bundle=bundle,
+            )
+
     def dataset_delete(self, datastore_name, dataset_name) -> None:
         """
         Delete a dataset in the server.
@@ -850,6 +1505,34 @@ class TabsdataServer:
         """
         return self.connection.dataset_execute(datastore_name, dataset_name)
 
+    def dataset_trigger_many(
+        self, uris: List[str | URI], max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    ) -> List[DatasetTrigger]:
+        """
+        Trigger many datasets in the server at once. The server has no endpoint to
+            trigger several datasets in a single request, so the requests are sent
+            concurrently, with at most max_in_flight of them at the same time. A
+            failure in one dataset does not stop the others.
+
+        Args:
+            uris (List[str | URI]): The URIs of the datasets, of the form
+                'td:///datastore_name/dataset_name'.
+            max_in_flight (int, optional): The maximum number of requests sent at
+                the same time. It should not be greater than the pool size of the
+                server.
+
+        Returns:
+            List[DatasetTrigger]: The result of each trigger, in the same order as
+                the URIs. Use trigger_statistics to summarize them.
+        """
+        with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+            return list(
+                pool.map(
+                    functools.partial(_timed_trigger, self.connection.dataset_execute),
+                    uris,
+                )
+            )
+
     def dataset_get(self, datastore_name, dataset_name) -> Dataset:
         """
         Get a dataset in the server.
@@ -867,20 +1550,7 @@ class TabsdataServer:
         dataset_definition = self.connection.dataset_show_current_function(
             datastore_name, dataset_name
         ).json()
-        dataset_definition["datastore"] = datastore_name
-        function_definition = {}
-        function_definition_keys = [
-            "trigger_with_names",
-            "tables",
-            "dependencies_with_names",
-        ]
-        for function_definition_key in function_definition_keys:
-            function_definition[function_definition_key] = dataset_definition.pop(
-                function_definition_key
-            )
-        function = Function(**function_definition)
-        dataset_definition["function"] = function
-        return Dataset(**dataset_definition)
+        return dataset_from_definition(datastore_name, dataset_definition)
 
     def datastore_list_dataset(self, datastore_name) -> List[Dataset]:
         """
@@ -895,27 +1565,265 @@ class TabsdataServer:
         Raises:
             APIServerError: If the datasets could not be listed.
         """
-        raw_list_of_datasets = (
-            self.connection.dataset_in_datastore_list(datastore_name).json().get("data")
+        return list(self.iter_datastore_datasets(datastore_name))
+
+    def datastore_dependency_graph(
+        self, datastore_name, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    ) -> "DependencyGraph":
+        """
+        Build the trigger and data dependency graphs of the datasets in a datastore.
+            The current function of each dataset is requested concurrently, with at
+            most max_in_flight requests at the same time.
+
+        Args:
+            datastore_name (str): The name of the datastore.
+            max_in_flight (int, optional): The maximum number of requests sent at
+                the same time.
+
+        Returns:
+            DependencyGraph: The dependency graphs of the datasets.
+
+        Raises:
+            APIServerError: If the datasets could not be obtained.
+        """
+        from tabsdatasdk.graph import DependencyGraph
+
+        dataset_names = [
+            dataset.name for dataset in self.iter_datastore_datasets(datastore_name)
+        ]
+        with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+            return DependencyGraph.from_datasets(
+                pool.map(
+                    functools.partial(self.dataset_get, datastore_name), dataset_names
+                )
+            )
+
+
+def iterate_pages(
+    list_page: Callable[..., requests.Response],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+    query: Query | None = None,
+) -> Iterator[dict]:
+    """
+    Iterate lazily over the elements of a list endpoint of the server, requesting
+        them in pages of page_size elements. Only the current page, and the next one
+        if prefetch is True, are held in memory. The next page starts after the
+        elements received, and the iteration ends with the first empty page.
+
+    Args:
+        list_page (Callable[..., requests.Response]): The APIServer method of the
+            list endpoint. It is called with the offset and len of each page, and
+            the filter and order_by of the query.
+        page_size (int): The number of elements requested at once.
+        prefetch (bool): Whether to request the next page in the background while
+            the current one is being consumed.
+        query (Query, optional): The filters, ordering and limit applied by the
+            server. If it has a limit, no more elements than the limit are requested.
+    """
+    params = query.params() if query else {}
+    remaining = query.max_elements if query else None
+    if remaining is not None:
+        if remaining <= 0:
+            return
+        page_size = min(page_size, remaining)
+
+    def fetch_page(offset: int) -> List[dict]:
+        response = list_page(offset=offset, len=page_size, **params)
+        return response.json().get("data") or []
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        offset = 0
+        page = fetch_page(offset)
+        # Only an empty page ends the iteration: the server can return fewer
+        # elements than requested, for example if it caps the page size
+        while page:
+            last_page = False
+            if remaining is not None:
+                page = page[:remaining]
+                remaining -= len(page)
+                last_page = remaining <= 0
+            offset += len(page)
+            next_page = None
+            if executor and not last_page:
+                next_page = executor.submit(fetch_page, offset)
+            yield from page
+            if last_page:
+                return
+            page = next_page.result() if next_page else fetch_page(offset)
+    finally:
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ExecutionPlanWatcher:
+    """
+    State of a watch of the execution plans of the server, shared by the
+        synchronous and asynchronous watch_execution_plans.
+
+    The server does not push the changes of the execution plans, so they are
+        polled. Each poll only requests the execution plans triggered after the
+        oldest one still running, or after the newest one seen if all of them have
+        finished, instead of the whole list. The interval between polls doubles
+        while nothing changes, up to max_interval, and is reset when something
+        changes.
+
+    Args:
+        datastore (str, optional): Only watch the execution plans of this datastore.
+        dataset (str, optional): Only watch the execution plans of this dataset.
+        since (int, optional): Only watch the execution plans triggered at or after
+            this timestamp, in milliseconds. If None, the ones existing when the
+            watch starts are watched too.
+        interval (float): The initial seconds between polls.
+        max_interval (float): The maximum seconds between polls.
+        triggered_by (str, optional): Only watch the execution plans triggered by
+            this user.
+    """
+
+    def __init__(
+        self,
+        datastore: str | None = None,
+        dataset: str | None = None,
+        since: int | None = None,
+        interval: float = DEFAULT_WATCH_INTERVAL,
+        max_interval: float = DEFAULT_MAX_WATCH_INTERVAL,
+        triggered_by: str | None = None,
+    ):
+        self.datastore = datastore
+        self.dataset = dataset
+        self.triggered_by = triggered_by
+        self.watermark = since
+        self.interval = interval
+        self.max_interval = max_interval
+        self.next_interval = interval
+        self.statuses = {}
+        self.polls = 0
+
+    def query(self) -> ExecutionPlanQuery:
+        query = ExecutionPlanQuery().order_by("triggered_on")
+        if self.datastore:
+            query.datastore(self.datastore)
+        if self.dataset:
+            query.dataset(self.dataset)
+        if self.triggered_by:
+            query.triggered_by(self.triggered_by)
+        if self.watermark is not None:
+            query.where("triggered_on", self.watermark, "ge")
+        return query
+
+    def update(self, execution_plans: List[ExecutionPlan]) -> List[ExecutionPlan]:
+        """
+        Update the state with the result of a poll, and obtain the execution plans
+            that are new or whose status changed.
+        """
+        self.polls += 1
+        transitions = []
+        oldest_running, newest = None, None
+        for execution_plan in execution_plans:
+            triggered_on = execution_plan.triggered_on
+            # The filters are applied again, in case the server ignored them
+            if (
+                (self.datastore and execution_plan.datastore != self.datastore)
+                or (self.dataset and execution_plan.dataset != self.dataset)
+                or (
+                    self.triggered_by
+                    and execution_plan.triggered_by != self.triggered_by
+                )
+                or (self.watermark is not None and (triggered_on or 0) < self.watermark)
+            ):
+                continue
+            key = _execution_plan_key(execution_plan)
+            if self.statuses.get(key) != execution_plan.raw_status:
+                self.statuses[key] = execution_plan.raw_status
+                transitions.append(execution_plan)
+            if not triggered_on:
+                continue
+            if not execution_plan.finished:
+                oldest_running = min(oldest_running or triggered_on, triggered_on)
+            newest = max(newest or triggered_on, triggered_on)
+        self._move_watermark(oldest_running if oldest_running else newest)
+        if transitions:
+            self.next_interval = self.interval
+        else:
+            self.next_interval = min(self.next_interval * 2, self.max_interval)
+        return transitions
+
+    def _move_watermark(self, watermark: int | None):
+        if watermark is None or (
+            self.watermark is not None and watermark <= self.watermark
+        ):
+            return
+        self.watermark = watermark
+        # The execution plans before the watermark are not requested again, so they
+        # are forgotten
+        self.statuses = {
+            key: status
+            for key, status in self.statuses.items()
+            if key[-1] is None or key[-1] >= watermark
+        }
+
+    @property
+    def finished(self) -> bool:
+        """
+        Whether at least one execution plan has been seen and all of them finished.
+        """
+        return bool(self.statuses) and all(
+            status in ExecutionPlan.FINAL_STATUSES for status in self.statuses.values()
         )
-        return [Dataset(**dataset) for dataset in raw_list_of_datasets]
 
 
-def calculate_file_sha256(file_path: str) -> str:
-    sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+def _execution_plan_key(execution_plan: ExecutionPlan) -> tuple:
+    # The triggered_on goes last, so that old execution plans can be forgotten
+    return (
+        execution_plan.kwargs.get("id"),
+        execution_plan.datastore,
+        execution_plan.dataset,
+        execution_plan.triggered_on,
+    )
+
+
+def dataset_from_definition(datastore_name: str, dataset_definition: dict) -> Dataset:
+    """
+    Build a Dataset from the definition of its current function returned by the
+        server.
+    """
+    dataset_definition["datastore"] = datastore_name
+    function_definition = {}
+    function_definition_keys = [
+        "trigger_with_names",
+        "tables",
+        "dependencies_with_names",
+    ]
+    for function_definition_key in function_definition_keys:
+        function_definition[function_definition_key] = dataset_definition.pop(
+            function_definition_key
+        )
+    function = Function(**function_definition)
+    dataset_definition["function"] = function
+    return Dataset(**dataset_definition)
 
 
-def dynamic_import_function_from_path(path: str) -> DatasetFunction:
+def dynamic_import_function_from_path(
+    path: str, module_cache: dict | None = None
+) -> DatasetFunction:
     """
     Dynamically import a function from a path in the form of 'path::function_name'.
     :param path:
+    :param module_cache: If provided, modules already imported from the same file
+        are reused, and the imported module is stored in it.
     :return:
     """
     file_path, function_name = path.split("::")
+    module = _import_module_from_file(file_path, module_cache)
+    function = getattr(module, function_name)
+    return function
+
+
+def _import_module_from_file(file_path: str, module_cache: dict | None = None):
+    cache_key = os.path.abspath(file_path)
+    if module_cache is not None and cache_key in module_cache:
+        return module_cache[cache_key]
     sys.path.insert(0, os.path.dirname(file_path))
     module_name = os.path.splitext(os.path.basename(file_path))[0]
 
@@ -923,9 +1831,56 @@ def dynamic_import_function_from_path(path: str) -> DatasetFunction:
     module = importlib.util.module_from_spec(spec)
     sys.modules[module_name] = module
     spec.loader.exec_module(module)
+    if module_cache is not None:
+        module_cache[cache_key] = module
+    return module
 
-    function = getattr(module, function_name)
-    return function
+
+def expand_function_paths(
+    patterns: List[str], module_cache: dict | None = None
+) -> List[str]:
+    """
+    Expand a list of function paths and glob patterns of Python files into function
+        paths. Paths in the form of 'path::function_name' are kept as they are, and
+        every other pattern is replaced by the functions decorated as a dataset in
+        the files that match it.
+
+    Args:
+        patterns (List[str]): The function paths and glob patterns.
+        module_cache (dict, optional): If provided, modules already imported from
+            the same file are reused, and the imported modules are stored in it.
+
+    Returns:
+        List[str]: The function paths, without duplicates.
+    """
+    function_paths = []
+    for pattern in patterns:
+        if "::" in pattern:
+            function_paths.append(pattern)
+            continue
+        for file_path in sorted(glob.glob(pattern, recursive=True)):
+            module = _import_module_from_file(file_path, module_cache)
+            for name, value in vars(module).items():
+                # Skip the functions imported from other files
+                if isinstance(value, DatasetFunction) and os.path.abspath(
+                    os.path.join(value.original_folder, value.original_file)
+                ) == os.path.abspath(file_path):
+                    function_paths.append(f"{file_path}::{name}")
+    return list(dict.fromkeys(function_paths))
+
+
+# Modules imported by the process, reused when building several bundles in the same
+# worker of a pool
+_WORKER_MODULE_CACHE = {}
+
+
+def _create_archive_and_hash_in_worker(function_path, save_location, **kwargs):
+    return create_archive_and_hash(
+        function_path,
+        save_location,
+        module_cache=_WORKER_MODULE_CACHE,
+        **kwargs,
+    )
 
 
 def create_archive_and_hash(
@@ -934,8 +1889,17 @@ def create_archive_and_hash(
     path_to_bundle=None,
     requirements=None,
     local_packages=None,
+    compression=DEFAULT_COMPRESSION,
+    compression_level=None,
+    requirements_scope="environment",
+    save_target=None,
+    use_gitignore=False,
+    module_cache=None,
+    max_cached_bundles=MAX_CACHED_BUNDLES,
 ):
-    function = dynamic_import_function_from_path(function_path)
+    from tabsdatasdk.utils.bundle_utils import create_hashed_bundle_archive
+
+    function = dynamic_import_function_from_path(function_path, module_cache)
     dataset_name: str = function.dataset_name
     function_output = function.output
     tables = (
@@ -953,14 +1917,19 @@ def create_archive_and_hash(
         function_snippet = inspect.getsource(function.original_function)
     except OSError:
         function_snippet = "Function source code not available"
-    context_location = create_bundle_archive(
+    context_location, bundle_hash = create_hashed_bundle_archive(
         function,
-        save_location=temporary_directory.name,
+        save_location=getattr(temporary_directory, "name", temporary_directory),
         path_to_code=path_to_bundle,
+        save_target=save_target,
         requirements=requirements,
         local_packages=local_packages,
+        compression=compression,
+        compression_level=compression_level,
+        requirements_scope=requirements_scope,
+        use_gitignore=use_gitignore,
+        max_cached_bundles=max_cached_bundles,
     )
-    bundle_hash = calculate_file_sha256(context_location)
     return (
         bundle_hash,
         tables,
@@ -972,6 +1941,21 @@ def create_archive_and_hash(
     )
 
 
+def response_timestamp(response: requests.Response) -> int | None:
+    """
+    Obtain the time, in the clock of the server and in milliseconds, when a request
+        reached the server, from the Date header of its response minus the time the
+        request took. Since the Date header is truncated to seconds, it is never after
+        the moment the server handled the request. Returns None if the response does
+        not have a valid Date header.
+    """
+    try:
+        sent_on = email.utils.parsedate_to_datetime(response.headers["Date"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return int((sent_on.timestamp() - response.elapsed.total_seconds()) * 1000)
+
+
 def convert_timestamp_to_string(timestamp: int | None) -> str:
     if not timestamp:
         return str(timestamp)
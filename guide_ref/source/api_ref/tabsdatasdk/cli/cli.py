@@ -2,23 +2,28 @@
 # Copyright 2024 Tabs Data Inc.
 #
 
-import json
 import os
 
 import rich_click as click
 
-from tabsdatasdk.api.api_server import APIServer, obtain_connection
-from tabsdatasdk.api.tabsdata_server import TabsdataServer
-from tabsdatasdk.cli.cli_utils import DEFAULT_TABSDATA_DIRECTORY, logical_prompt
-from tabsdatasdk.cli.dataset_group import dataset
-from tabsdatasdk.cli.datastore_group import datastore
-from tabsdatasdk.cli.execution_plan_group import execution_plan
-from tabsdatasdk.cli.user_group import user
+from tabsdatasdk.cli.cli_utils import (
+    CONNECTION_FILE,
+    DEFAULT_TABSDATA_DIRECTORY,
+    LazyGroup,
+    load_tabsdata_server,
+    logical_prompt,
+)
 
-CONNECTION_FILE = "connection.json"
+# The command groups, and the SDK they use, are only imported when they are run
+LAZY_SUBCOMMANDS = {
+    "dataset": "tabsdatasdk.cli.dataset_group:dataset",
+    "datastore": "tabsdatasdk.cli.datastore_group:datastore",
+    "execution-plan": "tabsdatasdk.cli.execution_plan_group:execution_plan",
+    "user": "tabsdatasdk.cli.user_group:user",
+}
 
 
-@click.group()
+@click.group(cls=LazyGroup, lazy_subcommands=LAZY_SUBCOMMANDS)
 @click.version_option()
 @click.option(
     "--no-prompt",
@@ -32,25 +37,13 @@ CONNECTION_FILE = "connection.json"
 def cli(ctx: click.Context, no_prompt: bool):
     """Main CLI for the Tabs Data SDK"""
     os.makedirs(DEFAULT_TABSDATA_DIRECTORY, exist_ok=True)
-    ctx.obj = {"tabsdata_directory": DEFAULT_TABSDATA_DIRECTORY, "no_prompt": no_prompt}
-    try:
-        credentials = json.load(
-            open(os.path.join(DEFAULT_TABSDATA_DIRECTORY, CONNECTION_FILE))
-        )
-        connection = APIServer(credentials.get("url"))
-        connection.refresh_token = credentials.get("refresh_token")
-        connection.bearer_token = credentials.get("bearer_token")
-        tabsdata_server = TabsdataServer.__new__(TabsdataServer)
-        tabsdata_server.connection = connection
-    except FileNotFoundError:
-        tabsdata_server = None
-    ctx.obj["tabsdataserver"] = tabsdata_server
-
-
-cli.add_command(dataset)
-cli.add_command(datastore)
-cli.add_command(execution_plan)
-cli.add_command(user)
+    # The client of the server is created by the commands that use it, with
+    # load_tabsdata_server, so that the others do not import it
+    ctx.obj = {
+        "tabsdata_directory": DEFAULT_TABSDATA_DIRECTORY,
+        "no_prompt": no_prompt,
+        "tabsdataserver": None,
+    }
 
 
 @cli.command()
@@ -73,6 +66,8 @@ cli.add_command(user)
 @click.pass_context
 def login(ctx: click.Context, server_url: str, username: str, password: str):
     """Login to the TabsData Server"""
+    from tabsdatasdk.api.api_server import obtain_connection
+
     username = username or logical_prompt(ctx, "Username for the TabsData Server")
     password = password or logical_prompt(
         ctx,
@@ -106,8 +101,7 @@ def logout(ctx: click.Context):
 def status(ctx: click.Context):
     """Check the status of the server"""
     """Dataset management commands"""
-    if not ctx.obj["tabsdataserver"]:
-        raise click.ClickException("No credentials found. Please login first.")
+    load_tabsdata_server(ctx)
     click.echo("Obtaining server status")
     click.echo("-" * 10)
     try:
@@ -2,11 +2,14 @@
 # Copyright 2024 Tabs Data Inc.
 #
 
+import importlib
+import json
 import os
 
 import rich_click as click
 from rich_click import Option, UsageError
 
+CONNECTION_FILE = "connection.json"
 DEFAULT_TABSDATA_DIRECTORY = os.path.join(os.path.expanduser("~"), ".tabsdata")
 
 
@@ -35,6 +38,33 @@ def logical_prompt(
     return click.prompt(message, default=default_value, hide_input=hide_input)
 
 
+def load_tabsdata_server(ctx: click.Context):
+    """
+    Create the client of the server from the credentials stored at login, and store
+        it in the context as 'tabsdataserver'. It is called by the commands that use
+        the server, so that the client, and the modules it imports, are only loaded
+        by them.
+    """
+    credentials_file = os.path.join(ctx.obj["tabsdata_directory"], CONNECTION_FILE)
+    try:
+        with open(credentials_file) as file:
+            credentials = json.load(file)
+    except FileNotFoundError:
+        raise click.ClickException("No credentials found. Please login first.")
+    from tabsdatasdk.api.api_server import APIServer
+    from tabsdatasdk.api.tabsdata_server import TabsdataServer
+
+    # Tokens refreshed while running the command are stored for the next ones
+    connection = APIServer(credentials.get("url"), credentials_file=credentials_file)
+    connection.refresh_token = credentials.get("refresh_token")
+    connection.bearer_token = credentials.get("bearer_token")
+    connection.user_name = credentials.get("user_name")
+    tabsdata_server = TabsdataServer.__new__(TabsdataServer)
+    tabsdata_server.connection = connection
+    ctx.obj["tabsdataserver"] = tabsdata_server
+    return tabsdata_server
+
+
 class MutuallyExclusiveOption(Option):
     def __init__(self, *args, **kwargs):
         self.mutually_exclusive = set(kwargs.pop("mutually_exclusive", []))
@@ -57,3 +87,30 @@ class MutuallyExclusiveOption(Option):
             )
 
         return super(MutuallyExclusiveOption, self).handle_parse_result(ctx, opts, args)
+
+
+class LazyGroup(click.RichGroup):
+    """
+    Group whose subcommands are imported when they are run, so that running a
+        command does not import the modules of the rest of them.
+
+    Args:
+        lazy_subcommands (dict): The name of each subcommand, mapped to its import
+            path, in the form of 'module.path:command_name'.
+    """
+
+    def __init__(self, *args, lazy_subcommands: dict = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context):
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str):
+        if cmd_name not in self.lazy_subcommands:
+            return super().get_command(ctx, cmd_name)
+        if cmd_name not in self.commands:
+            module_name, command_name = self.lazy_subcommands[cmd_name].split(":")
+            command = getattr(importlib.import_module(module_name), command_name)
+            self.add_command(command, cmd_name)
+        return self.commands[cmd_name]
@@ -4,9 +4,11 @@
 
 import datetime
 import os
+import time
 from typing import List
 
 import rich_click as click
+import yaml
 from rich.console import Console
 from rich.table import Table
 
@@ -14,17 +16,35 @@ from tabsdatasdk.cli.cli_utils import (
     DEFAULT_TABSDATA_DIRECTORY,
     MutuallyExclusiveOption,
     beautify_list,
+    load_tabsdata_server,
     logical_prompt,
 )
 from tabsdatasdk.uri import build_uri_object
 
+# Seconds the clock of the client can be ahead of the one of the server, when the
+# time of the server is not known
+CLOCK_SKEW_TOLERANCE = 300
+
+
+def server_default(name: str):
+    """
+    Obtain the default of an option from the constant of tabsdata_server with the
+        given name, which is only imported when the command runs.
+    """
+
+    def default():
+        from tabsdatasdk.api import tabsdata_server
+
+        return getattr(tabsdata_server, name)
+
+    return default
+
 
 @click.group()
 @click.pass_context
 def dataset(ctx: click.Context):
     """Dataset management commands"""
-    if not ctx.obj["tabsdataserver"]:
-        raise click.ClickException("No credentials found. Please login first.")
+    load_tabsdata_server(ctx)
 
 
 @dataset.command()
@@ -55,11 +75,32 @@ def dataset(ctx: click.Context):
 @click.option(
     "--directory-to-bundle",
     "-p",
+    cls=MutuallyExclusiveOption,
     help=(
         "Path to the directory that should be stored in the bundle for "
         "execution in the backed. If not provided, the folder where the "
         "function file is will be used."
     ),
+    mutually_exclusive=["save_target"],
+)
+@click.option(
+    "--save-target",
+    cls=MutuallyExclusiveOption,
+    type=click.Choice(["file", "folder", "imports"]),
+    help=(
+        "What to store in the bundle: the 'file' where the function is defined, the "
+        "whole 'folder' that contains it, or only the files of that folder that are "
+        "'imports'-ed by the function. If not provided, 'folder' will be used."
+    ),
+    mutually_exclusive=["directory_to_bundle"],
+)
+@click.option(
+    "--use-gitignore",
+    is_flag=True,
+    help=(
+        "Skip the files matched by the .gitignore of the bundled directory, in "
+        "addition to the ones matched by its .tdignore."
+    ),
 )
 @click.option(
     "--requirements-file",
@@ -83,6 +124,8 @@ def create(
     description: str,
     function_path: str,
     directory_to_bundle: str,
+    save_target: str,
+    use_gitignore: bool,
     requirements_file: str,
     local_package: List[str],
 ):
@@ -113,12 +156,153 @@ def create(
             directory_to_bundle,
             requirements_file,
             local_package,
+            save_target=save_target,
+            use_gitignore=use_gitignore,
         )
         click.echo("Dataset created successfully")
     except Exception as e:
         raise click.ClickException(f"Failed to create dataset: {e}")
 
 
+@dataset.command()
+@click.option(
+    "--datastore",
+    "-d",
+    help="Name of the datastore where the datasets will be created.",
+)
+@click.option(
+    "--function-path",
+    "-f",
+    multiple=True,
+    help=(
+        "Path to a function, of the form '/path/to/file.py::function_name', or glob "
+        "pattern of Python files, like 'src/**/*.py', in which case a dataset is "
+        "created for every dataset function in them. Can be used multiple times."
+    ),
+)
+@click.option(
+    "--manifest",
+    "-m",
+    help=(
+        "Path to a YAML file with a list of function paths or glob patterns, like "
+        "the ones accepted by --function-path."
+    ),
+)
+@click.option(
+    "--requirements-file",
+    "-r",
+    help=(
+        "Path to the requirements file shared by all the functions. If not "
+        "provided, the requirements file will be generated based on your current "
+        "Python environment."
+    ),
+)
+@click.option(
+    "--local-package",
+    "-l",
+    multiple=True,
+    help="Path to a local package to include in the bundles.",
+)
+@click.option(
+    "--save-target",
+    type=click.Choice(["file", "folder", "imports"]),
+    help=(
+        "What to store in each bundle: the 'file' where the function is defined, the "
+        "whole 'folder' that contains it, or only the files of that folder that are "
+        "'imports'-ed by the function. If not provided, 'folder' will be used."
+    ),
+)
+@click.option(
+    "--use-gitignore",
+    is_flag=True,
+    help=(
+        "Skip the files matched by the .gitignore of the bundled directories, in "
+        "addition to the ones matched by their .tdignore."
+    ),
+)
+@click.option(
+    "--workers",
+    type=int,
+    help=(
+        "Number of processes used to build the bundles. If not provided, one per "
+        "available core will be used."
+    ),
+)
+@click.option(
+    "--max-uploads",
+    type=int,
+    default=server_default("DEFAULT_MAX_UPLOADS"),
+    help=(
+        "Maximum number of bundles uploaded at the same time. If not provided, "
+        "the default of TabsdataServer.dataset_create_many will be used."
+    ),
+)
+@click.pass_context
+def create_many(
+    ctx: click.Context,
+    datastore: str,
+    function_path: List[str],
+    manifest: str,
+    requirements_file: str,
+    local_package: List[str],
+    save_target: str,
+    use_gitignore: bool,
+    workers: int,
+    max_uploads: int,
+):
+    """Create many datasets at once"""
+    function_paths = [*function_path]
+    if manifest:
+        try:
+            with open(manifest) as file:
+                function_paths.extend(yaml.safe_load(file) or [])
+        except (OSError, yaml.YAMLError) as e:
+            raise click.ClickException(f"Failed to read manifest: {e}")
+    if not function_paths:
+        raise click.ClickException(
+            "No functions provided. Please use --function-path or --manifest."
+        )
+    datastore = datastore or logical_prompt(
+        ctx, "Name of the datastore where the datasets will be created"
+    )
+    click.echo(f"Creating datasets in datastore '{datastore}'")
+    click.echo("-" * 10)
+    try:
+        registrations = ctx.obj["tabsdataserver"].dataset_create_many(
+            datastore,
+            function_paths,
+            requirements=requirements_file,
+            local_packages=[*local_package],
+            save_target=save_target,
+            use_gitignore=use_gitignore,
+            max_workers=workers,
+            max_uploads=max_uploads,
+        )
+    except Exception as e:
+        raise click.ClickException(f"Failed to create datasets: {e}")
+
+    table = Table(title=f"Datasets created in datastore '{datastore}'")
+    table.add_column("Function", style="cyan", no_wrap=True)
+    table.add_column("Dataset")
+    table.add_column("Result")
+    for registration in registrations:
+        table.add_row(
+            registration.function_path,
+            registration.dataset_name or "",
+            "OK" if registration.succeeded else f"Failed: {registration.error}",
+        )
+    click.echo()
+    console = Console()
+    console.print(table)
+    click.echo()
+    failed = sum(not registration.succeeded for registration in registrations)
+    if failed:
+        raise click.ClickException(
+            f"Failed to create {failed} of {len(registrations)} datasets"
+        )
+    click.echo(f"{len(registrations)} datasets created successfully")
+
+
 @dataset.command()
 @click.option(
     "--name",
@@ -382,9 +566,54 @@ def list(ctx: click.Context, datastore: str, uri: str):
     ),
     mutually_exclusive=["name", "datastore"],
 )
+@click.option(
+    "--from-file",
+    cls=MutuallyExclusiveOption,
+    type=click.File(),
+    help=(
+        "File with the URIs of the datasets to be triggered, one per line. Blank "
+        "lines and lines starting with '#' are skipped."
+    ),
+    mutually_exclusive=["name", "datastore", "uri", "wait"],
+)
+@click.option(
+    "--max-in-flight",
+    type=click.IntRange(min=1),
+    default=server_default("DEFAULT_MAX_IN_FLIGHT"),
+    help=(
+        "Maximum number of trigger requests sent at once when using --from-file. "
+        "If not provided, the default of TabsdataServer.dataset_trigger_many will "
+        "be used."
+    ),
+)
+@click.option(
+    "--wait",
+    is_flag=True,
+    help=(
+        "Wait until the execution plans of the trigger finish, showing their "
+        "status changes. Fails if any of them does not finish successfully."
+    ),
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0),
+    help="Maximum seconds to wait when using --wait. By default, waits forever.",
+)
 @click.pass_context
-def trigger(ctx: click.Context, name: str, datastore: str, uri: str):
-    """Trigger a dataset"""
+def trigger(
+    ctx: click.Context,
+    name: str,
+    datastore: str,
+    uri: str,
+    from_file,
+    max_in_flight: int,
+    wait: bool,
+    timeout: float,
+):
+    """Trigger a dataset, or all the datasets listed in a file"""
+    if from_file:
+        trigger_from_file(ctx, from_file, max_in_flight)
+        return
     if not uri:
         name = name or logical_prompt(ctx, "Name of the dataset to be triggered")
         datastore = datastore or logical_prompt(
@@ -403,6 +632,7 @@ def trigger(ctx: click.Context, name: str, datastore: str, uri: str):
             )
     click.echo(f"Triggering dataset '{name}' in datastore '{datastore}'")
     click.echo("-" * 10)
+    requested_on = time.time()
     try:
         response = ctx.obj["tabsdataserver"].dataset_trigger(datastore, name)
         click.echo("Dataset triggered successfully")
@@ -422,6 +652,102 @@ def trigger(ctx: click.Context, name: str, datastore: str, uri: str):
             click.echo("No DOT returned")
     except Exception as e:
         raise click.ClickException(f"Failed to trigger dataset: {e}")
+    if wait:
+        # Execution plans triggered before the request are not waited for. The
+        # timestamps are set by the server, so the time is taken from its clock.
+        from tabsdatasdk.api.tabsdata_server import response_timestamp
+
+        triggered_since = response_timestamp(response)
+        if triggered_since is None:
+            triggered_since = int((requested_on - CLOCK_SKEW_TOLERANCE) * 1000)
+        wait_for_execution_plans(ctx, datastore, name, triggered_since, timeout)
+
+
+def trigger_from_file(ctx: click.Context, from_file, max_in_flight: int):
+    uris = [
+        line.strip()
+        for line in from_file
+        if line.strip() and not line.strip().startswith("#")
+    ]
+    click.echo(f"Triggering {len(uris)} datasets")
+    click.echo("-" * 10)
+    try:
+        triggers = ctx.obj["tabsdataserver"].dataset_trigger_many(
+            uris, max_in_flight=max_in_flight
+        )
+    except Exception as e:
+        raise click.ClickException(f"Failed to trigger datasets: {e}")
+
+    table = Table(title="Datasets triggered")
+    table.add_column("URI", style="cyan", no_wrap=True)
+    table.add_column("Result")
+    table.add_column("Latency (ms)", justify="right")
+    for dataset_trigger in triggers:
+        table.add_row(
+            dataset_trigger.uri,
+            "OK" if dataset_trigger.succeeded else f"Failed: {dataset_trigger.error}",
+            (
+                f"{dataset_trigger.latency * 1000:.0f}"
+                if dataset_trigger.latency is not None
+                else ""
+            ),
+        )
+    click.echo()
+    console = Console()
+    console.print(table)
+    click.echo()
+    from tabsdatasdk.api.tabsdata_server import trigger_statistics
+
+    summary = trigger_statistics(triggers)
+    if "mean" in summary:
+        click.echo(
+            "Latency (ms): "
+            + ", ".join(
+                f"{name} {summary[name] * 1000:.0f}"
+                for name in ("min", "mean", "p50", "p95", "max")
+            )
+        )
+    if summary["failed"]:
+        raise click.ClickException(
+            f"Failed to trigger {summary['failed']} of {summary['total']} datasets"
+        )
+    click.echo(f"{summary['total']} datasets triggered successfully")
+
+
+def wait_for_execution_plans(
+    ctx: click.Context,
+    datastore: str,
+    name: str,
+    triggered_since: int,
+    timeout: float | None,
+):
+    click.echo("Waiting for the execution plans to finish")
+    tabsdata_server = ctx.obj["tabsdataserver"]
+    latest_plans = {}
+    try:
+        for plan in tabsdata_server.watch_execution_plans(
+            datastore,
+            name,
+            since=triggered_since,
+            until_finished=True,
+            timeout=timeout,
+            # Triggers of the same dataset by other users are not waited for
+            triggered_by=tabsdata_server.connection.user_name,
+        ):
+            click.echo(f"{plan.triggered_on_str} {plan.status}")
+            latest_plans[(plan.id, plan.triggered_on)] = plan
+    except Exception as e:
+        raise click.ClickException(f"Failed to wait for the execution plans: {e}")
+    if not latest_plans or not all(plan.finished for plan in latest_plans.values()):
+        raise click.ClickException(
+            "Timed out waiting for the execution plans to finish."
+        )
+    failed = [plan for plan in latest_plans.values() if plan.raw_status != "D"]
+    if failed:
+        raise click.ClickException(
+            f"{len(failed)} execution plan(s) did not finish successfully."
+        )
+    click.echo("Execution plans finished successfully")
 
 
 @dataset.command()
@@ -459,11 +785,32 @@ def trigger(ctx: click.Context, name: str, datastore: str, uri: str):
 @click.option(
     "--directory-to-bundle",
     "-p",
+    cls=MutuallyExclusiveOption,
     help=(
         "Path to the directory that should be stored in the bundle for "
         "execution in the backed. If not provided, the folder where the "
         "function file is will be used."
     ),
+    mutually_exclusive=["save_target"],
+)
+@click.option(
+    "--save-target",
+    cls=MutuallyExclusiveOption,
+    type=click.Choice(["file", "folder", "imports"]),
+    help=(
+        "What to store in the bundle: the 'file' where the function is defined, the "
+        "whole 'folder' that contains it, or only the files of that folder that are "
+        "'imports'-ed by the function. If not provided, 'folder' will be used."
+    ),
+    mutually_exclusive=["directory_to_bundle"],
+)
+@click.option(
+    "--use-gitignore",
+    is_flag=True,
+    help=(
+        "Skip the files matched by the .gitignore of the bundled directory, in "
+        "addition to the ones matched by its .tdignore."
+    ),
 )
 @click.option(
     "--requirements-file",
@@ -488,6 +835,8 @@ def update(
     description: str,
     function_path: str,
     directory_to_bundle: str,
+    save_target: str,
+    use_gitignore: bool,
     requirements_file: str,
     local_package: List[str],
 ):
@@ -521,6 +870,8 @@ def update(
             directory_to_bundle=directory_to_bundle,
             requirements=requirements_file,
             local_packages=local_package,
+            save_target=save_target,
+            use_gitignore=use_gitignore,
         )
         click.echo("Datastore updated successfully")
     except Exception as e:
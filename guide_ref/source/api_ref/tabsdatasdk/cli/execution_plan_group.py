@@ -7,21 +7,73 @@ import rich_click as click
 from rich.console import Console
 from rich.table import Table
 
+from tabsdatasdk.api.query import ExecutionPlanQuery
+from tabsdatasdk.cli.cli_utils import load_tabsdata_server
+
 
 @click.group()
 @click.pass_context
 def execution_plan(ctx: click.Context):
     """User management commands"""
-    if not ctx.obj["tabsdataserver"]:
-        raise click.ClickException("No credentials found. Please login first.")
+    load_tabsdata_server(ctx)
 
 
 @execution_plan.command()
+@click.option(
+    "--status",
+    "-s",
+    help="Only list the execution plans with this status, like 'R' or 'Running'.",
+)
+@click.option(
+    "--datastore", "-d", help="Only list the execution plans of this datastore."
+)
+@click.option("--dataset", help="Only list the execution plans of this dataset.")
+@click.option(
+    "--order-by",
+    type=click.Choice(ExecutionPlanQuery.FIELDS),
+    help="Field used to order the execution plans.",
+)
+@click.option(
+    "--descending",
+    is_flag=True,
+    help=(
+        "Order the execution plans descendingly. Without --order-by, the newest "
+        "execution plans are listed first."
+    ),
+)
+@click.option(
+    "--limit",
+    "-n",
+    type=click.IntRange(min=0),
+    help="Maximum number of execution plans to list.",
+)
 @click.pass_context
-def list(ctx: click.Context):
+def list(
+    ctx: click.Context,
+    status: str,
+    datastore: str,
+    dataset: str,
+    order_by: str,
+    descending: bool,
+    limit: int,
+):
     """List all execution plans"""
     try:
-        list_of_plans = ctx.obj["tabsdataserver"].execution_plans
+        # The filters, ordering and limit are applied by the server
+        query = ExecutionPlanQuery()
+        if status:
+            query.status(status)
+        if datastore:
+            query.datastore(datastore)
+        if dataset:
+            query.dataset(dataset)
+        if order_by:
+            query.order_by(order_by, descending=descending)
+        elif descending:
+            query.newest_first()
+        if limit is not None:
+            query.limit(limit)
+        list_of_plans = [*ctx.obj["tabsdataserver"].iter_execution_plans(query)]
 
         table = Table(title="Execution plans")
         table.add_column("Datastore", style="cyan", no_wrap=True)
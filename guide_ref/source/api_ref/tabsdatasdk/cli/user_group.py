@@ -7,15 +7,14 @@ import rich_click as click
 from rich.console import Console
 from rich.table import Table
 
-from tabsdatasdk.cli.cli_utils import logical_prompt
+from tabsdatasdk.cli.cli_utils import load_tabsdata_server, logical_prompt
 
 
 @click.group()
 @click.pass_context
 def user(ctx: click.Context):
     """User management commands"""
-    if not ctx.obj["tabsdataserver"]:
-        raise click.ClickException("No credentials found. Please login first.")
+    load_tabsdata_server(ctx)
 
 
 @user.command()
@@ -3,12 +3,13 @@
 #
 
 import datetime
+import glob
 import inspect
 import logging
 import os
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Callable, List
+from typing import TYPE_CHECKING, Callable, List
 from urllib.parse import urlparse, urlunparse
 
 from tabsdatasdk.credentials import (
@@ -33,8 +34,14 @@ from tabsdatasdk.format import (
     get_implicit_format_from_list,
 )
 from tabsdatasdk.plugin import InputPlugin, OutputPlugin
+from tabsdatasdk.tabsdataframe.constants import SystemColumns
 from tabsdatasdk.uri import URI, URI_INDICATOR, build_uri_object
 
+if TYPE_CHECKING:
+    import polars as pl
+
+    from tabsdatasdk.tabsdataframe.frame import TabsDataLazyFrame
+
 logger = logging.getLogger(__name__)
 
 TABLES_KEY = "tables"
@@ -346,6 +353,7 @@ class LocalFileInput(Input):
 
     Methods:
         to_dict(): Converts the LocalFileInput object to a dictionary.
+        scan(): Loads the files lazily as TabsDataLazyFrames.
     """
 
     IDENTIFIER = InputIdentifiers.LOCALFILE.value
@@ -456,6 +464,111 @@ class LocalFileInput(Input):
             }
         }
 
+    def scan(self) -> List["TabsDataLazyFrame"]:
+        """
+        Loads the files lazily as TabsDataLazyFrames, one for each path, in the same
+            order as the paths. The files are read with polars scans, so only the
+            columns and rows used are read from them, and a path can be a glob
+            pattern, whose files are read as a single frame. The index of each row
+            is added as the id column that TabsDataLazyFrames require, and is
+            unique across all the paths.
+
+        Returns:
+            List[TabsDataLazyFrame]: The frames of the paths.
+
+        Raises:
+            InputConfigurationError
+        """
+        # Imported here, so that defining the input of a function does not import
+        # polars
+        from tabsdatasdk.tabsdataframe.frame import TabsDataLazyFrame
+
+        return [
+            TabsDataLazyFrame(frame)
+            for frame in self.scan_polars(row_index_name=SystemColumns.TD_ID.value)
+        ]
+
+    def scan_polars(self, row_index_name: str | None = None) -> List["pl.LazyFrame"]:
+        """
+        Loads the files lazily as polars LazyFrames, one for each path, in the same
+            order as the paths. See scan.
+
+        Args:
+            row_index_name (str | None, optional): If provided, the name of a column
+                added with the index of each row, counted across all the paths.
+                Every path but the last one is then scanned once more to count its
+                rows.
+
+        Returns:
+            List[pl.LazyFrame]: The frames of the paths.
+
+        Raises:
+            InputConfigurationError
+        """
+        import polars as pl
+
+        format = self.format
+        if isinstance(format, CSVFormat):
+            scan, options = pl.scan_csv, format.scan_options()
+        elif isinstance(format, NDJSONFormat):
+            scan, options = pl.scan_ndjson, {}
+        elif isinstance(format, ParquetFormat):
+            scan, options = pl.scan_parquet, {}
+        else:
+            raise InputConfigurationError(
+                ErrorCode.ICE31,
+                type(format),
+                [CSVFormat, NDJSONFormat, ParquetFormat],
+            )
+        frames = []
+        row_index_offset = 0
+        for source in self._scan_sources():
+            frame = scan(
+                source,
+                row_index_name=row_index_name,
+                row_index_offset=row_index_offset,
+                **options,
+            )
+            frames.append(frame)
+            if row_index_name and len(frames) < len(self._path_list):
+                # The index continues from the rows of the previous paths, so that
+                # it is unique across all the frames
+                row_index_offset += frame.select(pl.len()).collect().item()
+        return frames
+
+    def _scan_sources(self) -> List[str | List[str]]:
+        """
+        Obtains what to scan for each path: the path itself, without its scheme, or,
+            if only the files modified after initial_last_modified must be read, the
+            list of files that match it and were.
+        """
+        initial_last_modified = self._initial_last_modified
+        if initial_last_modified and initial_last_modified.tzinfo is None:
+            initial_last_modified = initial_last_modified.replace(
+                tzinfo=datetime.timezone.utc
+            )
+        sources = []
+        for path in self._path_list:
+            if URI_INDICATOR in path:
+                path = urlparse(path).path
+            if initial_last_modified is None:
+                sources.append(path)
+                continue
+            files = [
+                file
+                for file in sorted(glob.glob(path))
+                if datetime.datetime.fromtimestamp(
+                    os.path.getmtime(file), datetime.timezone.utc
+                )
+                > initial_last_modified
+            ]
+            if not files:
+                raise InputConfigurationError(
+                    ErrorCode.ICE32, path, self.initial_last_modified
+                )
+            sources.append(files)
+        return sources
+
     @property
     def format(self) -> FileFormat:
         """
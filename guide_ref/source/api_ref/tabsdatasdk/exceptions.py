@@ -70,6 +70,12 @@ class ErrorCode(Enum):
             " instead."
         ),
     }
+    FCE7 = {
+        "code": "FCE-007",
+        "message": (
+            "The dependencies of a dataset can not form a cycle, got the cycle '{}'."
+        ),
+    }
     FOCE1 = {
         "code": "FOCE-001",
         "message": (
@@ -315,6 +321,67 @@ class ErrorCode(Enum):
             "'AzureCredentials' object, got '{}' instead"
         ),
     }
+    ICE31 = {
+        "code": "ICE-031",
+        "message": (
+            "The files of a LocalFileInput with the format '{}' can not be scanned. "
+            "The formats that can be scanned are {}."
+        ),
+    }
+    ICE32 = {
+        "code": "ICE-032",
+        "message": (
+            "No file matching the path '{}' of a LocalFileInput was modified after "
+            "'{}'."
+        ),
+    }
+    LRE1 = {
+        "code": "LRE-001",
+        "message": (
+            "The input of the dataset '{}' is of type '{}', which can not be loaded "
+            "when running locally. The supported inputs are LocalFileInput, "
+            "TableInput and InputPlugin."
+        ),
+    }
+    LRE2 = {
+        "code": "LRE-002",
+        "message": (
+            "The table '{}' does not have the version '{}' in the local table store,"
+            " it has {} version(s)."
+        ),
+    }
+    LRE4 = {
+        "code": "LRE-004",
+        "message": (
+            "The function of the dataset '{}' returned {} result(s), but its output "
+            "has {} table(s)."
+        ),
+    }
+    LRE5 = {
+        "code": "LRE-005",
+        "message": (
+            "The function of the dataset '{}' returned an object of type '{}' for "
+            "the table '{}', expected a polars DataFrame or LazyFrame."
+        ),
+    }
+    LRE6 = {
+        "code": "LRE-006",
+        "message": (
+            "The dataset '{}' was not run because the dataset '{}', which it depends"
+            " on, failed."
+        ),
+    }
+    LRE7 = {
+        "code": "LRE-007",
+        "message": "The dataset '{}' is not among the functions to run.",
+    }
+    LRE8 = {
+        "code": "LRE-008",
+        "message": (
+            "The function of the dataset '{}' failed with an error that can not be "
+            "sent from the process that ran it: {}"
+        ),
+    }
     OCE1 = {
         "code": "OCE-001",
         "message": (
@@ -474,6 +541,35 @@ class ErrorCode(Enum):
             "provided file '{}' contains this key, but it has a content of type '{}'."
         ),
     }
+    RE11 = {
+        "code": "RE-011",
+        "message": (
+            "The '{}' compression for the bundle requires the '{}' package, which is "
+            "not installed. Please install it or use a different compression."
+        ),
+    }
+    RE12 = {
+        "code": "RE-012",
+        "message": (
+            "The 'compression' parameter of the register function has value '{}', "
+            "which is not one of the allowed values: {}."
+        ),
+    }
+    RE13 = {
+        "code": "RE-013",
+        "message": (
+            "The 'requirements_scope' parameter of the register function has value "
+            "'{}', which is not one of the allowed values: {}."
+        ),
+    }
+    RE14 = {
+        "code": "RE-014",
+        "message": (
+            "The 'compression_level' parameter of the register function has value "
+            "'{}', which is not a valid level for the '{}' compression. It must be "
+            "an integer from {} to {}."
+        ),
+    }
     SDKE1 = {
         "code": "SDKE-001",
         "message": (
@@ -523,6 +619,21 @@ class ErrorCode(Enum):
             "packages, you must provide the function_path."
         ),
     }
+    TSE2 = {
+        "code": "TSE-002",
+        "message": (
+            "The asynchronous client requires the '{}' package, which is not "
+            "installed. Please install it to use it."
+        ),
+    }
+    TSE3 = {
+        "code": "TSE-003",
+        "message": "Unknown field '{}' for a {}. Supported fields are: {}.",
+    }
+    TSE4 = {
+        "code": "TSE-004",
+        "message": "Unknown operator '{}'. Supported operators are: {}.",
+    }
     UCE1 = {
         "code": "UCE-001",
         "message": (
@@ -636,6 +747,13 @@ class ErrorCode(Enum):
             "parameter."
         ),
     }
+    UCE17 = {
+        "code": "UCE-017",
+        "message": (
+            "'{}' objects are immutable, the '{}' attribute cannot be modified "
+            "after the object is created. Create a new object instead."
+        ),
+    }
 
 
 class TabsDataException(Exception):
@@ -645,6 +763,7 @@ class TabsDataException(Exception):
 
     def __init__(self, error_code: ErrorCode, *args):
         self.error_code = error_code
+        self.format_args = args
         self.code = self.error_code.value.get("code")
         self.message = self.error_code.value.get("message").format(*args)
         if not self.code.startswith(self.CODE_PREFIX):
@@ -657,6 +776,11 @@ class TabsDataException(Exception):
             )
         super().__init__(self.message if self.message else "Unknown error")
 
+    def __reduce__(self):
+        # Exceptions are pickled with the arguments of Exception, which are not the
+        # ones of this constructor, for example to send them between processes
+        return self.__class__, (self.error_code, *self.format_args)
+
 
 class CredentialsConfigurationError(TabsDataException):
     """
@@ -690,6 +814,14 @@ class InputConfigurationError(TabsDataException):
     CODE_PREFIX = "ICE"
 
 
+class LocalRunError(TabsDataException):
+    """
+    Exception raised when running dataset functions locally fails.
+    """
+
+    CODE_PREFIX = "LRE"
+
+
 class OutputConfigurationError(TabsDataException):
     """
     Exception raised when the creation or modification of an Input object fails.
@@ -228,6 +228,35 @@ class CSVFormat(FileFormat):
             },
         }
 
+    def scan_options(self) -> dict:
+        """
+        Returns the options of polars scan_csv to read the files of this format.
+
+        Returns:
+            dict: The keyword arguments of polars scan_csv.
+        """
+        options = {
+            "separator": _to_character(self.separator),
+            "quote_char": _to_character(self.quote_char),
+            "eol_char": _to_character(self.eol_char),
+            "encoding": self.encoding.lower(),
+            "null_values": self.null_values,
+            "truncate_ragged_lines": self.truncate_ragged_lines,
+            "comment_prefix": _to_character(self.comment_prefix),
+            "try_parse_dates": self.try_parse_dates,
+            "decimal_comma": self.decimal_comma,
+            "has_header": self.has_header,
+            "skip_rows": self.skip_rows,
+            "skip_rows_after_header": self.skip_rows_after_header,
+            "raise_if_empty": self.raise_if_empty,
+            "ignore_errors": self.ignore_errors,
+        }
+        if not self.missing_is_null:
+            # Only sent when it is not the default, as the option was removed in
+            # later versions of polars
+            options["missing_utf8_is_empty_string"] = True
+        return options
+
 
 class NDJSONFormat(FileFormat):
     """The class of the log file format."""
@@ -274,6 +303,11 @@ class ParquetFormat(FileFormat):
         return {self.IDENTIFIER: {}}
 
 
+def _to_character(value: str | int | None) -> str | None:
+    # Characters can be given by their code
+    return chr(value) if isinstance(value, int) else value
+
+
 def _verify_type_or_raise_exception(value, tuple_of_types, variable_name, class_name):
     if None in tuple_of_types and value is None:
         return None
@@ -0,0 +1,409 @@
+#
+# Copyright 2024 Tabs Data Inc.
+#
+
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, List, Set
+
+from tabsdatasdk.datasetfunction import DatasetFunction, TableInput
+from tabsdatasdk.exceptions import ErrorCode, FunctionConfigurationError
+from tabsdatasdk.uri import URI, build_uri_object
+
+if TYPE_CHECKING:
+    from tabsdatasdk.api.tabsdata_server import Dataset
+
+
+class DirectedAcyclicGraph:
+    """
+    Directed graph that rejects the edges that would create a cycle, and keeps a
+        topological order of its nodes up to date as edges are added, instead of
+        sorting the whole graph again. The order is maintained with the algorithm
+        of Pearce and Kelly: adding an edge only reorders the nodes between its
+        ends in the current order, and adding nodes or removing edges never
+        reorders any.
+
+    Nodes can be any hashable object.
+    """
+
+    def __init__(self):
+        self._successors: Dict[Hashable, Set[Hashable]] = {}
+        self._predecessors: Dict[Hashable, Set[Hashable]] = {}
+        self._order: Dict[Hashable, int] = {}
+        self._next_position = 0
+        self._sorted: List[Hashable] | None = None
+
+    def add_node(self, node: Hashable):
+        """
+        Add a node to the graph, if it is not in it already. New nodes are placed
+            at the end of the topological order.
+        """
+        if node not in self._order:
+            self._successors[node] = set()
+            self._predecessors[node] = set()
+            self._order[node] = self._next_position
+            self._next_position += 1
+            self._sorted = None
+
+    def remove_node(self, node: Hashable):
+        """
+        Remove a node, and its edges, from the graph.
+        """
+        for successor in self._successors.pop(node):
+            self._predecessors[successor].discard(node)
+        for predecessor in self._predecessors.pop(node):
+            self._successors[predecessor].discard(node)
+        del self._order[node]
+        self._sorted = None
+
+    def add_edge(self, source: Hashable, target: Hashable):
+        """
+        Add an edge from source to target, adding the nodes if they are not in the
+            graph.
+
+        Raises:
+            FunctionConfigurationError: If the edge would create a cycle. The graph
+                is not modified.
+        """
+        self.add_node(source)
+        self.add_node(target)
+        if target in self._successors[source]:
+            return
+        if source == target:
+            raise FunctionConfigurationError(
+                ErrorCode.FCE7, _cycle_string([source, target])
+            )
+        lower_bound = self._order[target]
+        upper_bound = self._order[source]
+        if lower_bound < upper_bound:
+            forward = self._affected_forward(source, target, upper_bound)
+            backward = self._affected_backward(source, lower_bound)
+            self._reorder(backward, forward)
+        self._successors[source].add(target)
+        self._predecessors[target].add(source)
+
+    def remove_edge(self, source: Hashable, target: Hashable):
+        """
+        Remove the edge from source to target, if it is in the graph.
+        """
+        if source in self._successors:
+            self._successors[source].discard(target)
+        if target in self._predecessors:
+            self._predecessors[target].discard(source)
+
+    def successors(self, node: Hashable) -> Set[Hashable]:
+        return set(self._successors[node])
+
+    def predecessors(self, node: Hashable) -> Set[Hashable]:
+        return set(self._predecessors[node])
+
+    def topological_order(self) -> List[Hashable]:
+        """
+        Obtain the nodes of the graph in topological order: every node comes after
+            the nodes with an edge to it.
+        """
+        if self._sorted is None:
+            self._sorted = sorted(self._order, key=self._order.__getitem__)
+        return list(self._sorted)
+
+    def descendants(self, node: Hashable) -> List[Hashable]:
+        """
+        Obtain the nodes reachable from a node, in topological order, without the
+            node itself.
+        """
+        return self.sort(self._reachable(node, self._successors))
+
+    def ancestors(self, node: Hashable) -> List[Hashable]:
+        """
+        Obtain the nodes from which a node can be reached, in topological order,
+            without the node itself.
+        """
+        return self.sort(self._reachable(node, self._predecessors))
+
+    def _reachable(self, node: Hashable, edges: Dict[Hashable, Set[Hashable]]) -> Set:
+        reached = set()
+        pending = deque([node])
+        while pending:
+            for neighbour in edges[pending.popleft()]:
+                if neighbour not in reached:
+                    reached.add(neighbour)
+                    pending.append(neighbour)
+        reached.discard(node)
+        return reached
+
+    def sort(self, nodes: Iterable[Hashable]) -> List[Hashable]:
+        """
+        Sort some nodes of the graph in topological order.
+        """
+        return sorted(nodes, key=self._order.__getitem__)
+
+    def _affected_forward(
+        self, source: Hashable, target: Hashable, upper_bound: int
+    ) -> List[Hashable]:
+        # Nodes reachable from target that are placed before source. Reaching source
+        # itself means that the new edge closes a cycle
+        parents = {target: None}
+        pending = [target]
+        while pending:
+            node = pending.pop()
+            for successor in self._successors[node]:
+                if self._order[successor] == upper_bound:
+                    cycle = [source, node]
+                    while parents[cycle[-1]] is not None:
+                        cycle.append(parents[cycle[-1]])
+                    raise FunctionConfigurationError(
+                        ErrorCode.FCE7, _cycle_string([source, *reversed(cycle)])
+                    )
+                if successor not in parents and self._order[successor] < upper_bound:
+                    parents[successor] = node
+                    pending.append(successor)
+        return [*parents]
+
+    def _affected_backward(self, source: Hashable, lower_bound: int) -> List[Hashable]:
+        # Nodes from which source is reached that are placed after target
+        visited = {source}
+        pending = [source]
+        while pending:
+            for predecessor in self._predecessors[pending.pop()]:
+                if predecessor in visited:
+                    continue
+                if self._order[predecessor] > lower_bound:
+                    visited.add(predecessor)
+                    pending.append(predecessor)
+        return [*visited]
+
+    def _reorder(self, backward: List[Hashable], forward: List[Hashable]):
+        # The positions of the affected nodes are reused, placing the ones that reach
+        # source before the ones reachable from target
+        nodes = self.sort(backward) + self.sort(forward)
+        positions = sorted(self._order[node] for node in nodes)
+        for node, position in zip(nodes, positions):
+            self._order[node] = position
+        self._sorted = None
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self._order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __repr__(self) -> str:
+        edges = sum(len(successors) for successors in self._successors.values())
+        return f"{self.__class__.__name__}(nodes={len(self)},edges={edges})"
+
+
+class DependencyGraph:
+    """
+    The trigger and data dependency graphs of a set of datasets. The nodes of both
+        graphs are the URIs of the datasets, of the form td:///datastore/dataset. In
+        the trigger graph there is an edge from a dataset to each dataset it
+        triggers, and in the data graph an edge from a dataset to each dataset that
+        uses one of its tables as input.
+
+    The datasets can be added from the DatasetFunction objects of the functions
+        defined locally, or from the datasets registered in the server, and are
+        replaced when they are added again. The triggers and dependencies of a
+        dataset that do not have a datastore, like td://dataset, are considered to
+        be in the datastore of that dataset. Other URIs without a datastore are
+        considered to be in the datastore of the graph, if it has one.
+
+    Args:
+        datastore (str | None): The datastore of the URIs without one.
+
+    Attributes:
+        trigger (DirectedAcyclicGraph): The trigger dependency graph.
+        data (DirectedAcyclicGraph): The data dependency graph.
+    """
+
+    def __init__(self, datastore: str | None = None):
+        self.datastore = datastore
+        self.trigger = DirectedAcyclicGraph()
+        self.data = DirectedAcyclicGraph()
+
+    @classmethod
+    def from_functions(
+        cls, functions: Iterable[DatasetFunction], datastore: str | None = None
+    ) -> "DependencyGraph":
+        """
+        Build the graphs of the datasets of some functions defined locally.
+        """
+        graph = cls(datastore)
+        for function in functions:
+            graph.add_function(function)
+        return graph
+
+    @classmethod
+    def from_datasets(cls, datasets: Iterable["Dataset"]) -> "DependencyGraph":
+        """
+        Build the graphs of some datasets registered in the server, like the ones
+            obtained with TabsdataServer.dataset_get. Datasets without their current
+            function are added without dependencies.
+        """
+        graph = cls()
+        for dataset in datasets:
+            graph.add_dataset(dataset)
+        return graph
+
+    @property
+    def datasets(self) -> List[URI]:
+        """
+        List[URI]: The datasets of the graph, in an order where every dataset comes
+            after the datasets it uses data from.
+        """
+        return self.data.topological_order()
+
+    def add_function(self, function: DatasetFunction):
+        """
+        Add the dataset of a function defined locally, or replace it if it is
+            already in the graph.
+        """
+        dependencies = []
+        if isinstance(function.input, TableInput):
+            dependencies = function.input.uri
+            if isinstance(dependencies, URI):
+                dependencies = [dependencies]
+        self.set_dependencies(
+            URI(self.datastore, function.dataset_name),
+            function.trigger_by,
+            dependencies,
+        )
+
+    def add_dataset(self, dataset: "Dataset"):
+        """
+        Add a dataset registered in the server, or replace it if it is already in
+            the graph.
+        """
+        trigger = None
+        dependencies = []
+        if dataset.function is not None:
+            trigger = dataset.function.trigger_with_names
+            dependencies = dataset.function.dependencies_with_names or []
+        self.set_dependencies(
+            URI(dataset.datastore, dataset.name), trigger, dependencies
+        )
+
+    def set_dependencies(
+        self,
+        dataset: str | URI,
+        trigger: str | URI | None,
+        dependencies: Iterable[str | URI],
+    ):
+        """
+        Set the trigger and the data dependencies of a dataset, adding it to the
+            graph if it is not in it.
+
+        Args:
+            dataset (str | URI): The URI of the dataset.
+            trigger (str | URI | None): The URI of the dataset that triggers it.
+            dependencies (Iterable[str | URI]): The URIs of the tables, or datasets,
+                it uses as input.
+
+        Raises:
+            FunctionConfigurationError: If the dependencies would create a cycle in
+                one of the graphs. The graph is not modified.
+        """
+        dataset = self.dataset_uri(dataset)
+        # Relative URIs are resolved against the datastore of the dataset
+        triggers = [self.dataset_uri(trigger, dataset.datastore)] if trigger else []
+        sources = {
+            self.dataset_uri(dependency, dataset.datastore)
+            for dependency in dependencies
+        }
+        # Both graphs have the same nodes, even if a dataset has no edges in one
+        new_nodes = [
+            node for node in {dataset, *triggers, *sources} if node not in self.data
+        ]
+        for node in new_nodes:
+            self.trigger.add_node(node)
+            self.data.add_node(node)
+        previous_triggers = None
+        try:
+            previous_triggers = _replace_predecessors(self.trigger, dataset, triggers)
+            _replace_predecessors(self.data, dataset, sources)
+        except FunctionConfigurationError:
+            if previous_triggers is not None:
+                _replace_predecessors(self.trigger, dataset, previous_triggers)
+            for node in new_nodes:
+                self.trigger.remove_node(node)
+                self.data.remove_node(node)
+            raise
+
+    def remove_dataset(self, dataset: str | URI):
+        """
+        Remove a dataset, and its dependencies, from the graph.
+        """
+        dataset = self.dataset_uri(dataset)
+        self.trigger.remove_node(dataset)
+        self.data.remove_node(dataset)
+
+    def dataset_uri(self, uri: str | URI, datastore: str | None = None) -> URI:
+        """
+        Obtain the URI of the dataset of a URI, without its table or version. If
+            the URI does not have a datastore, the one provided is used, or the one
+            of the graph if none is.
+        """
+        uri = build_uri_object(uri)
+        return URI(uri.datastore or datastore or self.datastore, uri.dataset or None)
+
+    def triggered_by(self, dataset: str | URI) -> List[URI]:
+        """
+        Obtain the datasets triggered directly when a dataset changes.
+        """
+        return self.trigger.sort(self.trigger.successors(self.dataset_uri(dataset)))
+
+    def affected_by(self, dataset: str | URI) -> List[URI]:
+        """
+        Obtain the datasets that are run again when a dataset changes, as they are
+            triggered by it or by a dataset triggered by it, in the order they can
+            be run.
+        """
+        return self.trigger.descendants(self.dataset_uri(dataset))
+
+    def upstream(self, dataset: str | URI) -> List[URI]:
+        """
+        Obtain the datasets whose data a dataset uses, directly or not, in the order
+            they can be run.
+        """
+        return self.data.ancestors(self.dataset_uri(dataset))
+
+    def downstream(self, dataset: str | URI) -> List[URI]:
+        """
+        Obtain the datasets that use the data of a dataset, directly or not, in the
+            order they can be run.
+        """
+        return self.data.descendants(self.dataset_uri(dataset))
+
+    def __contains__(self, dataset: str | URI) -> bool:
+        return self.dataset_uri(dataset) in self.data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(datastore={self.datastore!r},"
+            f"trigger={self.trigger!r},data={self.data!r})"
+        )
+
+
+def _replace_predecessors(
+    graph: DirectedAcyclicGraph, node: Hashable, predecessors: Iterable[Hashable]
+) -> List[Hashable]:
+    # Replace the edges to a node, restoring them if a new one creates a cycle, and
+    # return the previous ones
+    previous = [*graph.predecessors(node)]
+    for predecessor in previous:
+        graph.remove_edge(predecessor, node)
+    try:
+        for predecessor in predecessors:
+            graph.add_edge(predecessor, node)
+    except FunctionConfigurationError:
+        for predecessor in graph.predecessors(node):
+            graph.remove_edge(predecessor, node)
+        for predecessor in previous:
+            graph.add_edge(predecessor, node)
+        raise
+    return previous
+
+
+def _cycle_string(cycle: List[Hashable]) -> str:
+    return " -> ".join(str(node) for node in cycle)
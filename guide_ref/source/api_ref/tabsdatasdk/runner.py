@@ -0,0 +1,545 @@
+#
+# Copyright 2024 Tabs Data Inc.
+#
+
+import logging
+import multiprocessing
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Dict, Iterable, List
+
+import cloudpickle
+import polars as pl
+
+from tabsdatasdk.datasetfunction import (
+    DatasetFunction,
+    LocalFileInput,
+    TableInput,
+    TableOutput,
+)
+from tabsdatasdk.exceptions import ErrorCode, LocalRunError
+from tabsdatasdk.graph import DependencyGraph, DirectedAcyclicGraph
+from tabsdatasdk.plugin import InputPlugin, OutputPlugin
+from tabsdatasdk.uri import URI, Version, VersionList, VersionRange
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATASTORE = "local"
+HEAD_VERSION = "HEAD"
+TABLE_FILE_EXTENSION = ".parquet"
+# Versions are numbered, padded to the length of the version identifiers of the
+# server, so that they are valid versions of a URI
+VERSION_LENGTH = 26
+
+
+class TableStore:
+    """
+    Store of the tables of the datasets run locally, as parquet files in a folder.
+        Each table is a folder, root/datastore/dataset/table, with a parquet file for
+        each of its versions. The versions are numbered as they are written, and can
+        be read with their number or with the same expressions as in the server,
+        like HEAD, HEAD^ or HEAD~2.
+
+    Tables are read with polars scans, so only the columns and rows used by a
+        function are read.
+
+    Args:
+        root (str): The folder of the store.
+        datastore (str): The datastore of the URIs without one.
+    """
+
+    def __init__(self, root: str, datastore: str = DEFAULT_DATASTORE):
+        self.root = root
+        self.datastore = datastore
+
+    def table_uri(self, uri: URI) -> URI:
+        """
+        Obtain the URI of a table, without its version, with the datastore of the
+            store if it has none.
+        """
+        return URI(uri.datastore or self.datastore, uri.dataset, uri.table)
+
+    def versions(self, uri: URI) -> List[str]:
+        """
+        Obtain the versions of a table, from the oldest to the newest.
+        """
+        try:
+            files = os.listdir(self._table_folder(uri))
+        except FileNotFoundError:
+            return []
+        return sorted(
+            file[: -len(TABLE_FILE_EXTENSION)]
+            for file in files
+            if file.endswith(TABLE_FILE_EXTENSION)
+        )
+
+    def write(self, uri: URI, df: pl.DataFrame) -> URI:
+        """
+        Store a new version of a table.
+
+        Returns:
+            URI: The URI of the new version of the table.
+        """
+        folder = self._table_folder(uri)
+        os.makedirs(folder, exist_ok=True)
+        versions = self.versions(uri)
+        version = str(int(versions[-1]) + 1 if versions else 1).zfill(VERSION_LENGTH)
+        # Written to a temporary file first, so that it is never read half written
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=folder)
+        os.close(file_descriptor)
+        try:
+            df.write_parquet(temporary_path)
+            os.replace(temporary_path, self._version_path(uri, version))
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+        uri = self.table_uri(uri)
+        return URI(uri.datastore, uri.dataset, uri.table, version)
+
+    def scan(self, uri: URI) -> pl.LazyFrame | List[pl.LazyFrame]:
+        """
+        Scan the versions of a table given by a URI: the latest one if the URI has
+            no version, or a list of them if it has a list or a range of versions.
+        """
+        versions = self.versions(uri)
+        if isinstance(uri.version, VersionList):
+            return [
+                self._scan_version(uri, versions, version)
+                for version in uri.version.version_list
+            ]
+        elif isinstance(uri.version, VersionRange):
+            first = self._version_index(uri, versions, uri.version.initial_version)
+            last = self._version_index(uri, versions, uri.version.final_version)
+            step = 1 if first <= last else -1
+            return [
+                pl.scan_parquet(self._version_path(uri, versions[index]))
+                for index in range(first, last + step, step)
+            ]
+        else:
+            return self._scan_version(
+                uri, versions, uri.version or Version(HEAD_VERSION)
+            )
+
+    def _scan_version(
+        self, uri: URI, versions: List[str], version: Version
+    ) -> pl.LazyFrame:
+        index = self._version_index(uri, versions, version)
+        return pl.scan_parquet(self._version_path(uri, versions[index]))
+
+    def _version_index(self, uri: URI, versions: List[str], version: Version) -> int:
+        expression = version.version
+        if expression.startswith(HEAD_VERSION + "~"):
+            index = len(versions) - 1 - int(expression[len(HEAD_VERSION) + 1 :])
+        elif expression.startswith(HEAD_VERSION):
+            index = len(versions) - 1 - (len(expression) - len(HEAD_VERSION))
+        elif expression in versions:
+            index = versions.index(expression)
+        else:
+            index = -1
+        if index < 0:
+            raise LocalRunError(
+                ErrorCode.LRE2, self.table_uri(uri), expression, len(versions)
+            )
+        return index
+
+    def _table_folder(self, uri: URI) -> str:
+        uri = self.table_uri(uri)
+        return os.path.join(self.root, uri.datastore, uri.dataset, uri.table)
+
+    def _version_path(self, uri: URI, version: str) -> str:
+        return os.path.join(self._table_folder(uri), version + TABLE_FILE_EXTENSION)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(root={self.root!r},"
+            f"datastore={self.datastore!r})"
+        )
+
+
+class FunctionRun:
+    """
+    This class represents the result of running the function of a dataset locally.
+
+    The time of each step is measured separately: loading the inputs, calling the
+        function, collecting its results and writing them. As the inputs are lazy,
+        most of the work of a function is usually done when its results are
+        collected.
+
+    Args:
+        dataset (URI): The URI of the dataset.
+        tables (List[URI] | None): The URIs of the versions of the tables written.
+        error (Exception | None): The error raised while running the function, or
+            None if it ran successfully.
+        load_time (float | None): The seconds spent loading the inputs.
+        function_time (float | None): The seconds spent calling the function.
+        collect_time (float | None): The seconds spent collecting the results.
+        write_time (float | None): The seconds spent writing the results.
+    """
+
+    def __init__(
+        self,
+        dataset: URI,
+        tables: List[URI] | None = None,
+        error: Exception | None = None,
+        load_time: float | None = None,
+        function_time: float | None = None,
+        collect_time: float | None = None,
+        write_time: float | None = None,
+    ):
+        """
+        Initialize the FunctionRun object.
+
+        Args:
+            dataset (URI): The URI of the dataset.
+            tables (List[URI] | None): The URIs of the versions of the tables
+                written.
+            error (Exception | None): The error raised while running the function,
+                or None if it ran successfully.
+            load_time (float | None): The seconds spent loading the inputs.
+            function_time (float | None): The seconds spent calling the function.
+            collect_time (float | None): The seconds spent collecting the results.
+            write_time (float | None): The seconds spent writing the results.
+        """
+        self.dataset = dataset
+        self.tables = tables or []
+        self.error = error
+        self.load_time = load_time
+        self.function_time = function_time
+        self.collect_time = collect_time
+        self.write_time = write_time
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+    @property
+    def total_time(self) -> float:
+        """
+        float: The seconds spent running the function, adding all the steps.
+        """
+        return sum(
+            step or 0.0
+            for step in (
+                self.load_time,
+                self.function_time,
+                self.collect_time,
+                self.write_time,
+            )
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(dataset={self.dataset!r},"
+            f"tables={self.tables!r},error={self.error!r},"
+            f"total_time={self.total_time!r})"
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"Dataset: {self.dataset!s}, "
+            f"result: {'OK' if self.succeeded else f'failed ({self.error})'}, "
+            f"time: {self.total_time:.3f}s"
+        )
+
+
+class LocalRunner:
+    """
+    Runner of dataset functions in the local computer, without a server, to
+        develop and test them. Their inputs are loaded as polars LazyFrames and their
+        results are stored in a TableStore, so that the functions that use them as
+        a TableInput can read them.
+
+    The functions are run in the order given by their dependencies: a function is
+        run after the functions of the datasets it uses data from or is triggered
+        by, and the functions that do not depend on each other are run at the same
+        time.
+
+    Args:
+        root (str): The folder of the table store.
+        datastore (str): The datastore of the datasets run.
+        max_workers (int | None): The maximum number of functions run at the same
+            time. If None, the number of processors.
+        processes (bool): Whether to run the functions in other processes, so that
+            they run in parallel even while they hold the GIL. The functions are
+            sent to them with cloudpickle, and, as with multiprocessing, a script
+            that runs them must be guarded by 'if __name__ == "__main__"'. If False,
+            they are run in threads of the current process, for example to debug
+            them.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        datastore: str = DEFAULT_DATASTORE,
+        max_workers: int | None = None,
+        processes: bool = True,
+    ):
+        self.store = TableStore(root, datastore)
+        self.max_workers = max_workers
+        self.processes = processes
+
+    @property
+    def datastore(self) -> str:
+        return self.store.datastore
+
+    def run(
+        self,
+        functions: Iterable[DatasetFunction],
+        datasets: Iterable[str | URI] | None = None,
+    ) -> List[FunctionRun]:
+        """
+        Run some dataset functions in the order given by their dependencies.
+
+        Args:
+            functions (Iterable[DatasetFunction]): The functions of the datasets.
+            datasets (Iterable[str | URI] | None): The datasets to run. If None, all
+                of them are run. The functions of the other datasets are only used
+                to know the dependencies.
+
+        Returns:
+            List[FunctionRun]: The result of each function run, in the order they
+                can be run. If a function fails, the ones that depend on it are not
+                run, and their result has an error.
+
+        Raises:
+            FunctionConfigurationError: If the dependencies of the functions form a
+                cycle.
+        """
+        graph, functions = self._graph(functions)
+        if datasets is None:
+            selected = [*functions]
+        else:
+            selected = [graph.dataset_uri(dataset) for dataset in datasets]
+        return self._run(graph, functions, selected)
+
+    def trigger(
+        self, functions: Iterable[DatasetFunction], dataset: str | URI
+    ) -> List[FunctionRun]:
+        """
+        Run the function of a dataset and the functions triggered by it, directly or
+            not, as the server would when the dataset is triggered.
+
+        Args:
+            functions (Iterable[DatasetFunction]): The functions of the datasets.
+            dataset (str | URI): The dataset triggered.
+
+        Returns:
+            List[FunctionRun]: The result of each function run, in the order they
+                can be run.
+        """
+        graph, functions = self._graph(functions)
+        dataset = graph.dataset_uri(dataset)
+        return self._run(graph, functions, [dataset, *graph.affected_by(dataset)])
+
+    def _graph(self, functions: Iterable[DatasetFunction]):
+        functions = {
+            URI(self.datastore, function.dataset_name): function
+            for function in functions
+        }
+        graph = DependencyGraph.from_functions(functions.values(), self.datastore)
+        return graph, functions
+
+    def _run(
+        self,
+        graph: DependencyGraph,
+        functions: Dict[URI, DatasetFunction],
+        selected: List[URI],
+    ) -> List[FunctionRun]:
+        for dataset in selected:
+            if dataset not in functions:
+                raise LocalRunError(ErrorCode.LRE7, dataset)
+        # The datasets to run, with an edge from each one to the ones that must wait
+        # for it, either to use its data or to be triggered by it
+        schedule = DirectedAcyclicGraph()
+        for dataset in selected:
+            schedule.add_node(dataset)
+        for dataset in selected:
+            dependencies = graph.data.predecessors(dataset)
+            dependencies |= graph.trigger.predecessors(dataset)
+            for dependency in dependencies:
+                if dependency in schedule:
+                    schedule.add_edge(dependency, dataset)
+        waiting = {dataset: schedule.predecessors(dataset) for dataset in selected}
+        runs: Dict[URI, FunctionRun] = {}
+        if self.processes:
+            pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                # Forking a process that uses polars can deadlock it
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        with pool:
+            running: Dict[Future, URI] = {}
+
+            def submit(dataset: URI):
+                if self.processes:
+                    future = pool.submit(
+                        _run_pickled_function,
+                        cloudpickle.dumps(functions[dataset]),
+                        self.store,
+                    )
+                else:
+                    future = pool.submit(run_function, functions[dataset], self.store)
+                running[future] = dataset
+
+            for dataset in schedule.topological_order():
+                if not waiting[dataset]:
+                    submit(dataset)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    dataset = running.pop(future)
+                    try:
+                        run = future.result()
+                    except Exception as e:
+                        run = FunctionRun(dataset, error=e)
+                    runs[dataset] = run
+                    logger.debug(f"Ran the dataset {dataset}: {run}")
+                    if not run.succeeded:
+                        for dependent in schedule.descendants(dataset):
+                            runs.setdefault(
+                                dependent,
+                                FunctionRun(
+                                    dependent,
+                                    error=LocalRunError(
+                                        ErrorCode.LRE6, dependent, dataset
+                                    ),
+                                ),
+                            )
+                        continue
+                    for dependent in schedule.sort(schedule.successors(dataset)):
+                        waiting[dependent].discard(dataset)
+                        if not waiting[dependent] and dependent not in runs:
+                            submit(dependent)
+        return [runs[dataset] for dataset in schedule.topological_order()]
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(store={self.store!r},"
+            f"max_workers={self.max_workers!r},processes={self.processes!r})"
+        )
+
+
+def run_function(function: DatasetFunction, store: TableStore) -> FunctionRun:
+    """
+    Run the function of a dataset: load its inputs, call it and store its results.
+        Any error is returned in the result instead of being raised.
+    """
+    run = FunctionRun(URI(store.datastore, function.dataset_name))
+    try:
+        with tempfile.TemporaryDirectory() as working_dir:
+            start = time.perf_counter()
+            inputs = load_inputs(function, store, working_dir)
+            run.load_time = time.perf_counter() - start
+            start = time.perf_counter()
+            results = function(*inputs)
+            run.function_time = time.perf_counter() - start
+            _store_results(function, run, results, store)
+    except Exception as e:
+        run.error = e
+    return run
+
+
+def load_inputs(
+    function: DatasetFunction, store: TableStore, working_dir: str
+) -> List[pl.LazyFrame | List[pl.LazyFrame]]:
+    """
+    Load the inputs of the function of a dataset as polars LazyFrames, in the order
+        they are given to the function. An input with several versions of a table,
+        or several files of an InputPlugin, is given as a list of LazyFrames.
+    """
+    input = function.input
+    if input is None:
+        return []
+    elif isinstance(input, TableInput):
+        uris = input.uri if isinstance(input.uri, list) else [input.uri]
+        return [store.scan(uri) for uri in uris]
+    elif isinstance(input, LocalFileInput):
+        return input.scan_polars()
+    elif isinstance(input, InputPlugin):
+        paths = input.trigger_input(working_dir)
+        if isinstance(paths, str):
+            paths = [paths]
+        return [
+            (
+                [pl.scan_parquet(os.path.join(working_dir, file)) for file in path]
+                if isinstance(path, list)
+                else pl.scan_parquet(os.path.join(working_dir, path))
+            )
+            for path in paths
+        ]
+    else:
+        raise LocalRunError(
+            ErrorCode.LRE1, URI(store.datastore, function.dataset_name), type(input)
+        )
+
+
+def run_statistics(runs: List[FunctionRun]) -> dict:
+    """
+    Summarize the results of a local run: the number of functions that succeeded
+        and failed, and the seconds spent in each step, in total and in the slowest
+        function.
+    """
+    summary = {
+        "total": len(runs),
+        "succeeded": sum(run.succeeded for run in runs),
+        "failed": sum(not run.succeeded for run in runs),
+    }
+    for step in ("load", "function", "collect", "write", "total"):
+        summary[f"{step}_time"] = sum(
+            getattr(run, f"{step}_time") or 0.0 for run in runs
+        )
+    if runs:
+        slowest = max(runs, key=lambda run: run.total_time)
+        summary["slowest"] = str(slowest.dataset)
+        summary["slowest_time"] = slowest.total_time
+    return summary
+
+
+def _store_results(
+    function: DatasetFunction, run: FunctionRun, results, store: TableStore
+):
+    if results is None:
+        results = []
+    elif not isinstance(results, (list, tuple)):
+        results = [results]
+    output = function.output
+    if isinstance(output, OutputPlugin):
+        output.trigger_output(*results)
+    elif isinstance(output, TableOutput):
+        tables = output.table if isinstance(output.table, list) else [output.table]
+        if len(results) != len(tables):
+            raise LocalRunError(ErrorCode.LRE4, run.dataset, len(results), len(tables))
+        start = time.perf_counter()
+        collected = []
+        for table, result in zip(tables, results):
+            if isinstance(result, pl.LazyFrame):
+                result = result.collect()
+            elif not isinstance(result, pl.DataFrame):
+                raise LocalRunError(ErrorCode.LRE5, run.dataset, type(result), table)
+            collected.append(result)
+        run.collect_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for table, result in zip(tables, collected):
+            uri = URI(run.dataset.datastore, run.dataset.dataset, table)
+            run.tables.append(store.write(uri, result))
+        run.write_time = time.perf_counter() - start
+
+
+def _run_pickled_function(function: bytes, store: TableStore) -> FunctionRun:
+    run = run_function(cloudpickle.loads(function), store)
+    try:
+        pickle.dumps(run.error)
+    except Exception:
+        run.error = LocalRunError(ErrorCode.LRE8, run.dataset, repr(run.error))
+    return run
@@ -2,8 +2,15 @@
 # Copyright 2024 Tabs Data Inc.
 #
 
+import importlib.util
+import os
 from enum import Enum, auto
 
+# Same variable accessify uses to skip its checks. When set to a true value, or when
+# accessify is not installed, private methods are not wrapped at all.
+DISABLE_ACCESSIFY_ENVIRONMENT_VARIABLE = "DISABLE_ACCESSIFY"
+STATUS_ATTRIBUTE = "__td_status__"
+
 
 class Status(Enum):
     DELAYED = auto()
@@ -15,10 +22,54 @@ class Status(Enum):
 
 
 def status(enum_value: Status):
+    """
+    Annotate a function with its implementation status. The status is stored as an
+        attribute of the function, which is returned unchanged, so calling it has no
+        overhead.
+    """
+
     def decorator(func):
-        def wrapper(*args, **kwargs):
-            return func(*args, **kwargs)
+        target = func.fget if isinstance(func, property) else func
+        target = getattr(target, "__func__", target)
+        setattr(target, STATUS_ATTRIBUTE, enum_value)
+        return func
+
+    return decorator
+
+
+def get_status(func) -> Status | None:
+    """
+    Obtain the implementation status of a function annotated with status, or None if
+        it is not annotated.
+    """
+    target = func.fget if isinstance(func, property) else func
+    target = getattr(target, "__func__", target)
+    return getattr(target, STATUS_ATTRIBUTE, None)
+
 
+def _enforce_access() -> bool:
+    # An explicit false value, like "0" or "false", keeps the enforcement enabled
+    value = os.environ.get(DISABLE_ACCESSIFY_ENVIRONMENT_VARIABLE, "")
+    return (
+        value.strip().lower() in ("", "0", "false", "no")
+        and importlib.util.find_spec("accessify") is not None
+    )
+
+
+if _enforce_access():
+    from accessify import accessify
+    from accessify import private as _accessify_private
+
+    def private(func):
+        wrapper = _accessify_private(func)
+        # Keep the annotations of the function, like its status
+        wrapper.__dict__.update(getattr(func, "__dict__", {}))
         return wrapper
 
-    return decorator
+else:
+
+    def accessify(cls):
+        return cls
+
+    def private(func):
+        return func
@@ -10,7 +10,6 @@ from io import IOBase
 from pathlib import Path
 from typing import Any, Literal, NoReturn, overload
 
-from accessify import accessify, private
 from polars import DataFrame, DataType, Expr, LazyFrame, Schema
 
 # noinspection PyProtectedMember
@@ -31,7 +30,7 @@ from polars.dependencies import numpy as np
 import tabsdatasdk.tabsdataframe.group as tdg
 import tabsdatasdk.tabsdataframe.reflection as reflection
 from tabsdatasdk.exceptions import ErrorCode, TabsDataFrameError
-from tabsdatasdk.tabsdataframe.annotation import Status, status
+from tabsdatasdk.tabsdataframe.annotation import Status, accessify, private, status
 from tabsdatasdk.tabsdataframe.reflection import check_polars_api
 
 # ToDo: SDK-127: Unify conditional imports that depend on Python version in a single
@@ -62,9 +61,20 @@ class TabsDataLazyFrame:
         else:
             raise TabsDataFrameError(ErrorCode.TDF2, {type(df)})
 
+    def _derive(self, df: LazyFrame) -> TabsDataLazyFrame:
+        """
+        Wrap a LazyFrame obtained from this frame by an operation that keeps all its
+            columns, like a filter or a sort, without checking the required columns
+            again: they are known to be present, and checking them resolves the
+            schema of the whole plan.
+        """
+        derived = TabsDataLazyFrame.__new__(TabsDataLazyFrame)
+        derived._df = df
+        return derived
+
     @status(Status.DONE)
     def clone(self) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.clone())
+        return self._derive(self._df.clone())
 
     """ Serialization Functions """
 
@@ -226,15 +236,15 @@ class TabsDataLazyFrame:
 
     @status(Status.DONE)
     def __copy__(self) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.__copy__())
+        return self._derive(self._df.__copy__())
 
     @status(Status.DONE)
     def __deepcopy__(self, memo: None = None) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.__deepcopy__(memo=memo))
+        return self._derive(self._df.__deepcopy__(memo=memo))
 
     @status(Status.TODO)
     def __getitem__(self, item: int | range | slice) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.__getitem__(item=item))
+        return self._derive(self._df.__getitem__(item=item))
 
     @status(Status.DONE)
     def __str__(self) -> str:
@@ -331,7 +341,7 @@ class TabsDataLazyFrame:
     @private
     @status(Status.DONE)
     def inspect(self, fmt: str = "{}") -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.inspect(fmt=fmt))
+        return self._derive(self._df.inspect(fmt=fmt))
 
     """ Transformation Functions """
 
@@ -346,7 +356,7 @@ class TabsDataLazyFrame:
         maintain_order: bool = False,
         multithreaded: bool = True,
     ) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(
+        return self._derive(
             self._df.sort(
                 by=[by] + list(more_by),
                 *more_by,
@@ -368,12 +378,12 @@ class TabsDataLazyFrame:
         *,
         strict: bool = True,
     ) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.cast(dtypes=dtypes, strict=strict))
+        return self._derive(self._df.cast(dtypes=dtypes, strict=strict))
 
     # ToDo: should we allow only clear to 0 rows?
     @status(Status.TODO)
     def clear(self, n: int = 0) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.clear(n=n))
+        return self._derive(self._df.clear(n=n))
 
     # ToDo: allways attach system td columns.
     # ToDo: dedicated algorithm for proper provenance handling.
@@ -395,7 +405,7 @@ class TabsDataLazyFrame:
         allow_parallel: bool = True,
         force_parallel: bool = False,
     ) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(
+        return self._derive(
             self._df.join(
                 other=other._df,
                 on=on,
@@ -419,7 +429,7 @@ class TabsDataLazyFrame:
     def with_columns(
         self, *exprs: IntoExpr | Iterable[IntoExpr], **named_exprs: IntoExpr
     ) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.with_columns(*exprs, **named_exprs))
+        return self._derive(self._df.with_columns(*exprs, **named_exprs))
 
     # ToDo: officially deprecated; we can remove it.
     # ToDo: allways attach system td columns.
@@ -430,7 +440,7 @@ class TabsDataLazyFrame:
     #       that can substitute it.
     @status(Status.TODO)
     def concat(self, other: Self | list[Self]) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.with_context(other._df))
+        return self._derive(self._df.with_context(other._df))
 
     # ToDo: allways attach system td columns.
     # ToDo: dedicated algorithm for proper provenance handling.
@@ -454,7 +464,7 @@ class TabsDataLazyFrame:
         *,
         matches_supertype: bool = True,
     ) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(
+        return self._derive(
             self._df.fill_null(
                 value=value,
                 strategy=strategy,
@@ -466,7 +476,7 @@ class TabsDataLazyFrame:
     # ToDo: ensure system td columns are left unchanged.
     @status(Status.TODO)
     def fill_nan(self, value: int | float | Expr | None) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.fill_nan(value=value))
+        return self._derive(self._df.fill_nan(value=value))
 
     # ToDo: check for undesired operations of system td columns.
     # ToDo: proper expressions handling.
@@ -475,7 +485,7 @@ class TabsDataLazyFrame:
     def explode(
         self, columns: str | Expr | Sequence[str | Expr], *more_columns: str | Expr
     ) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.explode(columns=columns, *more_columns))
+        return self._derive(self._df.explode(columns=columns, *more_columns))
 
     # ToDo: check for undesired operations of system td columns.
     # ToDo: proper expressions handling.
@@ -488,7 +498,7 @@ class TabsDataLazyFrame:
         keep: UniqueKeepStrategy = "any",
         maintain_order: bool = False,
     ) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(
+        return self._derive(
             self._df.unique(subset=subset, keep=keep, maintain_order=maintain_order)
         )
 
@@ -530,7 +540,7 @@ class TabsDataLazyFrame:
         ),
         **constraints: Any,
     ) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.filter(*predicates, **constraints))
+        return self._derive(self._df.filter(*predicates, **constraints))
 
     # ToDo: allways attach system td columns.
     # ToDo: dedicated algorithm for proper provenance handling.
@@ -559,30 +569,32 @@ class TabsDataLazyFrame:
 
     @status(Status.DONE)
     def slice(self, offset: int, length: int | None = None) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.slice(offset=offset, length=length))
+        return self._derive(self._df.slice(offset=offset, length=length))
 
     @status(Status.DONE)
     def limit(self, n: int = 5) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.limit(n=n))
+        return self._derive(self._df.limit(n=n))
 
     @status(Status.DONE)
     def head(self, n: int = 5) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.head(n=n))
+        return self._derive(self._df.head(n=n))
 
     @status(Status.DONE)
     def tail(self, n: int = 5) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.tail(n=n))
+        return self._derive(self._df.tail(n=n))
 
     @status(Status.DONE)
     def last(self) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.last())
+        return self._derive(self._df.last())
 
     @status(Status.DONE)
     def first(self) -> TabsDataLazyFrame:
-        return TabsDataLazyFrame(self._df.first())
+        return self._derive(self._df.first())
 
     """Internal private Functions."""
 
 
-# Check polars API changes the first time this module is loaded.
-check_polars_api()
+# Check polars API changes the first time this module is loaded, only if requested,
+# to avoid inspecting both classes in every process that imports it.
+if reflection.polars_api_check_enabled():
+    check_polars_api()
@@ -3,6 +3,7 @@
 #
 
 import logging
+import os
 from typing import List
 
 from polars import DataFrame, LazyFrame
@@ -26,6 +27,9 @@ from td_interceptor import Interceptor
 # ToDo: SDK-128: Define the logging model for SDK CLI execution
 logger = logging.getLogger(__name__)
 
+# Set it to 1, true or yes to check the polars API when the frame module is loaded
+CHECK_POLARS_API_ENVIRONMENT_VARIABLE = "TD_CHECK_POLARS_API"
+
 
 def get_class_methods(cls) -> List[str]:
     methods = [func for func in dir(cls) if callable(getattr(cls, func))]
@@ -57,9 +61,20 @@ def get_missing_methods():
         logger.warning(f"   {polars_method}")
 
 
+def polars_api_check_enabled() -> bool:
+    """
+    Whether the polars API must be checked when the frame module is loaded.
+    """
+    value = os.environ.get(CHECK_POLARS_API_ENVIRONMENT_VARIABLE, "")
+    return value.strip().lower() in ("1", "true", "yes")
+
+
 def check_polars_api():
     """
-    Check polars API.
+    Check polars API. As it inspects every method of LazyFrame and
+        TabsDataLazyFrame, it is only run when the frame module is loaded if
+        enabled through the TD_CHECK_POLARS_API environment variable, and can
+        otherwise be called as a diagnostic.
     """
     logger.info("Available TabsDataLazyFrame methods:")
     for method in get_class_methods(tdf.TabsDataLazyFrame):
@@ -67,8 +82,21 @@ def check_polars_api():
     get_missing_methods()
 
 
+# The required columns of the last interceptor, as (interceptor, columns)
+_required_columns_cache = (None, None)
+
+
 def required_columns() -> list[str]:
-    return REQUIRED_COLUMNS + Interceptor.instance().required_columns()
+    """
+    Obtain the required columns. They are only requested once to each interceptor.
+    """
+    global _required_columns_cache
+    interceptor = Interceptor.instance()
+    cached_interceptor, columns = _required_columns_cache
+    if cached_interceptor is not interceptor:
+        columns = REQUIRED_COLUMNS + interceptor.required_columns()
+        _required_columns_cache = (interceptor, columns)
+    return columns
 
 
 def check_required_columns(df: DataFrame | LazyFrame):
@@ -76,10 +104,14 @@ def check_required_columns(df: DataFrame | LazyFrame):
     Check if any required column is missing.
     This can depend on the interceptor implementation.
     """
-    missing_columns = [
-        column
-        for column in required_columns()
-        if column not in df.collect_schema().names()
-    ]
+    columns = required_columns()
+    if not columns:
+        return
+    # Resolving the schema of a LazyFrame resolves its whole plan, so it is done once
+    if isinstance(df, DataFrame):
+        names = set(df.columns)
+    else:
+        names = set(df.collect_schema().names())
+    missing_columns = [column for column in columns if column not in names]
     if missing_columns:
         raise TabsDataFrameError(ErrorCode.TDF1, missing_columns)
@@ -2,6 +2,7 @@
 # Copyright 2024 Tabs Data Inc.
 #
 
+import functools
 import re
 from typing import List
 
@@ -9,6 +10,22 @@ from tabsdatasdk.exceptions import ErrorCode, URIConfigurationError
 
 TABSDATA_SCHEME = "td"
 URI_INDICATOR = "://"
+URI_PREFIX = TABSDATA_SCHEME + URI_INDICATOR
+# Pattern of the URIs of the form td:///datastore</dataset></table><@versions>,
+# without the 'td:///' prefix
+DATASTORE_URI_PATTERN = re.compile(
+    r"^(?P<datastore>[^/@]+)(?:/(?P<dataset>[^/@]+)(?:/(?P<table>[^/@]+)("
+    r"?:@(?P<version>[^/@]+))?)?|@(?P<version2>[^/@]+)|/(?P<dataset2>["
+    r"^/@]+)@(?P<version3>[^/@]+))?$"
+)
+# Pattern of the URIs of the form td://dataset</table><@versions>, without the
+# 'td://' prefix
+DATASET_URI_PATTERN = re.compile(
+    "^(?P<dataset>[^/@]+)(?:/(?P<table>[^/@]+)(?:@("
+    "?P<version>[^/@]+))?|@(?P<version2>[^/@]+))?$"
+)
+# Maximum number of parsed URI strings kept by build_uri_object
+URI_CACHE_SIZE = 4096
 
 
 class Version:
@@ -26,14 +43,18 @@ class Version:
 
     VERSION_PATTERN = re.compile(r"^(HEAD\^*|HEAD~[0-9]+|[A-Z0-9]{26})$")
 
+    __slots__ = ("_version", "_fully_built", "_string", "_hash")
+
     def __init__(self, version: str):
         """
-        Initialize the Version object.
+        Initialize the Version object. It can not be modified after it is created.
 
         Args:
             version (str): The version of the URI.
         """
+        self._fully_built = False
         self.version = version
+        _freeze(self)
 
     @property
     def version(self) -> str:
@@ -50,6 +71,7 @@ class Version:
         Args:
             version (str): The version of the URI.
         """
+        _check_mutable(self, "version")
         if isinstance(version, str):
             if self.VERSION_PATTERN.match(version):
                 self._version = version
@@ -64,12 +86,21 @@ class Version:
         """
         Return the version as a string.
         """
+        return self._string
+
+    def _build_string(self) -> str:
         return self.version
 
     def __eq__(self, other) -> bool:
-        if not isinstance(other, Version):
-            return False
-        return self.to_string() == other.to_string()
+        return _equal(self, other)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        # Built again when unpickled, as the hash of a string changes between
+        # processes
+        return self.__class__, (self.version,)
 
     def __str__(self) -> str:
         return self.to_string()
@@ -87,6 +118,8 @@ class VersionList:
         to_string() -> str: Return the version list as a string.
     """
 
+    __slots__ = ("_version_list", "_fully_built", "_string", "_hash")
+
     def __init__(self, version_list: List[Version] | List[str]):
         """
         Initialize the VersionList object.
@@ -94,14 +127,16 @@ class VersionList:
         Args:
             version_list (List[Version] | List[str]): The list of versions of the URI.
         """
+        self._fully_built = False
         self.version_list = version_list
+        _freeze(self)
 
     @property
     def version_list(self) -> List[Version]:
         """
         List[Version]: The list of versions of the URI.
         """
-        return self._version_list
+        return list(self._version_list)
 
     @version_list.setter
     def version_list(self, version_list: List[str] | List[Version]):
@@ -111,11 +146,12 @@ class VersionList:
         Args:
             version_list (List[str] | List[Version]): The list of versions of the URI.
         """
+        _check_mutable(self, "version_list")
         if isinstance(version_list, list):
             if len(version_list) > 1:
-                self._version_list = [
+                self._version_list = tuple(
                     build_version_object(version) for version in version_list
-                ]
+                )
             else:
                 raise URIConfigurationError(
                     ErrorCode.UCE8, version_list, len(version_list)
@@ -136,12 +172,19 @@ class VersionList:
         Returns:
             str: The version list as a string.
         """
-        return ",".join([version.to_string() for version in self.version_list])
+        return self._string
+
+    def _build_string(self) -> str:
+        return ",".join([version.to_string() for version in self._version_list])
 
     def __eq__(self, other) -> bool:
-        if not isinstance(other, VersionList):
-            return False
-        return self.to_string() == other.to_string()
+        return _equal(self, other)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        return self.__class__, (self.version_list,)
 
     def __str__(self) -> str:
         return self.to_string()
@@ -161,6 +204,14 @@ class VersionRange:
         to_string() -> str: Return the version range as a string.
     """
 
+    __slots__ = (
+        "_initial_version",
+        "_final_version",
+        "_fully_built",
+        "_string",
+        "_hash",
+    )
+
     def __init__(self, initial_version: str | Version, final_version: str | Version):
         """
         Initialize the VersionRange object.
@@ -169,8 +220,10 @@ class VersionRange:
             initial_version (str | Version): The initial version of the range.
             final_version (str | Version): The final version of the range.
         """
+        self._fully_built = False
         self.initial_version = initial_version
         self.final_version = final_version
+        _freeze(self)
 
     @property
     def initial_version(self) -> Version:
@@ -187,6 +240,7 @@ class VersionRange:
         Args:
             initial_version (str | Version): The initial version of the range.
         """
+        _check_mutable(self, "initial_version")
         built_initial_version = build_version_object(initial_version)
         if isinstance(built_initial_version, Version):
             self._initial_version = built_initial_version
@@ -213,6 +267,7 @@ class VersionRange:
         Args:
             final_version (str | Version): The final version of the range.
         """
+        _check_mutable(self, "final_version")
         built_final_version = build_version_object(final_version)
         if isinstance(built_final_version, Version):
             self._final_version = built_final_version
@@ -228,17 +283,52 @@ class VersionRange:
         Returns:
             str: The version range as a string.
         """
+        return self._string
+
+    def _build_string(self) -> str:
         return self.initial_version.to_string() + ".." + self.final_version.to_string()
 
     def __eq__(self, other) -> bool:
-        if not isinstance(other, VersionRange):
-            return False
-        return self.to_string() == other.to_string()
+        return _equal(self, other)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        return self.__class__, (self.initial_version, self.final_version)
 
     def __str__(self) -> str:
         return self.to_string()
 
 
+def _freeze(obj):
+    """
+    Mark an object of this module as fully built, storing its string and hash so
+        that comparing and hashing it does not build the string again.
+    """
+    obj._string = obj._build_string()
+    obj._hash = hash((obj.__class__, obj._string))
+    obj._fully_built = True
+
+
+def _equal(obj, other) -> bool:
+    if obj is other:
+        return True
+    if other.__class__ is not obj.__class__:
+        return False
+    return obj._hash == other._hash and obj._string == other._string
+
+
+def _check_mutable(obj, attribute: str):
+    """
+    Raise an error if an object of this module is modified after it is created. They
+        are immutable, so that they can be hashed and shared, like the URIs cached by
+        build_uri_object.
+    """
+    if getattr(obj, "_fully_built", False):
+        raise URIConfigurationError(ErrorCode.UCE17, obj.__class__.__name__, attribute)
+
+
 def build_version_object(version: str | Version | VersionList | VersionRange):
     if isinstance(version, (Version, VersionRange, VersionList)):
         return version
@@ -268,7 +358,8 @@ class URI:
         datastore, dataset and table are optional, but at least one of them must be
         present. The version is optional. The datastore, dataset and table must be
         strings. The version can be a string, a Version object, a VersionList object
-        or a VersionRange object.
+        or a VersionRange object. URI objects can not be modified after they are
+        created, and can be used as keys of dictionaries.
 
     Attributes:
         datastore (str): The datastore of the URI.
@@ -280,6 +371,16 @@ class URI:
         to_string() -> str: Return the URI as a string.
     """
 
+    __slots__ = (
+        "_datastore",
+        "_dataset",
+        "_table",
+        "_version",
+        "_fully_built",
+        "_string",
+        "_hash",
+    )
+
     def __init__(
         self,
         datastore: str | None = None,
@@ -306,7 +407,7 @@ class URI:
         self.table = table
         self.version = version
         self._verify_valid_uri()
-        self._fully_built = True
+        _freeze(self)
 
     @property
     def datastore(self) -> str:
@@ -323,14 +424,13 @@ class URI:
         Args:
             datastore (str | None): The datastore of the URI.
         """
+        _check_mutable(self, "datastore")
         if datastore is None:
             self._datastore = ""
         elif isinstance(datastore, str):
             self._datastore = datastore
         else:
             raise URIConfigurationError(ErrorCode.UCE10, type(datastore))
-        if self._fully_built:
-            self._verify_valid_uri()
 
     @property
     def dataset(self) -> str:
@@ -347,14 +447,13 @@ class URI:
         Args:
             dataset (str | None): The dataset of the URI.
         """
+        _check_mutable(self, "dataset")
         if dataset is None:
             self._dataset = ""
         elif isinstance(dataset, str):
             self._dataset = dataset
         else:
             raise URIConfigurationError(ErrorCode.UCE11, type(dataset))
-        if self._fully_built:
-            self._verify_valid_uri()
 
     @property
     def table(self) -> str:
@@ -371,14 +470,13 @@ class URI:
         Args:
             table (str | None): The table of the URI.
         """
+        _check_mutable(self, "table")
         if table is None:
             self._table = ""
         elif isinstance(table, str):
             self._table = table
         else:
             raise URIConfigurationError(ErrorCode.UCE12, type(table))
-        if self._fully_built:
-            self._verify_valid_uri()
 
     @property
     def version(self) -> Version | VersionList | VersionRange | None:
@@ -399,12 +497,11 @@ class URI:
                 by two dots. If it is a Version, VersionList or VersionRange object, it
                 will be used as is.
         """
+        _check_mutable(self, "version")
         if version is None:
             self._version = None
         else:
             self._version = build_version_object(version)
-        if self._fully_built:
-            self._verify_valid_uri()
 
     def to_string(self) -> str:
         """
@@ -413,6 +510,9 @@ class URI:
         Returns:
             str: The URI as a string.
         """
+        return self._string
+
+    def _build_string(self) -> str:
         if self.datastore:
             uri = f"{TABSDATA_SCHEME}{URI_INDICATOR}/{self.datastore}"
             if self.dataset:
@@ -436,61 +536,57 @@ class URI:
             raise URIConfigurationError(ErrorCode.UCE16)
 
     def __eq__(self, other) -> bool:
-        if not isinstance(other, URI):
-            return False
-        return self.to_string() == other.to_string()
+        return _equal(self, other)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        return self.__class__, (self.datastore, self.dataset, self.table, self.version)
 
     def __str__(self) -> str:
         return self.to_string()
 
 
 def build_uri_object(uri: str | URI) -> URI:
-    original_uri = uri
+    """
+    Build a URI object from a string, or return it if it is already a URI object.
+        As URI objects are immutable, the same object is returned for the most
+        recently parsed strings instead of parsing them again.
+    """
     if isinstance(uri, URI):
         return uri
     elif isinstance(uri, str):
-        uri_prefix = TABSDATA_SCHEME + URI_INDICATOR
-        if uri.startswith(uri_prefix + "/"):
-            # We are working with a URI string of the form
-            # td://datastore</dataset></table><@versions>
-            # We remove the third slash and then match it with a regex
-            uri = uri[len(uri_prefix) + 1 :]
-            pattern = re.compile(
-                r"^(?P<datastore>[^/@]+)(?:/(?P<dataset>[^/@]+)(?:/(?P<table>[^/@]+)("
-                r"?:@(?P<version>[^/@]+))?)?|@(?P<version2>[^/@]+)|/(?P<dataset2>["
-                r"^/@]+)@(?P<version3>[^/@]+))?$"
+        return _parse_uri(uri)
+    else:
+        raise URIConfigurationError(ErrorCode.UCE14, type(uri))
+
+
+@functools.lru_cache(maxsize=URI_CACHE_SIZE)
+def _parse_uri(uri: str) -> URI:
+    if uri.startswith(URI_PREFIX + "/"):
+        # We are working with a URI string of the form
+        # td://datastore</dataset></table><@versions>
+        # We remove the third slash and then match it with a regex
+        match = DATASTORE_URI_PATTERN.match(uri[len(URI_PREFIX) + 1 :])
+        if match:
+            return URI(
+                match.group("datastore"),
+                match.group("dataset") or match.group("dataset2"),
+                match.group("table"),
+                match.group("version")
+                or match.group("version2")
+                or match.group("version3"),
             )
-            match = pattern.match(uri)
-            if match:
-                return URI(
-                    match.group("datastore"),
-                    match.group("dataset") or match.group("dataset2"),
-                    match.group("table"),
-                    match.group("version")
-                    or match.group("version2")
-                    or match.group("version3"),
-                )
-            else:
-                raise URIConfigurationError(ErrorCode.UCE13, original_uri)
-        elif uri.startswith(uri_prefix):
-            # We are working with a URI string of the form
-            # td://dataset</table><@versions>
-            uri = uri[len(uri_prefix) :]
-            pattern = re.compile(
-                "^(?P<dataset>[^/@]+)(?:/(?P<table>[^/@]+)(?:@("
-                "?P<version>[^/@]+))?|@(?P<version2>[^/@]+))?$"
+    elif uri.startswith(URI_PREFIX):
+        # We are working with a URI string of the form
+        # td://dataset</table><@versions>
+        match = DATASET_URI_PATTERN.match(uri[len(URI_PREFIX) :])
+        if match:
+            return URI(
+                None,
+                match.group("dataset"),
+                match.group("table"),
+                match.group("version") or match.group("version2"),
             )
-            match = pattern.match(uri)
-            if match:
-                return URI(
-                    None,
-                    match.group("dataset"),
-                    match.group("table"),
-                    match.group("version") or match.group("version2"),
-                )
-            else:
-                raise URIConfigurationError(ErrorCode.UCE13, original_uri)
-        else:
-            raise URIConfigurationError(ErrorCode.UCE13, original_uri)
-    else:
-        raise URIConfigurationError(ErrorCode.UCE14, type(original_uri))
+    raise URIConfigurationError(ErrorCode.UCE13, uri)
@@ -0,0 +1,291 @@
+#
+# Copyright 2024 Tabs Data Inc.
+#
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, Iterable, Tuple
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_CACHE_FOLDER = os.path.join(os.path.expanduser("~"), ".tabsdata", "bundle_cache")
+BUNDLE_HASH_FILE_NAME = "bundle_hash"
+FILE_HASHES_FILE_NAME = "file_hashes.json"
+# The last use of a memoized file hash is only refreshed when it is older than this
+# many seconds, so that an unchanged folder does not rewrite the file every time
+FILE_HASH_LAST_USE_RESOLUTION = 3600
+HASH_BLOCK_SIZE = 1024 * 1024
+LOCK_FILE_NAME = ".lock"
+MAX_CACHED_BUNDLES = 32
+
+
+def calculate_file_sha256(file_path: str) -> str:
+    sha256_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for byte_block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            sha256_hash.update(byte_block)
+    return sha256_hash.hexdigest()
+
+
+class BundleCache:
+    """
+    Local content-addressed cache of function bundles. A bundle is identified by a
+        key computed from the hashes of every file that goes into it (code, local
+        packages, requirements, configuration and pickled function), so an unchanged
+        function reuses the archive and the bundle hash of a previous registration.
+
+    The hashes of the source files are memoized by path, size and modification
+        time, so computing the key of an unchanged folder only requires a stat of
+        each file. The key is not computed if a source file changed, since the
+        bundle must be built anyway; the hashes computed while building it are
+        memoized instead, so the sources are read only once. The memoized hashes
+        that were not used by any of the bundles kept are dropped when the least
+        recently used bundles are deleted.
+
+    The cache can be shared by several processes. Bundles are never handed out from
+        the cache folder itself: get and put link (or copy) the archive, so that a
+        bundle deleted by another process while it is being uploaded is not lost.
+        The file of memoized hashes is merged with the one on disk, and the least
+        recently used bundles are deleted, while holding a lock on the cache.
+
+    Args:
+        location (str): The folder where the cached bundles are stored.
+        max_bundles (int): The maximum number of bundles to keep. The least recently
+            used ones are deleted when it is exceeded.
+    """
+
+    def __init__(
+        self,
+        location: str = BUNDLE_CACHE_FOLDER,
+        max_bundles: int = MAX_CACHED_BUNDLES,
+    ):
+        self.location = location
+        self.max_bundles = max_bundles
+        os.makedirs(self.location, exist_ok=True)
+        self._file_hashes_path = os.path.join(self.location, FILE_HASHES_FILE_NAME)
+        self._lock_path = os.path.join(self.location, LOCK_FILE_NAME)
+        self._file_hashes = self._load_file_hashes()
+        self._modified_file_hashes = set()
+
+    def key(
+        self,
+        entries: Iterable[Tuple[str, str | None]],
+        generated_entries: Iterable[Tuple[str, str | None]] = (),
+    ) -> str | None:
+        """
+        Compute the key of a bundle from the memoized hashes of its source files.
+
+        Args:
+            entries (Iterable[Tuple[str, str | None]]): Pairs of (path inside the
+                archive, path in the local system) of the source files. The local
+                path is None for directories.
+            generated_entries (Iterable[Tuple[str, str | None]]): Same as entries,
+                but for files generated for this bundle only. Their hashes are not
+                memoized, so they are always computed.
+
+        Returns:
+            str | None: The key of the bundle, or None if the hash of a source file
+                is not memoized (because it is new or changed), so that computing
+                the key would require reading it.
+        """
+        hashed_entries = [
+            (arcname, self._memoized_file_sha256(path) if path else "")
+            for arcname, path in entries
+        ]
+        self._store_file_hashes()
+        if any(file_hash is None for _, file_hash in hashed_entries):
+            return None
+        hashed_entries += [
+            (arcname, calculate_file_sha256(path) if path else "")
+            for arcname, path in generated_entries
+        ]
+        key_hash = hashlib.sha256()
+        for arcname, file_hash in sorted(hashed_entries):
+            key_hash.update(f"{arcname}\0{file_hash}\n".encode())
+        return key_hash.hexdigest()
+
+    def memoize(self, file_hashes: Dict[str, Tuple[os.stat_result, str]]):
+        """
+        Memoize the hashes of source files computed elsewhere, like while they are
+            added to an archive.
+
+        Args:
+            file_hashes (Dict[str, Tuple[os.stat_result, str]]): The stat of each
+                file, taken before it was read, and its hash, by path.
+        """
+        now = time.time()
+        for path, (stat, file_hash) in file_hashes.items():
+            self._file_hashes[path] = [stat.st_size, stat.st_mtime_ns, file_hash, now]
+            self._modified_file_hashes.add(path)
+        self._store_file_hashes()
+
+    def get(self, key: str, destination: str) -> str | None:
+        """
+        Get a bundle from the cache.
+
+        Args:
+            key (str): The key of the bundle.
+            destination (str): The path where the cached archive is linked, or
+                copied if it can not be linked.
+
+        Returns:
+            str | None: The hash of the archive, or None if the bundle is not in the
+                cache.
+        """
+        bundle_folder = os.path.join(self.location, key)
+        try:
+            with open(os.path.join(bundle_folder, BUNDLE_HASH_FILE_NAME)) as file:
+                bundle_hash = file.read().strip()
+            (archive_name,) = [
+                name
+                for name in os.listdir(bundle_folder)
+                if name != BUNDLE_HASH_FILE_NAME
+            ]
+            _link_or_copy(os.path.join(bundle_folder, archive_name), destination)
+            # Refresh the modification time so that it is kept as recently used
+            os.utime(bundle_folder)
+        except (FileNotFoundError, ValueError):
+            # Not cached, or deleted by another process while it was being read
+            return None
+        logger.debug(f"Reusing cached bundle '{key}'.")
+        return bundle_hash
+
+    def put(self, key: str, archive: str, bundle_hash: str):
+        """
+        Store a bundle in the cache.
+
+        Args:
+            key (str): The key of the bundle.
+            archive (str): The path to the archive. It is linked, or copied if it
+                can not be linked, into the cache, and left in place.
+            bundle_hash (str): The hash of the archive.
+        """
+        bundle_folder = os.path.join(self.location, key)
+        # The bundle is written in a temporary folder and then renamed, so that a
+        # partially written bundle is never found by get
+        temporary_folder = tempfile.mkdtemp(dir=self.location, prefix=".tmp_")
+        _link_or_copy(
+            archive, os.path.join(temporary_folder, os.path.basename(archive))
+        )
+        with open(os.path.join(temporary_folder, BUNDLE_HASH_FILE_NAME), "w") as file:
+            file.write(bundle_hash)
+        with self._lock():
+            shutil.rmtree(bundle_folder, ignore_errors=True)
+            try:
+                os.replace(temporary_folder, bundle_folder)
+            except OSError:
+                # Another process stored the same bundle in the meantime
+                shutil.rmtree(temporary_folder, ignore_errors=True)
+            self._evict()
+
+    def _evict(self):
+        bundles = [
+            os.path.join(self.location, name)
+            for name in os.listdir(self.location)
+            if os.path.isdir(os.path.join(self.location, name))
+            and not name.startswith(".")
+        ]
+        if len(bundles) <= self.max_bundles:
+            return
+        bundles.sort(key=os.path.getmtime, reverse=True)
+        for bundle_folder in bundles[self.max_bundles :]:
+            shutil.rmtree(bundle_folder, ignore_errors=True)
+        # Drop the memoized hashes not used since the oldest bundle kept was last
+        # used. The margin covers the resolution of the last use and the time
+        # spent building a bundle after computing its key.
+        oldest_use = os.path.getmtime(bundles[self.max_bundles - 1])
+        threshold = oldest_use - 2 * FILE_HASH_LAST_USE_RESOLUTION
+        file_hashes = self._load_file_hashes()
+        kept_file_hashes = {
+            path: entry
+            for path, entry in file_hashes.items()
+            if len(entry) == 4 and entry[3] >= threshold
+        }
+        if len(kept_file_hashes) < len(file_hashes):
+            logger.debug(
+                f"Dropping {len(file_hashes) - len(kept_file_hashes)} memoized "
+                "file hashes."
+            )
+            self._write_file_hashes(kept_file_hashes)
+
+    def _memoized_file_sha256(self, path: str) -> str | None:
+        stat = os.stat(path)
+        cached = self._file_hashes.get(path)
+        if not (
+            cached
+            and len(cached) == 4
+            and cached[:2] == [stat.st_size, stat.st_mtime_ns]
+        ):
+            return None
+        now = time.time()
+        if now - cached[3] > FILE_HASH_LAST_USE_RESOLUTION:
+            cached[3] = now
+            self._modified_file_hashes.add(path)
+        return cached[2]
+
+    def _load_file_hashes(self) -> dict:
+        try:
+            with open(self._file_hashes_path) as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _store_file_hashes(self):
+        if not self._modified_file_hashes:
+            return
+        with self._lock():
+            # Merge with the hashes stored by other processes since they were loaded
+            file_hashes = self._load_file_hashes()
+            for path in self._modified_file_hashes:
+                file_hashes[path] = self._file_hashes[path]
+            self._write_file_hashes(file_hashes)
+        self._file_hashes = file_hashes
+        self._modified_file_hashes.clear()
+
+    def _write_file_hashes(self, file_hashes: dict):
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.location)
+        with os.fdopen(file_descriptor, "w") as file:
+            json.dump(file_hashes, file)
+        os.replace(temporary_path, self._file_hashes_path)
+
+    @contextlib.contextmanager
+    def _lock(self):
+        """
+        Hold an exclusive lock on the cache, shared with other processes.
+        """
+        with open(self._lock_path, "a+b") as lock_file:
+            if os.name == "nt":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if os.name == "nt":
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _link_or_copy(source: str, destination: str):
+    """
+    Hard link a file, or copy it if it can not be linked (for example, if the
+        destination is in a different file system).
+    """
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
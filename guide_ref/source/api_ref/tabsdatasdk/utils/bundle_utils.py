@@ -2,6 +2,7 @@
 # Copyright 2024 Tabs Data Inc.
 #
 
+import hashlib
 import json
 import logging
 import os
@@ -9,9 +10,10 @@ import pkgutil
 import shutil
 import sys
 import tarfile
+import time
 from enum import Enum
 from pathlib import Path
-from typing import Callable, List, Literal
+from typing import Callable, Iterable, Iterator, List, Literal, Tuple
 
 import cloudpickle
 import yaml
@@ -19,6 +21,28 @@ import yaml
 from tabsdatasdk.datasetfunction import DatasetFunction, Input, Output
 from tabsdatasdk.exceptions import ErrorCode, RegistrationError
 from tabsdatasdk.plugin import InputPlugin, OutputPlugin
+from tabsdatasdk.utils.bundle_cache import (
+    BUNDLE_CACHE_FOLDER,
+    MAX_CACHED_BUNDLES,
+    BundleCache,
+)
+from tabsdatasdk.utils.compression import (
+    ARCHIVE_EXTENSIONS,
+    BUNDLE_FORMAT_VERSION,
+    DEFAULT_COMPRESSION,
+    open_compressor,
+    resolve_compression_level,
+)
+from tabsdatasdk.utils.ignore import (
+    GITIGNORE_FILE_NAME,
+    TDIGNORE_FILE_NAME,
+    IgnoreMatcher,
+)
+from tabsdatasdk.utils.import_graph import ImportGraph
+from tabsdatasdk.utils.requirements_cache import (
+    REQUIREMENTS_CACHE_FOLDER,
+    RequirementsCache,
+)
 
 # Importing like this to ensure backwards compatibility with Python 3.7 and prior
 if sys.version_info >= (3, 8):
@@ -30,11 +54,17 @@ logger = logging.getLogger(__name__)
 
 CODE_FOLDER = "original_code"
 COMPRESSED_CONTEXT_FOLDER = "context.tar.gz"
+COMPRESSED_CONTEXT_NAME = "context"
+CONFIG_BUNDLE_FORMAT_COMPRESSION_KEY = "compression"
+CONFIG_BUNDLE_FORMAT_KEY = "bundleFormat"
+CONFIG_BUNDLE_FORMAT_LEVEL_KEY = "level"
+CONFIG_BUNDLE_FORMAT_VERSION_KEY = "version"
 CONFIG_ENTRY_POINT_FUNCTION_FILE_KEY = "functionFile"
 CONFIG_ENTRY_POINT_KEY = "entryPoint"
 CONFIG_FILE_NAME = "configuration.json"
 CONFIG_INPUTS_KEY = "inputs"
 CONFIG_OUTPUT_KEY = "output"
+DEFAULT_IGNORE_FILES = (TDIGNORE_FILE_NAME,)
 IGNORED_FOLDERS = (".venv", ".git", "__pycache__")
 LOCAL_PACKAGES_FOLDER = "local_packages"
 PLUGINS_FOLDER = "plugins"
@@ -46,9 +76,22 @@ PYTHON_VERSION_KEY = "pythonVersion"
 REQUIREMENTS_FILE_NAME = "requirements.yaml"
 
 
-def create_configuration(function: DatasetFunction, save_location: str):
+def create_configuration(
+    function: DatasetFunction,
+    save_location: str,
+    compression: str = DEFAULT_COMPRESSION,
+    compression_level: int | None = None,
+):
     os.makedirs(save_location, exist_ok=True)
     configuration = dict()
+    # Tells the backend how to unpack the bundle
+    configuration[CONFIG_BUNDLE_FORMAT_KEY] = {
+        CONFIG_BUNDLE_FORMAT_VERSION_KEY: BUNDLE_FORMAT_VERSION,
+        CONFIG_BUNDLE_FORMAT_COMPRESSION_KEY: compression,
+        CONFIG_BUNDLE_FORMAT_LEVEL_KEY: resolve_compression_level(
+            compression, compression_level
+        ),
+    }
     configuration[CONFIG_INPUTS_KEY] = create_input_configuration(
         function, save_location
     )
@@ -101,34 +144,152 @@ def generate_entry_point_field(function):
     }
 
 
-def create_tarball(source_dir: str, output_filename: str):
-    with tarfile.open(output_filename, "w:gz") as tar:
-        tar.add(source_dir, arcname=os.path.sep)
+class _HashingWriter:
+    """
+    Write-only file wrapper that computes the SHA-256 hash of everything written
+        through it, so that an archive can be hashed while it is being created.
+    """
+
+    def __init__(self, file):
+        self._file = file
+        self._sha256 = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self._sha256.update(data)
+        return self._file.write(data)
+
+    def flush(self):
+        self._file.flush()
+
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
+
+
+class _HashingReader:
+    """
+    Read-only file wrapper that computes the SHA-256 hash of everything read
+        through it, so that a file can be hashed while it is added to an archive.
+    """
+
+    def __init__(self, file):
+        self._file = file
+        self._sha256 = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._file.read(size)
+        self._sha256.update(data)
+        return data
+
+    def hexdigest(self) -> str:
+        return self._sha256.hexdigest()
+
+
+def _add_to_tarball(
+    tar: tarfile.TarFile,
+    path: str,
+    arcname: str,
+    file_hashes: dict | None = None,
+):
+    """
+    Add a path to a tarball, without its contents if it is a folder. If file_hashes
+        is provided, the stat and the SHA-256 hash of a regular file are stored in
+        it by path, the hash being computed while the file is added.
+    """
+    if file_hashes is None:
+        tar.add(path, arcname=arcname, recursive=False)
+        return
+    # Taken before the file is read, so that a change while it is read is noticed
+    stat = os.stat(path)
+    tarinfo = tar.gettarinfo(path, arcname)
+    if not tarinfo.isreg():
+        tar.add(path, arcname=arcname, recursive=False)
+        return
+    with open(path, "rb") as file:
+        reader = _HashingReader(file)
+        tar.addfile(tarinfo, reader)
+    file_hashes[path] = (stat, reader.hexdigest())
+
+
+def create_tarball(
+    source_dir: str,
+    output_filename: str,
+    deferred_sources: List[Tuple[str, str]] | None = None,
+    compression: str = DEFAULT_COMPRESSION,
+    compression_level: int | None = None,
+    compression_threads: int | None = None,
+    ignore_files: Tuple[str, ...] = DEFAULT_IGNORE_FILES,
+    file_hashes: dict | None = None,
+) -> str:
+    """Creates a compressed tarball with the contents of source_dir and, if provided,
+    the (source path, path inside the archive) pairs of deferred_sources, which are
+    streamed directly from their original location, skipping the paths matched by
+    the ignore_files of each deferred folder. The tarball is compressed with the
+    given backend using compression_threads threads (one per core if None).
+    If file_hashes is provided, the stat and the SHA-256 hash of each deferred file
+    are stored in it by path, computed while the file is added.
+    Returns the SHA-256 hash of the tarball, computed while it is written."""
+    excluded_paths = (
+        os.path.abspath(source_dir),
+        os.path.abspath(os.path.dirname(output_filename)),
+    )
+    with open(output_filename, "wb") as file:
+        writer = _HashingWriter(file)
+        compressor = open_compressor(
+            writer, compression, compression_level, compression_threads
+        )
+        with compressor, tarfile.open(
+            fileobj=compressor, mode="w|", dereference=True
+        ) as tar:
+            for source, arcname in deferred_sources or []:
+                if os.path.isdir(source):
+                    for path, relative_path in _iter_folder_contents(
+                        source, excluded_paths, ignore_files
+                    ):
+                        _add_to_tarball(
+                            tar,
+                            path,
+                            os.path.join(arcname, relative_path),
+                            file_hashes,
+                        )
+                else:
+                    _add_to_tarball(tar, source, arcname, file_hashes)
+            # Added last so that the generated files take precedence over any
+            # source file with the same name when the archive is extracted
+            tar.add(source_dir, arcname=os.path.sep)
+    return writer.hexdigest()
 
 
 def create_requirements(
-    save_location: str | os.PathLike, local_packages: List[str] | str | None = None
+    save_location: str | os.PathLike,
+    local_packages: List[str] | str | None = None,
+    deferred_sources: List[Tuple[str, str]] | None = None,
+    modules: Iterable[str] | None = None,
 ) -> List[str]:
     """Infers the requirements of the current environment and saves them to a YAML
-    file. Furthermore, it saves the local packages to the save location if provided."""
+    file. Furthermore, it saves the local packages to the save location if provided.
+    If deferred_sources is provided, the local packages are not copied; instead,
+    their paths are appended to it to be added to the archive later. If modules is
+    provided, only the distributions of those top-level modules are required."""
     os.makedirs(save_location, exist_ok=True)
-    requirements = obtain_ordered_dists()
+    requirements = obtain_ordered_dists(modules)
     python_version = (
         f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
     )
     # Create a YAML file with the Python version and requirements
-    # Since we are copying the entire environment, install dependencies is set to False
+    # When copying the entire environment, install dependencies is set to False.
+    # When only the imported distributions are required, their dependencies must be
+    # installed too.
     data = {
         PYTHON_VERSION_KEY: python_version,
         PYTHON_REQUIREMENTS_KEY: requirements,
-        PYTHON_REQUIREMENTS_INSTALL_DEPENDENCIES_KEY: False,
+        PYTHON_REQUIREMENTS_INSTALL_DEPENDENCIES_KEY: modules is not None,
         PYTHON_CHECK_MODULE_AVAILABILITY_KEY: True,
     }
 
     if local_packages:
         if isinstance(local_packages, str):
             local_packages = [local_packages]
-        bundle_local_packages(local_packages, save_location)
+        bundle_local_packages(local_packages, save_location, deferred_sources)
         data[PYTHON_LOCAL_PACKAGES_KEY] = local_packages
 
     yaml_output = yaml.dump(data, sort_keys=True)
@@ -139,19 +300,23 @@ def create_requirements(
     return requirements
 
 
-def bundle_local_packages(local_packages, save_location):
+def bundle_local_packages(local_packages, save_location, deferred_sources=None):
     for count, package_path in enumerate(local_packages):
         if not os.path.isdir(package_path):
             raise RegistrationError(ErrorCode.RE6, package_path)
-        else:
+        package_location = os.path.join(LOCAL_PACKAGES_FOLDER, str(count))
+        if deferred_sources is None:
             store_folder_contents(
-                package_path,
-                os.path.join(save_location, LOCAL_PACKAGES_FOLDER, str(count)),
+                package_path, os.path.join(save_location, package_location)
             )
+        else:
+            deferred_sources.append((package_path, package_location))
 
 
 def copy_and_verify_requirements_file(
-    save_location: str | os.PathLike, requirements_file: str
+    save_location: str | os.PathLike,
+    requirements_file: str,
+    deferred_sources: List[Tuple[str, str]] | None = None,
 ) -> List[str]:
     try:
         with open(requirements_file, "r") as file:
@@ -182,20 +347,48 @@ def copy_and_verify_requirements_file(
     shutil.copy(requirements_file, os.path.join(save_location, REQUIREMENTS_FILE_NAME))
     # Copy the local packages to the save location
     if data.get(PYTHON_LOCAL_PACKAGES_KEY):
-        bundle_local_packages(data.get(PYTHON_LOCAL_PACKAGES_KEY), save_location)
+        bundle_local_packages(
+            data.get(PYTHON_LOCAL_PACKAGES_KEY), save_location, deferred_sources
+        )
     return requirements
 
 
-def obtain_ordered_dists() -> List[str]:
-    available_modules = [module.name for module in pkgutil.iter_modules()]
+def obtain_ordered_dists(
+    modules: Iterable[str] | None = None,
+    cache_location: str | None = REQUIREMENTS_CACHE_FOLDER,
+) -> List[str]:
+    """
+    Obtain the distributions installed in the current environment, in the form
+        'name==version'.
+
+    Args:
+        modules (Iterable[str] | None): If provided, only the distributions of these
+            top-level modules are returned.
+        cache_location (str | None): The folder of the local requirements cache,
+            which avoids scanning the parts of the environment that did not change.
+            If None, the cache is not used.
+    """
     dists = []
-    mapping = importlib_metadata.packages_distributions()
+    if cache_location:
+        available_modules, mapping, versions = RequirementsCache(
+            cache_location
+        ).environment()
+    else:
+        available_modules = [module.name for module in pkgutil.iter_modules()]
+        mapping = importlib_metadata.packages_distributions()
+        versions = None
+    if modules is not None:
+        available_modules = set(available_modules).intersection(modules)
     real_modules = [
         mapping[module][0] for module in available_modules if module in mapping
     ]
     for module in real_modules:
         try:
-            version = importlib_metadata.version(module)
+            version = (
+                versions.get(module)
+                if versions is not None
+                else importlib_metadata.version(module)
+            )
             if version:
                 dists.append(f"{module}=={version}")
         except importlib_metadata.PackageNotFoundError:  # pragma: no cover
@@ -224,38 +417,100 @@ def store_file_contents(path_to_persist: str, save_location: str):
     )
 
 
+def _iter_folder_contents(
+    path_to_persist: str,
+    excluded_paths: Tuple[str, ...] = (),
+    ignore_files: Tuple[str, ...] = DEFAULT_IGNORE_FILES,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Walk a folder and yield (absolute path, path relative to the folder) for every
+        directory and file that must be persisted. Ignored folders are pruned before
+        descending into them.
+
+    Args:
+        path_to_persist (str): The folder to walk.
+        excluded_paths (Tuple[str, ...]): Absolute paths that must not be persisted.
+        ignore_files (Tuple[str, ...]): The names of the ignore files, like
+            .tdignore, with the patterns of the paths that must not be persisted.
+            They are looked for in the folder to walk.
+    """
+    # We ignore 3 kinds of paths: the excluded paths (to avoid infinite recursion
+    # issues when the folder is stored inside itself), folders with names in
+    # IGNORED_FOLDERS like .venv, since those should generally be ignored, and the
+    # paths matched by the ignore files. If facing issues regarding folders not
+    # being properly loaded, this might be the place to look.
+    root = os.path.abspath(path_to_persist)
+    matcher = IgnoreMatcher.from_folder(root, ignore_files)
+    for directory, folders, files in os.walk(root, followlinks=True):
+        # Paths are built from the relative path of the directory instead of being
+        # computed for each entry
+        relative_directory = os.path.relpath(directory, root)
+        prefix = "" if relative_directory == os.curdir else relative_directory + os.sep
+        matcher_prefix = prefix.replace(os.sep, "/")
+        folders[:] = [
+            folder
+            for folder in folders
+            if folder not in IGNORED_FOLDERS
+            and os.path.join(directory, folder) not in excluded_paths
+            and not (matcher and matcher.ignored(matcher_prefix + folder, True))
+        ]
+        for name in folders:
+            yield os.path.join(directory, name), prefix + name
+        for name in files:
+            if matcher and matcher.ignored(matcher_prefix + name, False):
+                continue
+            yield os.path.join(directory, name), prefix + name
+
+
 def store_folder_contents(path_to_persist: str, save_location: str):
     os.makedirs(save_location, exist_ok=True)
+    for path, relative_path in _iter_folder_contents(
+        path_to_persist, (os.path.abspath(save_location),)
+    ):
+        destination = os.path.join(save_location, relative_path)
+        if os.path.isdir(path):
+            os.makedirs(destination, exist_ok=True)
+        else:
+            shutil.copy(path, destination)
 
-    def ignorePath(path):
-        # We ignore 2 kinds of folders: the original folder (to avoid infinite
-        # recursion issues when the folder is stored inside itself), and folders with
-        # names that begin with a . like .venv, since those should generally be ignored.
-        # If facing issues regarding folders not being properly loaded, this might be
-        # the place to look.
-        def ignoref(directory, contents):
-            result = [
-                f
-                for f in contents
-                if os.path.abspath(os.path.join(directory, f)) == path
-                or f in IGNORED_FOLDERS
-            ]
-            return result
-
-        return ignoref
 
-    os.makedirs(save_location, exist_ok=True)
-    shutil.copytree(
-        path_to_persist,
-        save_location,
-        ignore=ignorePath(save_location),
-        dirs_exist_ok=True,
-    )
+def store_imported_code(
+    local_files: List[str],
+    root_folder: str,
+    deferred_sources: List[Tuple[str, str]],
+):
+    """
+    Add the local files imported by the function to the deferred sources, keeping
+        their location relative to the root folder.
+    """
+    for path in local_files:
+        relative_path = os.path.relpath(path, root_folder)
+        if relative_path.startswith(os.pardir):
+            logger.warning(
+                f"Not bundling '{path}', imported by the function, since it is "
+                f"outside of '{root_folder}'."
+            )
+            continue
+        deferred_sources.append((path, os.path.join(CODE_FOLDER, relative_path)))
 
 
-def store_function_codebase(path_to_persist: str, save_location: str):
+def store_function_codebase(
+    path_to_persist: str,
+    save_location: str,
+    deferred_sources: List[Tuple[str, str]] | None = None,
+):
     code_folder = os.path.join(save_location, CODE_FOLDER)
-    if os.path.isdir(path_to_persist):
+    if deferred_sources is not None:
+        if os.path.isdir(path_to_persist):
+            deferred_sources.append((path_to_persist, CODE_FOLDER))
+        elif os.path.isfile(path_to_persist):
+            deferred_sources.append(
+                (
+                    path_to_persist,
+                    os.path.join(CODE_FOLDER, os.path.basename(path_to_persist)),
+                )
+            )
+    elif os.path.isdir(path_to_persist):
         store_folder_contents(path_to_persist, code_folder)
     elif os.path.isfile(path_to_persist):
         store_file_contents(path_to_persist, code_folder)
@@ -264,6 +519,12 @@ def store_function_codebase(path_to_persist: str, save_location: str):
 class SaveTarget(Enum):
     FILE = "file"
     FOLDER = "folder"
+    IMPORTS = "imports"
+
+
+class RequirementsScope(Enum):
+    ENVIRONMENT = "environment"
+    IMPORTS = "imports"
 
 
 def create_bundle_archive(
@@ -272,7 +533,11 @@ def create_bundle_archive(
     path_to_code: str = None,
     requirements: str = None,
     save_location: str | Path | None = None,
-    save_target: Literal["file", "folder"] | None = None,
+    save_target: Literal["file", "folder", "imports"] | None = None,
+    compression: str = DEFAULT_COMPRESSION,
+    compression_level: int | None = None,
+    requirements_scope: Literal["environment", "imports"] = "environment",
+    use_gitignore: bool = False,
 ) -> str:
     """
     Register a function in the TabsData platform.
@@ -288,9 +553,25 @@ def create_bundle_archive(
             local system.
         save_location (str): The location where the context of the function will
             be stored. If None, the current working directory will be used.
-        save_target ('file' | 'folder' | None): Whether to save only the 'file'
-            where the function is defined or the whole 'folder'. If None,
-            and path_to_code is None, 'folder' will be used.
+        save_target ('file' | 'folder' | 'imports' | None): Whether to save only
+            the 'file' where the function is defined, the whole 'folder', or only
+            the files of the folder that are 'imports'-ed by the function, directly
+            or transitively, as found by static analysis. The modules of packages
+            without an __init__.py (namespace packages) are included too. Files
+            that are not Python modules, like data files, are not included with
+            'imports'. If None, and path_to_code is None, 'folder' will be used.
+        compression (str): The compression backend of the archive, 'gzip' or
+            'zstd'. Both use all the available cores.
+        compression_level (int | None): The compression level. If None, the
+            default level of the backend is used.
+        requirements_scope ('environment' | 'imports'): When the requirements are
+            inferred, whether to require every distribution installed in the
+            'environment', or only the ones of the modules imported by the code of
+            the function (found by static analysis of its 'imports'), in which case
+            their dependencies are installed by the backend.
+        use_gitignore (bool): Whether to skip the paths matched by the .gitignore
+            of the bundled folders, in addition to the ones matched by their
+            .tdignore, which takes precedence.
 
     Returns:
         TabsetsHandle: The handle to the registered function.
@@ -302,12 +583,84 @@ def create_bundle_archive(
         ValueError: If save_location is not a valid folder path.
         ValueError: If path_to_persist is not a valid system path.
     """
+    compressed_context_file, _ = create_hashed_bundle_archive(
+        function,
+        local_packages=local_packages,
+        path_to_code=path_to_code,
+        requirements=requirements,
+        save_location=save_location,
+        save_target=save_target,
+        cache_location=None,
+        compression=compression,
+        compression_level=compression_level,
+        requirements_scope=requirements_scope,
+        use_gitignore=use_gitignore,
+    )
+    return compressed_context_file
+
+
+def create_hashed_bundle_archive(
+    function: DatasetFunction | Callable,
+    local_packages: List[str] | str | None = None,
+    path_to_code: str = None,
+    requirements: str = None,
+    save_location: str | Path | None = None,
+    save_target: Literal["file", "folder", "imports"] | None = None,
+    cache_location: str | None = BUNDLE_CACHE_FOLDER,
+    compression: str = DEFAULT_COMPRESSION,
+    compression_level: int | None = None,
+    requirements_scope: Literal["environment", "imports"] = "environment",
+    use_gitignore: bool = False,
+    max_cached_bundles: int = MAX_CACHED_BUNDLES,
+) -> Tuple[str, str]:
+    """
+    Same as create_bundle_archive, but it also returns the SHA-256 hash of the
+        archive. The code and the local packages are streamed into the archive from
+        their original location, and the hash is computed while the archive is
+        written, so the sources are read only once.
+
+    Args:
+        cache_location (str | None): The folder of the local bundle cache. If the
+            contents of the bundle did not change since it was last created, the
+            cached archive is linked into save_location and its hash returned
+            instead of building it again. If None, the cache is not used.
+        max_cached_bundles (int): The maximum number of bundles kept in the local
+            bundle cache.
+
+    Returns:
+        Tuple[str, str]: The path to the archive and its SHA-256 hash.
+    """
     if not isinstance(function, DatasetFunction):
         raise RegistrationError(ErrorCode.RE1)
     if not os.path.isdir(save_location):
         raise RegistrationError(ErrorCode.RE4, save_location)
+    compression_level = resolve_compression_level(compression, compression_level)
 
     path_to_persist = _obtain_path_to_persist(function, path_to_code, save_target)
+    if requirements_scope not in [element.value for element in RequirementsScope]:
+        raise RegistrationError(
+            ErrorCode.RE13,
+            requirements_scope,
+            [element.value for element in RequirementsScope],
+        )
+    ignore_files = (
+        (GITIGNORE_FILE_NAME,) + DEFAULT_IGNORE_FILES
+        if use_gitignore
+        else DEFAULT_IGNORE_FILES
+    )
+    infer_requirements_from_imports = (
+        not requirements and requirements_scope == RequirementsScope.IMPORTS.value
+    )
+    timings = {}
+
+    # Analyse the imports of the function once, if any step needs them
+    start = time.perf_counter()
+    import_graph = None
+    if save_target == SaveTarget.IMPORTS.value or infer_requirements_from_imports:
+        import_graph = ImportGraph(
+            os.path.join(function.original_folder, function.original_file)
+        )
+        timings["import analysis"] = time.perf_counter() - start
 
     # Keep track of where context of each function is stored
     uncompressed_context_location = os.path.join(
@@ -315,18 +668,42 @@ def create_bundle_archive(
     )
     _delete_if_exists_and_create_directory(uncompressed_context_location)
 
+    # The code of the function and the local packages are not copied, but added
+    # to the tarball straight from their original location
+    deferred_sources = []
+
     # Store the code of the function
-    store_function_codebase(path_to_persist, uncompressed_context_location)
+    if save_target == SaveTarget.IMPORTS.value:
+        store_imported_code(import_graph.local_files, path_to_persist, deferred_sources)
+    else:
+        store_function_codebase(
+            path_to_persist, uncompressed_context_location, deferred_sources
+        )
     store_pickled_function(function, uncompressed_context_location)
 
     # Create a requirements.yaml file with the dependencies and Python version
+    start = time.perf_counter()
     if requirements:
-        copy_and_verify_requirements_file(uncompressed_context_location, requirements)
+        copy_and_verify_requirements_file(
+            uncompressed_context_location, requirements, deferred_sources
+        )
     else:
-        create_requirements(uncompressed_context_location, local_packages)
+        create_requirements(
+            uncompressed_context_location,
+            local_packages,
+            deferred_sources,
+            (
+                sorted(import_graph.external_modules)
+                if infer_requirements_from_imports
+                else None
+            ),
+        )
+    timings["requirements"] = time.perf_counter() - start
 
     # Create a configuration.json with the inputs and store all required files
-    create_configuration(function, uncompressed_context_location)
+    create_configuration(
+        function, uncompressed_context_location, compression, compression_level
+    )
 
     # Create a tarball with the context of the function
     compressed_context_location = os.path.join(
@@ -335,13 +712,128 @@ def create_bundle_archive(
     _delete_if_exists_and_create_directory(compressed_context_location)
     compressed_context_file = os.path.join(
         compressed_context_location,
-        COMPRESSED_CONTEXT_FOLDER,
+        COMPRESSED_CONTEXT_NAME + ARCHIVE_EXTENSIONS[compression],
     )
-    create_tarball(
+
+    entries = generated_entries = None
+    if cache_location or logger.isEnabledFor(logging.INFO):
+        excluded_paths = (
+            os.path.abspath(uncompressed_context_location),
+            os.path.abspath(compressed_context_location),
+        )
+        entries = _list_bundle_entries(deferred_sources, excluded_paths, ignore_files)
+        generated_entries = _list_bundle_entries([(uncompressed_context_location, "")])
+
+    # Reuse the archive of a previous registration if nothing changed
+    cache = bundle_key = None
+    if cache_location:
+        start = time.perf_counter()
+        cache = BundleCache(cache_location, max_cached_bundles)
+        bundle_key = cache.key(entries, generated_entries)
+        bundle_hash = bundle_key and cache.get(bundle_key, compressed_context_file)
+        timings["cache lookup"] = time.perf_counter() - start
+        if bundle_hash:
+            _log_bundle_breakdown(
+                function, entries, generated_entries, timings, compressed_context_file
+            )
+            return compressed_context_file, bundle_hash
+
+    # If some source changed, the key is computed from the hashes of the sources
+    # taken while they are archived, so that they are not read twice
+    file_hashes = {} if cache and not bundle_key else None
+    start = time.perf_counter()
+    bundle_hash = create_tarball(
         uncompressed_context_location,
         compressed_context_file,
+        deferred_sources,
+        compression,
+        compression_level,
+        ignore_files=ignore_files,
+        file_hashes=file_hashes,
     )
-    return compressed_context_file
+    timings["archive"] = time.perf_counter() - start
+    if file_hashes is not None:
+        cache.memoize(file_hashes)
+        bundle_key = cache.key(entries, generated_entries)
+    if bundle_key:
+        cache.put(bundle_key, compressed_context_file, bundle_hash)
+    _log_bundle_breakdown(
+        function, entries, generated_entries, timings, compressed_context_file
+    )
+    return compressed_context_file, bundle_hash
+
+
+def _log_bundle_breakdown(
+    function: DatasetFunction,
+    entries: List[Tuple[str, str | None]] | None,
+    generated_entries: List[Tuple[str, str | None]] | None,
+    timings: dict,
+    archive: str,
+):
+    """
+    Log the time spent in each step of the creation of a bundle, and the number of
+        files and size of each part of its contents.
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    sizes = {}
+    for group, group_entries in (
+        (None, entries or []),
+        ("generated files", generated_entries or []),
+    ):
+        for arcname, path in group_entries:
+            if path:
+                key = group or arcname.split(os.path.sep)[0]
+                files, size = sizes.get(key, (0, 0))
+                sizes[key] = (files + 1, size + os.path.getsize(path))
+    formatted_timings = ", ".join(
+        f"{step}: {elapsed:.2f}s" for step, elapsed in timings.items()
+    )
+    formatted_sizes = ", ".join(
+        f"{key}: {files} files, {_format_size(size)}"
+        for key, (files, size) in sizes.items()
+    )
+    logger.info(
+        f"Bundle of '{function.original_function.__name__}' created in "
+        f"{sum(timings.values()):.2f}s ({formatted_timings}). Contents: "
+        f"{formatted_sizes}. Compressed archive: "
+        f"{_format_size(os.path.getsize(archive))}."
+    )
+
+
+def _format_size(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            break
+        size /= 1024
+    return f"{size:.1f} {unit}"
+
+
+def _list_bundle_entries(
+    sources: List[Tuple[str, str]],
+    excluded_paths: Tuple[str, ...] = (),
+    ignore_files: Tuple[str, ...] = DEFAULT_IGNORE_FILES,
+) -> List[Tuple[str, str | None]]:
+    """
+    List the (path inside the archive, local path) pairs of everything that is
+        stored in the archive from the given sources. The local path is None for
+        directories.
+    """
+    entries = []
+    for source, arcname in sources:
+        if os.path.isdir(source):
+            for path, relative_path in _iter_folder_contents(
+                source, excluded_paths, ignore_files
+            ):
+                entries.append(
+                    (
+                        os.path.join(arcname, relative_path),
+                        None if os.path.isdir(path) else path,
+                    )
+                )
+        else:
+            entries.append((arcname, source))
+    return entries
 
 
 def _delete_if_exists_and_create_directory(directory: str):
@@ -358,9 +850,13 @@ def _obtain_path_to_persist(function, path_to_code, save_target):
     Args:
         function (DatasetFunction): The function to be registered.
         path_to_code (str): The path to the code of the function.
-        save_target ('file' | 'folder' | None): Whether to save only the 'file'
-            where the function is defined or the whole 'folder'. If None,
-            and path_to_code is None, 'folder' will be used.
+        save_target ('file' | 'folder' | 'imports' | None): Whether to save only
+            the 'file' where the function is defined, the whole 'folder', or only
+            the files of the folder that are 'imports'-ed by the function, directly
+            or transitively, as found by static analysis. The modules of packages
+            without an __init__.py (namespace packages) are included too. Files
+            that are not Python modules, like data files, are not included with
+            'imports'. If None, and path_to_code is None, 'folder' will be used.
     """
     if path_to_code and save_target:
         raise RegistrationError(ErrorCode.RE2)
@@ -372,6 +868,8 @@ def _obtain_path_to_persist(function, path_to_code, save_target):
             return function.original_folder
         elif save_target == SaveTarget.FILE.value:
             return os.path.join(function.original_folder, function.original_file)
+        elif save_target == SaveTarget.IMPORTS.value:
+            return function.original_folder
         else:
             raise RegistrationError(
                 ErrorCode.RE3, save_target, [element.value for element in SaveTarget]
@@ -0,0 +1,199 @@
+#
+# Copyright 2024 Tabs Data Inc.
+#
+
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import BinaryIO, Deque
+
+from tabsdatasdk.exceptions import ErrorCode, RegistrationError
+
+# Version of the layout of the bundle. It is stored in the configuration.json of
+# every bundle so that the backend knows how to unpack it.
+BUNDLE_FORMAT_VERSION = 1
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+# Size of the deflate window. Each block is primed with this many bytes of the end
+# of the previous one, so that matches can span block boundaries.
+DICTIONARY_SIZE = 32 * 1024
+# Header of a gzip member: magic number, deflate method, no flags, no modification
+# time, no extra flags and unknown operating system.
+GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+
+
+class Compression(Enum):
+    """
+    Enum for the compression backends available for the bundles. The value is
+        stored in the configuration.json of the bundle.
+    """
+
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+ARCHIVE_EXTENSIONS = {
+    Compression.GZIP.value: ".tar.gz",
+    Compression.ZSTD.value: ".tar.zst",
+}
+DEFAULT_COMPRESSION = Compression.GZIP.value
+DEFAULT_LEVELS = {
+    Compression.GZIP.value: 6,
+    Compression.ZSTD.value: 3,
+}
+# Valid compression levels of each backend, both ends included. The negative (fast)
+# levels of zstd are not supported.
+LEVEL_RANGES = {
+    Compression.GZIP.value: (0, 9),
+    Compression.ZSTD.value: (1, 22),
+}
+
+
+def _compress_block(block: bytes, level: int, last: bool, dictionary: bytes) -> bytes:
+    compressor = zlib.compressobj(
+        level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=dictionary
+    )
+    # A sync flush ends the block on a byte boundary without marking the end of the
+    # stream, so the raw deflate blocks can be concatenated in order
+    return compressor.compress(block) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    )
+
+
+class ParallelGzipWriter:
+    """
+    Write-only file object that compresses the data written to it in the gzip
+        format using several threads, in the same way as pigz: the data is split in
+        blocks that are compressed in parallel and concatenated in order. Each block
+        is primed with the last 32 KiB of the previous one as a preset dictionary,
+        so the compression ratio is close to that of a single stream. The result is
+        a standard gzip file that can be read by any gzip implementation.
+
+    Args:
+        fileobj (BinaryIO): The file object where the compressed data is written.
+        level (int): The compression level, from 0 (no compression) to 9.
+        threads (int | None): The number of compression threads. If None, one per
+            available core is used.
+        block_size (int): The size of the blocks compressed by each thread.
+    """
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        level: int = DEFAULT_LEVELS[Compression.GZIP.value],
+        threads: int | None = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ):
+        _check_compression_level(Compression.GZIP.value, level)
+        self._fileobj = fileobj
+        self._level = level
+        self._block_size = block_size
+        threads = threads or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=threads)
+        # Bound the number of blocks in flight so that memory usage is constant
+        self._max_pending_blocks = 2 * threads
+        self._pending_blocks: Deque[Future] = deque()
+        self._buffer = bytearray()
+        self._dictionary = b""
+        self._crc = 0
+        self._size = 0
+        self._closed = False
+        self._fileobj.write(GZIP_HEADER)
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self._block_size:
+            block = bytes(self._buffer[: self._block_size])
+            del self._buffer[: self._block_size]
+            self._submit(block, last=False)
+        return len(data)
+
+    def flush(self):
+        self._fileobj.flush()
+
+    def close(self):
+        if self._closed:
+            return
+        self._submit(bytes(self._buffer), last=True)
+        self._buffer.clear()
+        while self._pending_blocks:
+            self._fileobj.write(self._pending_blocks.popleft().result())
+        self._fileobj.write(struct.pack("<II", self._crc, self._size & 0xFFFFFFFF))
+        self._executor.shutdown()
+        self._closed = True
+
+    def _submit(self, block: bytes, last: bool):
+        self._crc = zlib.crc32(block, self._crc)
+        self._size += len(block)
+        self._pending_blocks.append(
+            self._executor.submit(
+                _compress_block, block, self._level, last, self._dictionary
+            )
+        )
+        self._dictionary = block[-DICTIONARY_SIZE:]
+        while len(self._pending_blocks) > self._max_pending_blocks:
+            self._fileobj.write(self._pending_blocks.popleft().result())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def open_compressor(
+    fileobj: BinaryIO,
+    compression: str = DEFAULT_COMPRESSION,
+    level: int | None = None,
+    threads: int | None = None,
+):
+    """
+    Open a write-only file object that compresses everything written to it with
+        the given backend and writes the result to fileobj. It must be closed to
+        write the end of the compressed stream, which does not close fileobj.
+
+    Args:
+        fileobj (BinaryIO): The file object where the compressed data is written.
+        compression (str): The compression backend, one of 'gzip' or 'zstd'.
+        level (int | None): The compression level. If None, the default level of
+            the backend is used.
+        threads (int | None): The number of compression threads. If None, one per
+            available core is used.
+    """
+    level = resolve_compression_level(compression, level)
+    if compression == Compression.GZIP.value:
+        return ParallelGzipWriter(fileobj, level=level, threads=threads)
+    elif compression == Compression.ZSTD.value:
+        try:
+            import zstandard
+        except ImportError:
+            raise RegistrationError(ErrorCode.RE11, compression, "zstandard")
+        compressor = zstandard.ZstdCompressor(level=level, threads=threads or -1)
+        return compressor.stream_writer(fileobj, closefd=False)
+
+
+def resolve_compression_level(compression: str, level: int | None = None) -> int:
+    """
+    Validate the compression backend and the level, and return the level to use
+        with it, which is the default level of the backend if level is None.
+    """
+    if compression not in DEFAULT_LEVELS:
+        raise RegistrationError(
+            ErrorCode.RE12, compression, [element.value for element in Compression]
+        )
+    if level is None:
+        return DEFAULT_LEVELS[compression]
+    _check_compression_level(compression, level)
+    return level
+
+
+def _check_compression_level(compression: str, level: int):
+    minimum, maximum = LEVEL_RANGES[compression]
+    if (
+        isinstance(level, bool)
+        or not isinstance(level, int)
+        or not minimum <= level <= maximum
+    ):
+        raise RegistrationError(ErrorCode.RE14, level, compression, minimum, maximum)
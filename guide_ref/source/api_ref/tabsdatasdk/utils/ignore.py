@@ -0,0 +1,172 @@
+#
+# Copyright 2024 Tabs Data Inc.
+#
+
+import logging
+import os
+import re
+from typing import Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+GITIGNORE_FILE_NAME = ".gitignore"
+TDIGNORE_FILE_NAME = ".tdignore"
+
+
+class IgnoreMatcher:
+    """
+    Matcher for paths excluded by ignore files, like .tdignore, which follow the
+        syntax of .gitignore files: '#' starts a comment, '!' negates a pattern, a
+        trailing '/' only matches directories, a pattern with a '/' at the beginning
+        or in the middle is relative to the folder of the ignore file and any other
+        pattern matches at any depth, and '*', '?', '[...]' and '**' are wildcards.
+
+    The patterns are compiled once: consecutive patterns of the same kind are
+        combined in a single regular expression, so matching a path takes a few
+        regular expression searches regardless of the number of patterns.
+
+    Args:
+        patterns (Iterable[str]): The lines of the ignore files, in order.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        # Groups of consecutive patterns with the same negation, as (negated,
+        # regex matching any path, regex matching only directories)
+        self._groups: List[Tuple[bool, re.Pattern | None, re.Pattern | None]] = []
+        current_negated = None
+        any_regexes, directory_regexes = [], []
+        for line in patterns:
+            parsed = _parse_line(line)
+            if not parsed:
+                continue
+            negated, directory_only, regex = parsed
+            if negated != current_negated and current_negated is not None:
+                self._add_group(current_negated, any_regexes, directory_regexes)
+                any_regexes, directory_regexes = [], []
+            current_negated = negated
+            (directory_regexes if directory_only else any_regexes).append(regex)
+        if current_negated is not None:
+            self._add_group(current_negated, any_regexes, directory_regexes)
+
+    def __bool__(self) -> bool:
+        return bool(self._groups)
+
+    def _add_group(
+        self, negated: bool, any_regexes: List[str], directory_regexes: List[str]
+    ):
+        self._groups.append(
+            (
+                negated,
+                _combine(any_regexes),
+                _combine(directory_regexes),
+            )
+        )
+
+    @classmethod
+    def from_folder(
+        cls, folder: str, file_names: Iterable[str] = (TDIGNORE_FILE_NAME,)
+    ) -> "IgnoreMatcher":
+        """
+        Build the matcher of the ignore files found in a folder.
+
+        Args:
+            folder (str): The folder where the ignore files are looked for.
+            file_names (Iterable[str]): The names of the ignore files, in increasing
+                order of precedence.
+        """
+        patterns = []
+        for file_name in file_names:
+            try:
+                with open(os.path.join(folder, file_name), encoding="utf-8") as file:
+                    patterns.extend(file.read().splitlines())
+                logger.debug(f"Using ignore file '{file_name}' from '{folder}'.")
+            except FileNotFoundError:
+                continue
+        return cls(patterns)
+
+    def ignored(self, relative_path: str, is_directory: bool) -> bool:
+        """
+        Whether a path is ignored.
+
+        Args:
+            relative_path (str): The path, relative to the folder of the ignore
+                files, using '/' as separator.
+            is_directory (bool): Whether the path is a directory.
+        """
+        # The last pattern that matches decides, so the groups are checked in
+        # reverse order
+        for negated, any_regex, directory_regex in reversed(self._groups):
+            if any_regex and any_regex.match(relative_path):
+                return not negated
+            if is_directory and directory_regex:
+                if directory_regex.match(relative_path):
+                    return not negated
+        return False
+
+
+def _combine(regexes: List[str]) -> re.Pattern | None:
+    if not regexes:
+        return None
+    return re.compile("|".join(f"(?:{regex})" for regex in regexes))
+
+
+def _parse_line(line: str) -> Tuple[bool, bool, str] | None:
+    """
+    Parse a line of an ignore file into (negated, directory only, regex), or None
+        if the line does not contain a pattern.
+    """
+    # Trailing spaces are ignored unless they are escaped
+    line = line.rstrip("\n")
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+    if not line or line.startswith("#"):
+        return None
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith("\\#") or line.startswith("\\!"):
+        line = line[1:]
+    directory_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+    segments = line.split("/")
+    regex = "" if anchored else "(?:.*/)?"
+    for position, segment in enumerate(segments):
+        last = position == len(segments) - 1
+        if segment == "**":
+            regex += ".*" if last else "(?:.*/)?"
+        else:
+            regex += _translate_segment(segment) + ("" if last else "/")
+    return negated, directory_only, regex + r"\Z"
+
+
+def _translate_segment(segment: str) -> str:
+    """Translate a glob pattern without '/' into a regular expression."""
+    regex = ""
+    position = 0
+    while position < len(segment):
+        character = segment[position]
+        position += 1
+        if character == "\\" and position < len(segment):
+            regex += re.escape(segment[position])
+            position += 1
+        elif character == "*":
+            regex += "[^/]*"
+        elif character == "?":
+            regex += "[^/]"
+        elif character == "[":
+            end = segment.find("]", position + 1)
+            if end == -1:
+                regex += re.escape(character)
+                continue
+            content = segment[position:end].replace("\\", "\\\\")
+            if content.startswith("!"):
+                content = "^" + content[1:]
+            regex += f"[{content}]"
+            position = end + 1
+        else:
+            regex += re.escape(character)
+    return regex
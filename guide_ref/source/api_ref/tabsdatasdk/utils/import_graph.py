@@ -0,0 +1,149 @@
+#
+# Copyright 2024 Tabs Data Inc.
+#
+
+import ast
+import logging
+import os
+from typing import List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+INIT_FILE_NAME = "__init__.py"
+
+
+class ImportGraph:
+    """
+    Static analysis of the modules imported by a Python file. Starting from the
+        entry file, every import statement (including the ones inside functions) is
+        resolved against the local folders; the local modules found are analysed
+        recursively, and any other import is recorded as an external module.
+
+    Args:
+        entry_file (str): The Python file to start the analysis from.
+        search_paths (List[str] | None): The folders where local modules are
+            looked for. If None, the folder of the entry file is used.
+
+    Attributes:
+        local_files (List[str]): The absolute paths of the local files imported
+            transitively by the entry file, including itself and the __init__.py of
+            every package they belong to.
+        external_modules (Set[str]): The top-level names of the modules imported that
+            are not local, like 'polars' or 'os'.
+    """
+
+    def __init__(self, entry_file: str, search_paths: List[str] | None = None):
+        entry_file = os.path.abspath(entry_file)
+        self.search_paths = [
+            os.path.abspath(path)
+            for path in (search_paths or [os.path.dirname(entry_file)])
+        ]
+        self.local_files: List[str] = []
+        self.external_modules: Set[str] = set()
+        visited = set()
+        pending = [entry_file]
+        while pending:
+            path = pending.pop()
+            if path in visited:
+                continue
+            visited.add(path)
+            self.local_files.append(path)
+            pending.extend(self._local_dependencies(path))
+        self.local_files.sort()
+
+    def _local_dependencies(self, path: str) -> List[str]:
+        dependencies = []
+        for candidates, level in _find_imports(path):
+            for module in candidates:
+                files = self._resolve(path, module, level)
+                if files is not None:
+                    dependencies.extend(files)
+                    break
+            else:
+                if level == 0:
+                    self.external_modules.add(candidates[0].split(".")[0])
+                else:
+                    logger.debug(
+                        f"Could not resolve relative import of {candidates} in {path}"
+                    )
+        return dependencies
+
+    def _resolve(self, importer: str, module: str, level: int) -> List[str] | None:
+        """
+        Find the local files of a module, including the __init__.py of its parent
+            packages. Folders without an __init__.py are implicit namespace
+            packages, which have no files of their own. Returns None if it is not a
+            local module.
+        """
+        if level:
+            base = os.path.dirname(importer)
+            for _ in range(level - 1):
+                base = os.path.dirname(base)
+            bases = [base]
+        else:
+            bases = self.search_paths
+        parts = module.split(".") if module else []
+        for base in bases:
+            files = []
+            folder = base
+            for position, part in enumerate(parts):
+                candidate = os.path.join(folder, part)
+                if os.path.isfile(os.path.join(candidate, INIT_FILE_NAME)):
+                    files.append(os.path.join(candidate, INIT_FILE_NAME))
+                    folder = candidate
+                elif position == len(parts) - 1 and os.path.isfile(candidate + ".py"):
+                    files.append(candidate + ".py")
+                elif _is_namespace_package(candidate):
+                    folder = candidate
+                else:
+                    break
+            else:
+                if level and os.path.isfile(os.path.join(base, INIT_FILE_NAME)):
+                    files.append(os.path.join(base, INIT_FILE_NAME))
+                return files
+        return None
+
+
+def _is_namespace_package(folder: str) -> bool:
+    """
+    Check whether a folder can be imported as an implicit namespace package: it has
+        no __init__.py, but it has Python files, directly or in its subfolders.
+        Folders without any, like the ones that only have data or documentation,
+        are not considered packages, so that they do not hide an installed module
+        with the same name.
+    """
+    for _, folders, files in os.walk(folder):
+        if any(file.endswith(".py") for file in files):
+            return True
+        # Hidden folders, like caches, can not be imported
+        folders[:] = [name for name in folders if not name.startswith(".")]
+    return False
+
+
+def _find_imports(path: str) -> List[Tuple[Tuple[str, ...], int]]:
+    """
+    List the imports of a Python file as (candidate modules, relative import level)
+        pairs, where the first candidate that can be resolved is the imported module.
+        For 'from package import name' the candidates are 'package.name' and
+        'package', since name can be either a submodule or an attribute of the
+        package.
+    """
+    try:
+        with open(path, "rb") as file:
+            tree = ast.parse(file.read(), filename=path)
+    except (OSError, SyntaxError, ValueError) as e:
+        logger.warning(f"Could not analyse the imports of {path}: {e}")
+        return []
+    imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend(((alias.name,), 0) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            for alias in node.names:
+                if alias.name == "*":
+                    imports.append(((module,), node.level))
+                else:
+                    submodule = f"{module}.{alias.name}" if module else alias.name
+                    imports.append(((submodule, module), node.level))
+    return imports
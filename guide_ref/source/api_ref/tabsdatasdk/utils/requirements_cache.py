@@ -0,0 +1,133 @@
+#
+# Copyright 2024 Tabs Data Inc.
+#
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pkgutil
+import sys
+import tempfile
+from typing import Dict, List, Set, Tuple
+
+# Importing like this to ensure backwards compatibility with Python 3.7 and prior
+if sys.version_info >= (3, 8):
+    from importlib import metadata as importlib_metadata
+else:
+    import importlib_metadata  # pragma: no cover
+
+logger = logging.getLogger(__name__)
+
+REQUIREMENTS_CACHE_FOLDER = os.path.join(
+    os.path.expanduser("~"), ".tabsdata", "requirements_cache"
+)
+
+
+class RequirementsCache:
+    """
+    Local cache of the modules and distributions available in the current Python
+        environment, used to infer the requirements of a function.
+
+    The environment is scanned one sys.path entry at a time, and the result of each
+        entry is stored together with its modification time. Installing, upgrading or
+        uninstalling a distribution always adds or removes its metadata folder, which
+        changes the modification time of the entry it lives in, so only the entries
+        that changed since the last scan are scanned again. There is one cache file
+        per Python interpreter.
+
+    Args:
+        location (str): The folder where the cache is stored.
+    """
+
+    def __init__(self, location: str = REQUIREMENTS_CACHE_FOLDER):
+        self.location = location
+        os.makedirs(self.location, exist_ok=True)
+        interpreter_hash = hashlib.sha256(
+            f"{sys.executable}\0{sys.version}".encode()
+        ).hexdigest()[:16]
+        self._cache_path = os.path.join(self.location, f"{interpreter_hash}.json")
+
+    def environment(
+        self,
+    ) -> Tuple[Set[str], Dict[str, List[str]], Dict[str, str]]:
+        """
+        Obtain the modules and distributions available in the current environment.
+
+        Returns:
+            Tuple[Set[str], Dict[str, List[str]], Dict[str, str]]: The top-level
+                modules that can be imported, the distributions that provide each
+                top-level module, and the version of each distribution.
+        """
+        cached_entries = self._load()
+        entries = {}
+        for path_entry in dict.fromkeys(sys.path):
+            try:
+                fingerprint = os.stat(path_entry or os.curdir).st_mtime_ns
+            except OSError:
+                continue
+            entry = cached_entries.get(path_entry)
+            if not entry or entry["fingerprint"] != fingerprint:
+                logger.debug(f"Scanning '{path_entry}' for installed distributions.")
+                entry = _scan_path_entry(path_entry)
+                entry["fingerprint"] = fingerprint
+            entries[path_entry] = entry
+        if entries != cached_entries:
+            self._store(entries)
+
+        # Merge the entries in the same order the import system looks for them
+        available_modules = set()
+        mapping = {}
+        versions = {}
+        for entry in entries.values():
+            available_modules.update(entry["modules"])
+            for module, distributions in entry["packages"].items():
+                mapping.setdefault(module, []).extend(distributions)
+            for distribution, version in entry["versions"].items():
+                versions.setdefault(distribution, version)
+        return available_modules, mapping, versions
+
+    def _load(self) -> dict:
+        try:
+            with open(self._cache_path) as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _store(self, entries: dict):
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.location)
+        with os.fdopen(file_descriptor, "w") as file:
+            json.dump(entries, file)
+        os.replace(temporary_path, self._cache_path)
+
+
+def _scan_path_entry(path_entry: str) -> dict:
+    modules = [module.name for module in pkgutil.iter_modules([path_entry])]
+    packages = {}
+    versions = {}
+    for distribution in importlib_metadata.distributions(path=[path_entry]):
+        name = distribution.metadata["Name"]
+        if not name:
+            continue
+        for module in _top_level_names(distribution):
+            packages.setdefault(module, []).append(name)
+        versions.setdefault(name, distribution.version)
+    return {"modules": modules, "packages": packages, "versions": versions}
+
+
+def _top_level_names(distribution) -> List[str]:
+    """
+    Obtain the top-level modules provided by a distribution, in the same way as
+        importlib.metadata.packages_distributions does.
+    """
+    declared = (distribution.read_text("top_level.txt") or "").split()
+    if declared:
+        return declared
+    names = set()
+    for file in distribution.files or []:
+        if len(file.parts) > 1:
+            names.add(file.parts[0])
+        else:
+            names.add(inspect.getmodulename(str(file)) or str(file))
+    return [name for name in names if "." not in name]